@@ -0,0 +1,136 @@
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+
+from path_geometry import PathGeometry
+from pattern_model import NotASuite, iter_suite
+
+pattern_dir = Path("KC-Config-Suite/Pattern_Suite")
+
+# Columns printed in the ranking table: (key, header, format)
+columns = [
+    ("tiles", "Tiles", "{:d}"),
+    ("steps", "Steps", "{:d}"),
+    ("steps_per_new_tile", "Steps/new", "{:.2f}"),
+    ("revisit_ratio", "Revisit", "{:.1%}"),
+    ("drift", "Drift", "{:.2f}"),
+    ("tiles_per_second", "Tiles/s", "{:.2f}"),
+]
+
+# Metric used for ranking and whether higher is better
+sort_keys = {
+    "steps_per_new_tile": False,
+    "revisit_ratio": False,
+    "tiles": True,
+    "drift": False,
+    "tiles_per_second": True,
+}
+
+def rasterize(geometry, tile=1.0):
+    """Return the sequence of grid tiles a walk passes through.
+
+    Each step is sampled every half tile so long or diagonal steps do not jump
+    over tiles. Consecutive duplicates are collapsed, so every row is one visit.
+    """
+    steps = geometry.steps.astype(np.float64)
+    if not len(steps):
+        return np.zeros((1, 2), dtype=np.int64)
+
+    span = np.abs(steps).max(axis=1) / tile
+    samples = np.maximum(np.ceil(span * 2).astype(np.int64), 1)
+    step_idx = np.repeat(np.arange(len(steps)), samples)
+    starts = np.repeat(np.cumsum(samples) - samples, samples)
+    frac = (np.arange(samples.sum()) - starts + 1) / samples[step_idx]
+
+    points = geometry.offsets[step_idx] + steps[step_idx] * frac[:, None]
+    points = np.vstack([geometry.offsets[:1].astype(np.float64), points])
+    tiles = np.floor(points / tile + 0.5).astype(np.int64)
+
+    keep = np.ones(len(tiles), dtype=bool)
+    keep[1:] = np.any(tiles[1:] != tiles[:-1], axis=1)
+    return tiles[keep]
+
+def analyze(geometry, tile=1.0):
+    """Return coverage metrics for one walk."""
+    visits = rasterize(geometry, tile)
+    unique_tiles = len(np.unique(visits, axis=0))
+    steps = len(geometry)
+    end_x, end_y = geometry.end_offset
+
+    report = {
+        "steps": steps,
+        "tiles": unique_tiles,
+        "visits": len(visits),
+        "revisit_ratio": (len(visits) - unique_tiles) / len(visits),
+        "steps_per_new_tile": steps / max(unique_tiles - 1, 1),
+        "drift": float(np.hypot(end_x, end_y)),
+        "distance": geometry.total_distance,
+        "bbox": list(geometry.bbox),
+        "duration_s": None,
+        "tiles_per_second": None,
+    }
+    if geometry.durations is not None:
+        duration_s = float(geometry.durations.sum()) / 1000
+        report["duration_s"] = duration_s
+        report["tiles_per_second"] = unique_tiles / duration_s if duration_s else None
+    return report
+
+def iter_patterns(directory=None):
+    """Yield (suite, name, geometry) for every pattern in every JSON file of a directory."""
+    for json_file in sorted(Path(directory or pattern_dir).glob("*.json")):
+        try:
+            for pattern in iter_suite(json_file):
+                yield json_file.stem, pattern.name.strip("_"), PathGeometry.from_pattern(pattern)
+            continue
+        except NotASuite:
+            pass
+        with open(json_file, "r", encoding="utf-8-sig") as f:
+            data = json.load(f)
+        if isinstance(data, dict) and isinstance(data.get("pattern"), list):
+            yield json_file.stem, data.get("name", json_file.stem).strip("_"), PathGeometry.from_entries(data["pattern"])
+
+def rank(results, key="steps_per_new_tile"):
+    """Sort results best first; patterns without the metric go last."""
+    higher_is_better = sort_keys[key]
+    present = [r for r in results if r[key] is not None]
+    missing = [r for r in results if r[key] is None]
+    present.sort(key=lambda r: (-r[key] if higher_is_better else r[key], r["suite"], r["name"]))
+    return present + missing
+
+def format_table(results):
+    headers = ["#", "Suite", "Pattern"] + [header for _, header, _ in columns]
+    rows = []
+    for i, r in enumerate(results, 1):
+        cells = [str(i), r["suite"], r["name"]]
+        cells += ["-" if r[key] is None else fmt.format(r[key]) for key, _, fmt in columns]
+        rows.append(cells)
+    widths = [max(len(row[c]) for row in [headers] + rows) for c in range(len(headers))]
+    lines = ["  ".join(cell.ljust(w) for cell, w in zip(row, widths)).rstrip() for row in [headers] + rows]
+    lines.insert(1, "  ".join("-" * w for w in widths))
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rank pattern suite walks by tile coverage.")
+    parser.add_argument("directory", nargs="?", default=str(pattern_dir))
+    parser.add_argument("--sort", choices=sorted(sort_keys), default="steps_per_new_tile")
+    parser.add_argument("--tile", type=float, default=1.0, help="tile size in grid steps (default: 1)")
+    parser.add_argument("--json", metavar="PATH", help="also write the ranking as JSON")
+    args = parser.parse_args(argv)
+
+    results = []
+    for suite, name, geometry in iter_patterns(args.directory):
+        results.append({"suite": suite, "name": name, **analyze(geometry, args.tile)})
+    if not results:
+        print("No patterns found.")
+        return
+
+    results = rank(results, args.sort)
+    print(format_table(results))
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"Wrote {args.json}")
+
+if __name__ == "__main__":
+    main()
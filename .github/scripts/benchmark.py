@@ -0,0 +1,278 @@
+"""Benchmarks for the repository scripts on synthetic inputs.
+
+Each benchmark builds its input once (a pattern suite, a README with many
+shovel sections in a scratch git repo, a config corpus, ...) at the chosen
+size, then times the call `--repeat` times and measures its peak Python
+memory in one extra traced run. Results can be saved as a JSON baseline and
+later runs compared against it: a benchmark whose median time or peak memory
+grew by more than `--threshold` counts as a regression, unless the growth is
+below an absolute floor (`--min-ms`, `--min-kib`).
+
+Usage:
+    python .github/scripts/benchmark.py --size medium --save baseline.json
+    python .github/scripts/benchmark.py --size medium --compare baseline.json [--threshold 0.25] [--min-ms 1]
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+from pathlib import Path
+
+repo_root = Path(__file__).resolve().parents[2]
+sys.path.append(str(repo_root / "assets" / "scripts"))
+
+default_threshold = 0.25
+# Growth below these absolute amounts is run-to-run noise, however large it is relative
+# to a sub-millisecond benchmark
+min_regression = {"median_s": 0.001, "peak_kib": 64}
+
+# Input sizes per benchmark; "large" approaches the upper end of what the repo could grow to
+SIZES = {
+    "small": {"patterns": 10, "steps": 100, "gif_steps": 200, "entries": 1000, "sections": 100,
+              "configs": 200, "suite_files": 200, "fit_points": 200},
+    "medium": {"patterns": 200, "steps": 1000, "gif_steps": 1000, "entries": 20000, "sections": 300,
+               "configs": 1000, "suite_files": 2000, "fit_points": 1000},
+    "large": {"patterns": 10000, "steps": 500, "gif_steps": 5000, "entries": 200000, "sections": 800,
+              "configs": 5000, "suite_files": 10000, "fit_points": 5000},
+}
+
+# --- Synthetic inputs
+
+def random_moves(rng, steps, alphabet="wasd"):
+    return [rng.choice(alphabet) for _ in range(steps)]
+
+def synthetic_suite(rng, patterns, steps):
+    return {f"_KC_Synthetic_{i}_v1": random_moves(rng, rng.randint(max(10, steps // 2), steps)) for i in range(patterns)}
+
+def synthetic_entries(rng, count):
+    keys = ["w", "a", "s", "d", "W", "SHIFT+W", "SHIFT+d", "w+a", "\u200bLABEL"]
+    return {"name": "_KC_Synthetic", "pattern": [
+        {"key": rng.choice(keys), "duration": rng.randrange(0, 500, 10), "click": rng.random() < 0.3}
+        for _ in range(count)
+    ]}
+
+def synthetic_readme(rng, sections, stamp="2025-01-01"):
+    lines = ["# Synthetic shovels", ""]
+    for i in range(sections):
+        lines.append(f"### Shovel {i}")
+        lines.append("")
+        lines.extend(f"- setting {j}: {rng.randrange(1000)}" for j in range(rng.randint(3, 12)))
+        lines.append("")
+        lines.append(f"<sub><sup>Last updated: {stamp}</sup></sub>")
+        lines.append("")
+    lines.append("<!-- OPTIMIZATION FOOTER -->")
+    lines.append("footer")
+    return lines
+
+def git(cwd, *args):
+    subprocess.run(["git", "-c", "user.name=bench", "-c", "user.email=bench@example.com", *args],
+                   cwd=cwd, check=True, capture_output=True)
+
+def readme_repo(rng, workdir, sections):
+    """A git repo whose last commit edits every third section of a large README."""
+    lines = synthetic_readme(rng, sections)
+    (workdir / "README.md").write_text("\n".join(lines) + "\n", encoding="utf-8")
+    git(workdir, "init", "-q")
+    git(workdir, "add", "README.md")
+    git(workdir, "commit", "-q", "-m", "initial")
+    edited = [line + " (edited)" if line.startswith("- setting 1:") and rng.random() < 0.33 else line for line in lines]
+    (workdir / "README.md").write_text("\n".join(edited) + "\n", encoding="utf-8")
+    git(workdir, "commit", "-q", "-am", "edit")
+    return edited
+
+def config_corpus(rng, workdir, count):
+    """count configs under workdir/KC-Config-Suite, varied from a real one."""
+    template_path = next((repo_root / "KC-Config-Suite").glob("dt1.5.4*/*.json"))
+    template = json.loads(template_path.read_text(encoding="utf-8-sig"))
+    paths = []
+    for i in range(count):
+        data = json.loads(json.dumps(template))
+        for key, value in data["params"].items():
+            if isinstance(value, int) and not isinstance(value, bool):
+                data["params"][key] = value + rng.randrange(5)
+        dt = f"1.{i % 7}.{i % 5}"
+        path = workdir / "KC-Config-Suite" / f"dt{dt}" / f"KC14900_Shovel{i}__Var{i % 3}_main_dt{dt}_v{i % 9 + 1}_20250101.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(data, indent=4), encoding="utf-8")
+        paths.append(path.relative_to(workdir).as_posix())
+    return paths
+
+# --- Benchmarks: each takes (rng, size, workdir) and returns the callable to time
+
+def bench_generate_gif(rng, size, workdir):
+    import vizualize_paths
+    moves = random_moves(rng, size["gif_steps"])
+    return lambda: vizualize_paths.generate_gif("bench", moves, workdir)
+
+def bench_convert_key(rng, size, workdir):
+    import sync_azerty_patterns
+    keys = [entry["key"] for entry in synthetic_entries(rng, size["entries"])["pattern"]]
+    convert = sync_azerty_patterns.convert_key
+    return lambda: [convert(k) for k in keys]
+
+def bench_convert_pattern_json(rng, size, workdir):
+    import sync_azerty_patterns
+    data = synthetic_entries(rng, size["entries"])
+    return lambda: sync_azerty_patterns.convert_pattern_json(data)
+
+def bench_convert_simple_json(rng, size, workdir):
+    import sync_azerty_patterns
+    data = synthetic_suite(rng, size["patterns"], size["steps"])
+    return lambda: sync_azerty_patterns.convert_simple_json(data)
+
+def bench_load_suite(rng, size, workdir):
+    import pattern_model
+    path = workdir / "suite.json"
+    path.write_text(json.dumps(synthetic_suite(rng, size["patterns"], size["steps"]), indent=2), encoding="utf-8")
+    return lambda: pattern_model.load_suite(path)
+
+def bench_parse_sections(rng, size, workdir):
+    import update_shovel_timestamps
+    lines = synthetic_readme(rng, size["sections"])
+    return lambda: update_shovel_timestamps.parse_sections(lines)
+
+def bench_update_timestamps(rng, size, workdir):
+    import update_shovel_timestamps
+    readme_repo(rng, workdir, size["sections"])
+    return lambda: update_shovel_timestamps.update_timestamps("HEAD~1..HEAD", check=True)
+
+def bench_find_latest_file(rng, size, workdir):
+    import find_latest_pattern
+    directory = workdir / "suites"
+    directory.mkdir()
+    for i in range(size["suite_files"]):
+        (directory / f"_KC_Pattern_Suite_dt{rng.randint(1, 9)}.x_v{i}_20250101.json").touch()
+    return lambda: find_latest_pattern.find_latest_file(directory)
+
+def bench_config_index_build(rng, size, workdir):
+    import config_index
+    config_corpus(rng, workdir, size["configs"])
+    return lambda: config_index.ConfigIndex.build(workdir / "KC-Config-Suite")
+
+def bench_validate_configs(rng, size, workdir):
+    import validate_jsons
+    files = config_corpus(rng, workdir, size["configs"])
+    return lambda: validate_jsons.validate_files(files, workers=1, use_cache=False)
+
+def bench_penalty_fit(rng, size, workdir):
+    import numpy as np
+    import inventory_walkspeed_penalty_fitter as fitter
+    from walkspeed_penalty import penalty
+    x = np.sort(np.array([rng.uniform(0, 300) for _ in range(size["fit_points"])]))
+    y = penalty(x) + np.array([rng.gauss(0, 0.005) for _ in x])
+    return lambda: fitter.fit_dataset(x, y, workers=1)
+
+BENCHMARKS = {
+    "generate_gif": bench_generate_gif,
+    "convert_key": bench_convert_key,
+    "convert_pattern_json": bench_convert_pattern_json,
+    "convert_simple_json": bench_convert_simple_json,
+    "load_suite": bench_load_suite,
+    "parse_sections": bench_parse_sections,
+    "update_timestamps": bench_update_timestamps,
+    "find_latest_file": bench_find_latest_file,
+    "config_index_build": bench_config_index_build,
+    "validate_configs": bench_validate_configs,
+    "penalty_fit": bench_penalty_fit,
+}
+
+# --- Running and comparing
+
+def run_benchmark(name, size_name, repeat=3, seed=0):
+    """Time one benchmark. Returns {"median_s", "min_s", "peak_kib"}."""
+    previous = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix=f"kc-bench-{name}-") as tmp, \
+            open(os.devnull, "w") as quiet, contextlib.redirect_stdout(quiet):
+        os.chdir(tmp)
+        try:
+            call = BENCHMARKS[name](random.Random(seed), SIZES[size_name], Path(tmp))
+            call()  # warm-up: imports, caches, first-touch allocations
+            times = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                call()
+                times.append(time.perf_counter() - start)
+            tracemalloc.start()
+            call()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        finally:
+            os.chdir(previous)
+    return {"median_s": statistics.median(times), "min_s": min(times), "peak_kib": peak / 1024}
+
+def compare(results, baseline, threshold=default_threshold, floors=None):
+    """Return [(name, metric, old, new)] for every metric that regressed beyond threshold.
+
+    floors maps a metric to the smallest absolute growth that counts (default: min_regression).
+    """
+    floors = {**min_regression, **(floors or {})}
+    regressions = []
+    for name, result in results.items():
+        old = baseline.get(name)
+        if not old:
+            continue
+        for metric in ("median_s", "peak_kib"):
+            if (old.get(metric) and result[metric] > old[metric] * (1 + threshold)
+                    and result[metric] - old[metric] >= floors[metric]):
+                regressions.append((name, metric, old[metric], result[metric]))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the repository scripts on synthetic inputs.")
+    parser.add_argument("--size", choices=sorted(SIZES), default="small")
+    parser.add_argument("--filter", action="append", help="only run benchmarks whose name contains this (repeatable)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", metavar="PATH", help="write the results as a baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a saved baseline")
+    parser.add_argument("--threshold", type=float, default=default_threshold,
+                        help="allowed relative slowdown or memory growth (default: %(default)s)")
+    parser.add_argument("--min-ms", type=float, default=1000 * min_regression["median_s"],
+                        help="ignore slowdowns smaller than this many ms (default: %(default)s)")
+    parser.add_argument("--min-kib", type=float, default=min_regression["peak_kib"],
+                        help="ignore memory growth smaller than this many KiB (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    names = [n for n in BENCHMARKS if not args.filter or any(f in n for f in args.filter)]
+    baseline = {}
+    if args.compare:
+        saved = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        if saved.get("size") != args.size:
+            print(f"✖ Baseline was recorded at size {saved.get('size')!r}, not {args.size!r}")
+            return 1
+        baseline = saved["results"]
+
+    results = {}
+    print(f"{'benchmark':<22} {'median ms':>10} {'min ms':>10} {'peak MiB':>9} {'vs base':>8}")
+    for name in names:
+        result = results[name] = run_benchmark(name, args.size, args.repeat, args.seed)
+        old = baseline.get(name, {}).get("median_s")
+        change = f"{100 * (result['median_s'] / old - 1):+7.1f}%" if old else ""
+        print(f"{name:<22} {1000 * result['median_s']:>10.2f} {1000 * result['min_s']:>10.2f} "
+              f"{result['peak_kib'] / 1024:>9.2f} {change:>8}")
+
+    if args.save:
+        saved = {
+            "size": args.size, "seed": args.seed, "date": date.today().isoformat(),
+            "python": platform.python_version(), "machine": platform.machine(), "results": results,
+        }
+        Path(args.save).write_text(json.dumps(saved, indent=2) + "\n", encoding="utf-8")
+        print(f"Wrote {args.save}")
+
+    regressions = compare(results, baseline, args.threshold,
+                          {"median_s": args.min_ms / 1000, "peak_kib": args.min_kib})
+    for name, metric, old, new in regressions:
+        print(f"✖ {name}: {metric} {old:.4g} -> {new:.4g} (+{100 * (new / old - 1):.0f}%)")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
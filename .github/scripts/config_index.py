@@ -0,0 +1,292 @@
+"""Index of the KC-Config-Suite dig-tool configs.
+
+Config filenames follow
+
+    KC14900_<Shovel>__<Variant>_<profile>_dt<version>_v<n>_<date>.json
+
+The index stores every numeric field of every config (params, game_area,
+sell_button_position, ...) as one float64 matrix that is memory-mapped on
+load, and the remaining fields as JSON-encoded text. It is refreshed
+incrementally: files whose mtime and size are unchanged are not read, and
+files whose content hash is unchanged are not re-parsed.
+
+Usage:
+    python .github/scripts/config_index.py latest [--shovel S] [--dt VERSION]
+    python .github/scripts/config_index.py query --where "target_fps>100" [--where ...]
+    python .github/scripts/config_index.py diff CONFIG_A CONFIG_B
+    python .github/scripts/config_index.py build [--rebuild]
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+import numpy as np
+
+config_dir = Path("KC-Config-Suite")
+index_dir = Path(".kc_index")
+
+# Bump when the stored layout changes so old indexes are rebuilt
+index_version = 1
+
+FILENAME_RE = re.compile(
+    r'^(?P<machine>[^_]+)_(?P<shovel>[^_]+)__(?P<variant>[^_]+)_(?P<profile>[^_]+)'
+    r'_dt(?P<dt>.+?)_v(?P<v>\d+)_(?P<date>\d{8})\.json$'
+)
+WHERE_RE = re.compile(r'^\s*([\w.\[\]]+)\s*(>=|<=|==|!=|>|<)\s*(.+?)\s*$')
+
+def parse_filename(name):
+    """Return the filename fields as a dict, or None if the name does not match."""
+    m = FILENAME_RE.match(name)
+    if not m:
+        return None
+    fields = m.groupdict()
+    fields["v"] = int(fields["v"])
+    return fields
+
+def version_key(dt):
+    """Sort key for dig-tool versions: 1.5.4-beta.5 < 1.5.4 < 1.5.10."""
+    base, _, pre = dt.partition("-")
+    base_key = tuple(int(p) if p.isdigit() else 0 for p in base.split("."))
+    pre_key = tuple((0, int(p), "") if p.isdigit() else (1, 0, p) for p in pre.split(".")) if pre else ()
+    return (base_key, 0 if pre else 1, pre_key)
+
+def flatten(data):
+    """Flatten a config into {column: value}; params keys keep their own names."""
+    flat = {}
+    for key, value in data.items():
+        if key == "params" and isinstance(value, dict):
+            for pkey, pvalue in value.items():
+                flat[f"params.{pkey}"] = pvalue
+        elif isinstance(value, dict):
+            for sub, svalue in value.items():
+                flat[f"{key}.{sub}"] = svalue
+        elif isinstance(value, list):
+            for i, item in enumerate(value):
+                flat[f"{key}.{i}"] = item
+        else:
+            flat[key] = value
+    return flat
+
+def is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+class ConfigIndex:
+    """Rows of config metadata plus a numeric column matrix."""
+
+    def __init__(self, rows=None, numeric_columns=None, numeric=None):
+        self.rows = rows or []
+        self.numeric_columns = numeric_columns or []
+        self.numeric = numeric if numeric is not None else np.zeros((0, 0))
+        self._col = {c: i for i, c in enumerate(self.numeric_columns)}
+        self._text = {c for row in self.rows for c in row["text"]}
+        self.dirty = False
+
+    # --- Persistence
+    @classmethod
+    def load(cls, directory=None):
+        directory = Path(directory or index_dir)
+        try:
+            meta = json.loads((directory / "rows.json").read_text(encoding="utf-8"))
+            if meta.get("version") != index_version:
+                return cls()
+            numeric = np.load(directory / "numeric.npy", mmap_mode="r")
+        except (OSError, ValueError):
+            return cls()
+        return cls(meta["rows"], meta["numeric_columns"], numeric)
+
+    def save(self, directory=None):
+        directory = Path(directory or index_dir)
+        directory.mkdir(parents=True, exist_ok=True)
+        tmp = directory / "numeric.tmp.npy"
+        np.save(tmp, np.ascontiguousarray(self.numeric))
+        os.replace(tmp, directory / "numeric.npy")
+        meta = {"version": index_version, "numeric_columns": self.numeric_columns, "rows": self.rows}
+        tmp = directory / "rows.tmp.json"
+        tmp.write_text(json.dumps(meta, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, directory / "rows.json")
+
+    # --- Building
+    @classmethod
+    def build(cls, root=None, previous=None):
+        """Index every config under root, reusing rows from previous where possible.
+
+        Returns (index, changed) where changed counts re-parsed files;
+        index.dirty tells whether anything differs from previous.
+        """
+        root = Path(root or config_dir)
+        previous = previous or cls()
+        old_rows = {row["path"]: (row, previous.row_values(i)) for i, row in enumerate(previous.rows)}
+
+        rows, values, changed, dirty = [], [], 0, False
+        for path in sorted(root.rglob("*.json")):
+            fields = parse_filename(path.name)
+            if fields is None:
+                continue
+            rel = path.as_posix()
+            stat = path.stat()
+            old = old_rows.get(rel)
+            if old and old[0]["mtime"] == stat.st_mtime_ns and old[0]["size"] == stat.st_size:
+                rows.append(old[0])
+                values.append(old[1])
+                continue
+
+            dirty = True
+            raw = path.read_bytes()
+            digest = hashlib.sha256(raw).hexdigest()
+            if old and old[0]["sha256"] == digest:
+                row, flat = dict(old[0]), old[1]
+            else:
+                flat = flatten(json.loads(raw.decode("utf-8-sig")))
+                row = {"path": rel, **fields}
+                row["text"] = {k: json.dumps(v, ensure_ascii=False) for k, v in flat.items() if not is_number(v)}
+                flat = {k: float(v) for k, v in flat.items() if is_number(v)}
+                changed += 1
+            row.update({"mtime": stat.st_mtime_ns, "size": stat.st_size, "sha256": digest})
+            rows.append(row)
+            values.append(flat)
+
+        columns = sorted({c for flat in values for c in flat})
+        col = {c: i for i, c in enumerate(columns)}
+        numeric = np.full((len(rows), len(columns)), np.nan)
+        for r, flat in enumerate(values):
+            for c, v in flat.items():
+                numeric[r, col[c]] = v
+        index = cls(rows, columns, numeric)
+        index.dirty = dirty or set(old_rows) != {row["path"] for row in rows}
+        return index, changed
+
+    def row_values(self, i):
+        row = self.numeric[i]
+        return {c: float(row[j]) for c, j in self._col.items() if not np.isnan(row[j])}
+
+    # --- Queries
+    def resolve(self, column):
+        """Accept bare params names (target_fps) as well as full column names."""
+        for candidate in (column, f"params.{column}"):
+            if candidate in self._col or candidate in self._text:
+                return candidate
+        raise KeyError(f"Unknown column: {column}")
+
+    def where(self, clause, mask=None):
+        """Filter by "column op value"; numeric columns are compared vectorized."""
+        m = WHERE_RE.match(clause)
+        if not m:
+            raise ValueError(f"Cannot parse condition: {clause!r}")
+        column, op, literal = m.groups()
+        column = self.resolve(column)
+        mask = np.ones(len(self.rows), dtype=bool) if mask is None else mask
+
+        if column in self._col:
+            values = np.asarray(self.numeric[:, self._col[column]])
+            target = float(literal)
+            with np.errstate(invalid="ignore"):
+                result = {
+                    ">": values > target, ">=": values >= target, "<": values < target,
+                    "<=": values <= target, "==": values == target, "!=": values != target,
+                }[op]
+            return mask & result
+
+        if op not in ("==", "!="):
+            raise ValueError(f"Only == and != work on text column {column}")
+        try:
+            expected = json.dumps(json.loads(literal), ensure_ascii=False)
+        except ValueError:
+            expected = json.dumps(literal, ensure_ascii=False)
+        result = np.array([row["text"].get(column) == expected for row in self.rows], dtype=bool)
+        return mask & (result if op == "==" else ~result)
+
+    def latest(self, shovel=None, dt=None):
+        """Newest config per (shovel, variant, profile, dt version), by v then date."""
+        best = {}
+        for i, row in enumerate(self.rows):
+            if shovel and shovel.lower() not in row["shovel"].lower():
+                continue
+            if dt and row["dt"] != dt:
+                continue
+            key = (row["shovel"], row["variant"], row["profile"], row["dt"])
+            if key not in best or (row["v"], row["date"]) > (self.rows[best[key]]["v"], self.rows[best[key]]["date"]):
+                best[key] = i
+        return sorted(best.values(), key=lambda i: (version_key(self.rows[i]["dt"]), self.rows[i]["shovel"], self.rows[i]["variant"]))
+
+    def find(self, name):
+        """Row index for a path or filename."""
+        for i, row in enumerate(self.rows):
+            if row["path"] == Path(name).as_posix() or row["path"].rsplit("/", 1)[-1] == Path(name).name:
+                return i
+        raise KeyError(f"Config not in index: {name}")
+
+    def diff(self, a, b):
+        """Return [(column, value_a, value_b)] for every field that differs."""
+        ia, ib = self.find(a), self.find(b)
+        changes = []
+        na, nb = np.asarray(self.numeric[ia]), np.asarray(self.numeric[ib])
+        differs = ~((na == nb) | (np.isnan(na) & np.isnan(nb)))
+        for j in np.flatnonzero(differs):
+            va, vb = na[j], nb[j]
+            changes.append((self.numeric_columns[j], None if np.isnan(va) else va.item(), None if np.isnan(vb) else vb.item()))
+        ta, tb = self.rows[ia]["text"], self.rows[ib]["text"]
+        for column in sorted(set(ta) | set(tb)):
+            if ta.get(column) != tb.get(column):
+                va = json.loads(ta[column]) if column in ta else None
+                vb = json.loads(tb[column]) if column in tb else None
+                changes.append((column, va, vb))
+        changes.sort(key=lambda c: c[0])
+        return changes
+
+def open_index(rebuild=False, root=None, directory=None):
+    """Load the index and bring it up to date with the config tree."""
+    previous = None if rebuild else ConfigIndex.load(directory)
+    index, changed = ConfigIndex.build(root, previous)
+    if index.dirty or rebuild:
+        index.save(directory)
+    return index, changed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query the dig-tool config corpus.")
+    parser.add_argument("--root", default=str(config_dir))
+    parser.add_argument("--index-dir", default=str(index_dir))
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="update the index")
+    build.add_argument("--rebuild", action="store_true", help="ignore the existing index")
+    latest = sub.add_parser("latest", help="newest config per shovel and dig-tool version")
+    latest.add_argument("--shovel")
+    latest.add_argument("--dt")
+    query = sub.add_parser("query", help="configs matching every --where condition")
+    query.add_argument("--where", action="append", default=[], help='e.g. "target_fps>100"')
+    diff = sub.add_parser("diff", help="field differences between two configs")
+    diff.add_argument("a")
+    diff.add_argument("b")
+    args = parser.parse_args(argv)
+
+    index, changed = open_index(getattr(args, "rebuild", False), args.root, args.index_dir)
+
+    try:
+        if args.command == "build":
+            print(f"Indexed {len(index.rows)} configs ({changed} re-parsed).")
+        elif args.command == "latest":
+            for i in index.latest(args.shovel, args.dt):
+                print(index.rows[i]["path"])
+        elif args.command == "query":
+            mask = None
+            for clause in args.where:
+                mask = index.where(clause, mask)
+            rows = range(len(index.rows)) if mask is None else np.flatnonzero(mask)
+            for i in rows:
+                print(index.rows[i]["path"])
+        elif args.command == "diff":
+            changes = index.diff(args.a, args.b)
+            if not changes:
+                print("No differences.")
+            for column, va, vb in changes:
+                print(f"{column}: {va!r} -> {vb!r}")
+    except (KeyError, ValueError) as e:
+        print(f"✖ {e.args[0] if e.args else e}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,356 @@
+"""Content-addressed delta storage for the KC-Config-Suite dig-tool configs.
+
+The configs of one shovel and dig-tool version differ in a handful of values
+(v2 bumps zone_smoothing_factor, another profile changes the webhook), so the
+store keeps:
+
+* one base per (shovel, dt version): the member config closest to all the
+  others. Only the oldest base is stored whole; every other base is a patch
+  against the same shovel's previous base or, for a shovel's first version,
+  against the newest base so far
+* every config as a JSON patch (RFC 6902 add/remove/replace/move) against its base
+* every value once: bases and patches keep their objects and arrays but
+  refer to each key, string, number, boolean and patch path by its index in
+  one interned table, so a webhook URL or "/params/system_latency" shared by
+  twenty configs is stored a single time
+
+Configs are materialized on demand through an LRU cache, so walking a
+shovel's history rebuilds each base once. `export` writes the standalone
+files the dig tool reads, byte-for-byte as they are committed (indent=4,
+with or without a trailing newline).
+
+Usage:
+    python .github/scripts/config_store.py pack [--store .kc_index/config_store.json]
+    python .github/scripts/config_store.py show CONFIG
+    python .github/scripts/config_store.py history [--shovel S]
+    python .github/scripts/config_store.py diff CONFIG_A CONFIG_B
+    python .github/scripts/config_store.py export [--output-dir KC-Config-Suite]
+"""
+import argparse
+import functools
+import json
+import sys
+from pathlib import Path
+
+from config_index import config_dir, index_dir, parse_filename, version_key
+from sync_azerty_patterns import write_if_changed
+
+default_store = index_dir / "config_store.json"
+default_cache_size = 64
+
+# Bump when the stored layout changes
+store_version = 1
+
+def value_key(value):
+    """Interning key: the compact JSON text, so 1, 1.0 and true stay distinct."""
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+def escape(key):
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+def unescape(token):
+    return token.replace("~1", "/").replace("~0", "~")
+
+def diff(a, b, path=""):
+    """RFC 6902 operations turning a into b, keeping b's key order.
+
+    Added keys land at the end of an object, so the longest start of b whose
+    keys appear in the same order in a is patched in place, and every key
+    after it is moved onto itself (which sends it to the end) and then
+    patched, or added. Arrays are patched element-wise when the lengths
+    match. Either way a container is replaced whole when that is shorter.
+    """
+    if isinstance(a, dict) and isinstance(b, dict):
+        position = {k: i for i, k in enumerate(a)}
+        kept, last = [], -1
+        for k in b:
+            if position.get(k, -1) <= last:
+                break
+            kept.append(k)
+            last = position[k]
+        ops = [{"op": "remove", "path": f"{path}/{escape(k)}"} for k in a if k not in b]
+        for k in kept:
+            ops.extend(diff(a[k], b[k], f"{path}/{escape(k)}"))
+        for k in list(b)[len(kept):]:
+            sub = f"{path}/{escape(k)}"
+            if k in a:
+                ops.append({"op": "move", "from": sub, "path": sub})
+                ops.extend(diff(a[k], b[k], sub))
+            else:
+                ops.append({"op": "add", "path": sub, "value": b[k]})
+        return smaller(ops, path, b)
+    if isinstance(a, list) and isinstance(b, list) and len(a) == len(b):
+        return smaller([op for i, (x, y) in enumerate(zip(a, b)) for op in diff(x, y, f"{path}/{i}")], path, b)
+    if value_key(a) == value_key(b):
+        return []
+    return [{"op": "replace", "path": path, "value": b}]
+
+def smaller(ops, path, value):
+    """ops, or a single replace of the whole value if that is shorter."""
+    replace = [{"op": "replace", "path": path, "value": value}]
+    return replace if len(value_key(replace)) < len(value_key(ops)) else ops
+
+def locate(doc, pointer):
+    """(container, key or index) a JSON pointer refers to."""
+    *parents, last = [unescape(t) for t in pointer.split("/")[1:]]
+    target = doc
+    for token in parents:
+        target = target[int(token)] if isinstance(target, list) else target[token]
+    if isinstance(target, list):
+        last = len(target) if last == "-" else int(last)
+    return target, last
+
+def apply_patch(doc, ops):
+    """Apply add/remove/replace/move operations to a deep copy of doc."""
+    doc = json.loads(json.dumps(doc))
+    for op in ops:
+        if op["path"] == "":
+            doc = json.loads(json.dumps(op["value"]))
+            continue
+        if op["op"] == "move":
+            target, last = locate(doc, op["from"])
+            value = target.pop(last)
+            op = {"op": "add", "path": op["path"], "value": value}
+        target, last = locate(doc, op["path"])
+        if op["op"] == "remove":
+            del target[last]
+        elif op["op"] == "add" and isinstance(target, list):
+            target.insert(last, json.loads(json.dumps(op["value"])))
+        elif op["op"] in ("add", "replace"):
+            target[last] = json.loads(json.dumps(op["value"]))
+        else:
+            raise ValueError(f"Unsupported patch operation: {op['op']}")
+    return doc
+
+class Interner:
+    """Table of unique values; intern() returns a value's index."""
+
+    def __init__(self, values=None):
+        self.values = list(values or [])
+        self._ids = {value_key(v): i for i, v in enumerate(self.values)}
+
+    def intern(self, value):
+        key = value_key(value)
+        if key not in self._ids:
+            self._ids[key] = len(self.values)
+            self.values.append(value)
+        return self._ids[key]
+
+    def encode_tree(self, tree):
+        """Containers stay containers; every leaf and object key becomes its value index."""
+        if isinstance(tree, dict):
+            return {str(self.intern(k)): self.encode_tree(v) for k, v in tree.items()}
+        if isinstance(tree, list):
+            return [self.encode_tree(v) for v in tree]
+        return self.intern(tree)
+
+    def decode_tree(self, tree):
+        if isinstance(tree, dict):
+            return {self.values[int(k)]: self.decode_tree(v) for k, v in tree.items()}
+        if isinstance(tree, list):
+            return [self.decode_tree(v) for v in tree]
+        return self.values[tree]
+
+    def encode_ops(self, ops):
+        """Compact operations: [op, path], [op, path, encoded value tree] or ["move", path, from],
+        with paths interned like values."""
+        encoded = []
+        for op in ops:
+            extra = [self.intern(op["from"])] if op["op"] == "move" else [self.encode_tree(op["value"])] if "value" in op else []
+            encoded.append([op["op"], self.intern(op["path"])] + extra)
+        return encoded
+
+    def decode_ops(self, ops):
+        decoded = []
+        for op in ops:
+            entry = {"op": op[0], "path": self.values[op[1]]}
+            if op[0] == "move":
+                entry["from"] = self.values[op[2]]
+            elif len(op) > 2:
+                entry["value"] = self.decode_tree(op[2])
+            decoded.append(entry)
+        return decoded
+
+def patch_cost(a, b):
+    return len(value_key(diff(a, b)))
+
+def group_key(fields):
+    return f"{fields['shovel']}@{fields['dt']}"
+
+class ConfigStore:
+    """Bases, per-config patches and the interned value table."""
+
+    def __init__(self, values=None, bases=None, configs=None, cache_size=default_cache_size):
+        self.interner = Interner(values)
+        self.bases = bases or {}
+        self.configs = configs or {}
+        self.cache_size = cache_size
+        self._base = functools.lru_cache(maxsize=cache_size)(self._materialize_base)
+        self._config = functools.lru_cache(maxsize=cache_size)(self._materialize_config)
+
+    # --- Building
+    @classmethod
+    def pack(cls, root=None):
+        """Build a store from the standalone configs under root."""
+        root = Path(root or config_dir)
+        groups = {}
+        for path in sorted(root.rglob("*.json")):
+            fields = parse_filename(path.name)
+            if fields is None:
+                continue
+            raw = path.read_bytes()
+            text = raw.decode("utf-8-sig")
+            entry = {"path": path.relative_to(root).as_posix(), "data": json.loads(text),
+                     "newline": text.endswith("\n"), "ascii": text.isascii()}
+            groups.setdefault(group_key(fields), (fields, []))[1].append(entry)
+
+        store = cls()
+        interner = store.interner
+        previous, newest = {}, None
+        # Oldest dt version first, so bases chain forward in time
+        for key, (fields, members) in sorted(groups.items(), key=lambda g: (version_key(g[1][0]["dt"]), g[1][0]["shovel"])):
+            datas = [m["data"] for m in members]
+            base = min(datas, key=lambda d: (sum(patch_cost(d, o) for o in datas), datas.index(d)))
+            parent = previous.get(fields["shovel"], newest)
+            if parent is None:
+                store.bases[key] = {"tree": interner.encode_tree(base)}
+            else:
+                store.bases[key] = {"parent": parent[0], "patch": interner.encode_ops(diff(parent[1], base))}
+            previous[fields["shovel"]] = newest = (key, base)
+            for m in members:
+                store.configs[m["path"]] = {"base": key, "patch": interner.encode_ops(diff(base, m["data"])),
+                                            "newline": m["newline"], "ascii": m["ascii"]}
+        return store
+
+    # --- Persistence
+    def to_dict(self):
+        return {"version": store_version, "values": self.interner.values, "bases": self.bases, "configs": self.configs}
+
+    def save(self, path=None):
+        path = Path(path or default_store)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return write_if_changed(path, json.dumps(self.to_dict(), separators=(",", ":"), ensure_ascii=False))
+
+    @classmethod
+    def load(cls, path=None, cache_size=default_cache_size):
+        data = json.loads(Path(path or default_store).read_text(encoding="utf-8"))
+        if data.get("version") != store_version:
+            raise ValueError(f"{path or default_store} is a version {data.get('version')} store; run pack again")
+        return cls(data["values"], data["bases"], data["configs"], cache_size)
+
+    # --- Materializing
+    def _materialize_base(self, key):
+        base = self.bases[key]
+        if "tree" in base:
+            return self.interner.decode_tree(base["tree"])
+        return apply_patch(self._base(base["parent"]), self.interner.decode_ops(base["patch"]))
+
+    def _materialize_config(self, path):
+        entry = self.configs[path]
+        return apply_patch(self._base(entry["base"]), self.interner.decode_ops(entry["patch"]))
+
+    def resolve(self, name):
+        """Store path for a path relative to the root, a filename or a path under config_dir."""
+        name = Path(name).as_posix()
+        if name in self.configs:
+            return name
+        for path in self.configs:
+            if name.endswith("/" + path) or path.rsplit("/", 1)[-1] == name.rsplit("/", 1)[-1]:
+                return path
+        raise KeyError(f"Config not in store: {name}")
+
+    def get(self, name):
+        """The full config; a fresh copy, so callers may modify it."""
+        return json.loads(json.dumps(self._config(self.resolve(name))))
+
+    def text(self, name):
+        """The config as its standalone file."""
+        path = self.resolve(name)
+        entry = self.configs[path]
+        return json.dumps(self._config(path), indent=4, ensure_ascii=entry["ascii"]) + ("\n" if entry["newline"] else "")
+
+    def changes(self, name):
+        """The config's own operations against its base, values included."""
+        entry = self.configs[self.resolve(name)]
+        return self.interner.decode_ops(entry["patch"])
+
+    def export(self, out_dir=None):
+        """Write every config as a standalone file. Returns the number of files written."""
+        out_dir = Path(out_dir or config_dir)
+        written = 0
+        for path in self.configs:
+            out = out_dir / path
+            out.parent.mkdir(parents=True, exist_ok=True)
+            written += write_if_changed(out, self.text(path))
+        return written
+
+    def ordered(self, shovel=None):
+        """Store paths by shovel, dt version, v and date."""
+        keyed = []
+        for path in self.configs:
+            fields = parse_filename(path.rsplit("/", 1)[-1])
+            if shovel and shovel.lower() not in fields["shovel"].lower():
+                continue
+            keyed.append(((fields["shovel"], version_key(fields["dt"]), fields["variant"], fields["profile"], fields["v"], fields["date"]), path))
+        return [path for _, path in sorted(keyed)]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Delta storage for the dig-tool configs.")
+    parser.add_argument("--root", default=str(config_dir))
+    parser.add_argument("--store", default=str(default_store))
+    parser.add_argument("--cache-size", type=int, default=default_cache_size, help="materialized configs kept in memory")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("pack", help="build the store from the standalone configs and verify the export")
+    show = sub.add_parser("show", help="print a materialized config")
+    show.add_argument("config")
+    history = sub.add_parser("history", help="each config's changes against its base")
+    history.add_argument("--shovel")
+    diff_cmd = sub.add_parser("diff", help="JSON patch between two configs")
+    diff_cmd.add_argument("a")
+    diff_cmd.add_argument("b")
+    export = sub.add_parser("export", help="write the standalone config files")
+    export.add_argument("--output-dir", default=None, help="default: --root")
+    args = parser.parse_args(argv)
+
+    root = Path(args.root)
+    if args.command == "pack":
+        store = ConfigStore.pack(root)
+        mismatched = [p for p in store.configs if store.text(p).encode("utf-8") != (root / p).read_bytes()]
+        for path in mismatched:
+            print(f"✖ {path}: export does not reproduce the file")
+        store.save(args.store)
+        raw = sum((root / p).stat().st_size for p in store.configs)
+        packed = Path(args.store).stat().st_size
+        print(f"Packed {len(store.configs)} configs into {len(store.bases)} bases and "
+              f"{len(store.interner.values)} values: {packed} bytes vs {raw} standalone ({100 * packed / raw:.0f}%).")
+        return 1 if mismatched else 0
+
+    try:
+        store = ConfigStore.load(args.store, args.cache_size)
+    except (OSError, ValueError) as e:
+        print(f"✖ {e}; run `config_store.py pack` first")
+        return 1
+
+    try:
+        if args.command == "show":
+            print(store.text(args.config), end="")
+        elif args.command == "history":
+            for path in store.ordered(args.shovel):
+                entry = store.configs[path]
+                ops = store.changes(path)
+                print(f"{path} (base {entry['base']}): {len(ops) or 'no'} change{'s' if len(ops) != 1 else ''}")
+                for op in ops:
+                    print(f"    {op['op']} {op['path']}" + (f" = {value_key(op['value'])}" if "value" in op else ""))
+        elif args.command == "diff":
+            print(json.dumps(diff(store.get(args.a), store.get(args.b)), indent=2, ensure_ascii=False))
+        elif args.command == "export":
+            out_dir = Path(args.output_dir or root)
+            written = store.export(out_dir)
+            print(f"Exported {len(store.configs)} configs to {out_dir} ({written} written).")
+    except KeyError as e:
+        print(f"✖ {e.args[0] if e.args else e}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,16 @@
+import argparse
 import re
 import sys
 from pathlib import Path
 
+from spans import span
+
+# Expected filename example:
+# _KC_Pattern_Suite_dt2.x_v4_20250630.json
+SUITE_RE = re.compile(r'_KC_Pattern_Suite_dt(\d+)\.x_v(\d+)_\d+\.json')
+
 def parse_version(filename):
-    # Expected filename example:
-    # _KC_Pattern_Suite_dt2.x_v4_20250630.json
-    pattern = re.compile(r'_KC_Pattern_Suite_dt(\d+)\.x_v(\d+)_\d+\.json')
-    m = pattern.match(filename)
+    m = SUITE_RE.match(filename)
     if not m:
         return None
     dt = int(m.group(1))
@@ -26,10 +30,18 @@ def find_latest_file(directory):
     parsed_files.sort(key=lambda x: (x[0][0], x[0][1]))
     return parsed_files[-1][1]
 
-if __name__ == "__main__":
-    directory = sys.argv[1]
-    latest = find_latest_file(directory)
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print the newest pattern suite file in a directory.")
+    parser.add_argument("directory", nargs="?", default="KC-Config-Suite/Pattern_Suite",
+                        help="directory to search (default: %(default)s)")
+    directory = parser.parse_args(argv).directory
+    with span("find_latest_pattern"), span("scan suites", "io", directory=str(directory)):
+        latest = find_latest_file(directory)
     if latest:
         print(str(latest))
     else:
         print("")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
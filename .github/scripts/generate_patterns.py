@@ -0,0 +1,258 @@
+"""Search for walk patterns by simulated annealing.
+
+A candidate is a closed walk of `length` w/a/s/d moves (it returns to the
+origin, so the bot can loop it forever) that never leaves a square of
+`radius` tiles around the origin and never repeats one move more than
+`max_run` times in a row (runs wrap around the loop). Its score is
+
+    coverage - revisit_cost * revisits
+
+where coverage counts distinct tiles visited in one loop and revisits counts
+the other visits. Two kinds of move keep a walk closed: swapping two moves,
+and replacing an opposite pair (w/s or a/d) by another opposite pair. Both
+only shift the tiles between the two changed positions, so a proposal is
+scored by updating visit counts on that segment instead of re-walking the loop.
+
+Restarts run on a process pool; restart k uses seed + k, so a run is
+reproducible for a given seed whatever the worker count.
+
+Usage:
+    python .github/scripts/generate_patterns.py --length 48 --radius 3 --restarts 16 --output suite.json
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from layouts import dump_json
+
+MOVES = "wasd"
+VECTORS = [(0, -1), (-1, 0), (0, 1), (1, 0)]
+# Index of the opposite move: w <-> s, a <-> d
+OPPOSITE = [2, 3, 0, 1]
+
+default_iterations = 20000
+default_t_start = 2.0
+default_t_end = 0.02
+
+class Walk:
+    """A closed walk with per-tile visit counts kept up to date on every change."""
+
+    def __init__(self, moves, radius, max_run, revisit_cost=1.0):
+        self.moves = list(moves)
+        self.length = len(self.moves)
+        self.radius = radius
+        self.max_run = max_run
+        self.revisit_cost = revisit_cost
+        self.width = 2 * radius + 1
+        self.visits = [0] * (self.width * self.width)
+        self.coverage = 0
+
+        # xs/ys[k] is the tile after k moves; the loop visits tiles 0..length-1
+        self.xs = [0] * (self.length + 1)
+        self.ys = [0] * (self.length + 1)
+        for k, m in enumerate(self.moves):
+            dx, dy = VECTORS[m]
+            self.xs[k + 1] = self.xs[k] + dx
+            self.ys[k + 1] = self.ys[k] + dy
+        if self.xs[-1] or self.ys[-1]:
+            raise ValueError("walk does not return to the origin")
+        for k in range(self.length):
+            if not self.inside(self.xs[k], self.ys[k]):
+                raise ValueError(f"walk leaves the radius {radius} square")
+            self._add(self.xs[k], self.ys[k], 1)
+
+    def inside(self, x, y):
+        return -self.radius <= x <= self.radius and -self.radius <= y <= self.radius
+
+    def _add(self, x, y, n):
+        cell = (y + self.radius) * self.width + x + self.radius
+        before = self.visits[cell]
+        self.visits[cell] = before + n
+        if before == 0:
+            self.coverage += 1
+        elif before + n == 0:
+            self.coverage -= 1
+
+    @property
+    def revisits(self):
+        return self.length - self.coverage
+
+    @property
+    def score(self):
+        return self.coverage - self.revisit_cost * self.revisits
+
+    def run_length(self, k):
+        """Length of the run of identical moves through position k, wrapping around."""
+        m = self.moves[k]
+        n = 1
+        while n < self.length and self.moves[(k - n) % self.length] == m:
+            n += 1
+        left = n - 1
+        n = 1
+        while left + n < self.length and self.moves[(k + n) % self.length] == m:
+            n += 1
+        return left + n
+
+    def apply(self, i, j, new_i, new_j):
+        """Set moves i < j; the pair must keep the walk closed. Returns False (unchanged) if it breaks a constraint."""
+        old_i, old_j = self.moves[i], self.moves[j]
+        dx = VECTORS[new_i][0] - VECTORS[old_i][0]
+        dy = VECTORS[new_i][1] - VECTORS[old_i][1]
+        xs, ys = self.xs, self.ys
+        for k in range(i + 1, j + 1):
+            if not self.inside(xs[k] + dx, ys[k] + dy):
+                return False
+
+        self.moves[i], self.moves[j] = new_i, new_j
+        if self.run_length(i) > self.max_run or self.run_length(j) > self.max_run:
+            self.moves[i], self.moves[j] = old_i, old_j
+            return False
+        self._shift(i, j, dx, dy)
+        return True
+
+    def _shift(self, i, j, dx, dy):
+        xs, ys = self.xs, self.ys
+        for k in range(i + 1, j + 1):
+            self._add(xs[k], ys[k], -1)
+            xs[k] += dx
+            ys[k] += dy
+            self._add(xs[k], ys[k], 1)
+
+    def revert(self, i, j, old_i, old_j):
+        new_i = self.moves[i]
+        self.moves[i], self.moves[j] = old_i, old_j
+        self._shift(i, j, VECTORS[old_i][0] - VECTORS[new_i][0], VECTORS[old_i][1] - VECTORS[new_i][1])
+
+    def text(self):
+        return "".join(MOVES[m] for m in self.moves)
+
+def score_moves(moves, revisit_cost=1.0):
+    """Score a closed walk (a string of w/a/s/d) from scratch; returns (score, coverage, revisits)."""
+    x = y = 0
+    seen = set()
+    for m in moves:
+        seen.add((x, y))
+        dx, dy = VECTORS[MOVES.index(m)]
+        x, y = x + dx, y + dy
+    revisits = len(moves) - len(seen)
+    return len(seen) - revisit_cost * revisits, len(seen), revisits
+
+def initial_moves(length):
+    """Back and forth along one edge: closed, inside any radius >= 1, runs of 1."""
+    return [0, 2] * (length // 2)
+
+def propose(walk, rng):
+    """A random closed-walk-preserving change (i, j, new_i, new_j), or None."""
+    i, j = sorted(rng.sample(range(walk.length), 2))
+    old_i, old_j = walk.moves[i], walk.moves[j]
+    if old_j == OPPOSITE[old_i] and rng.random() < 0.5:
+        new = rng.randrange(4)
+        return i, j, new, OPPOSITE[new]
+    if old_i == old_j:
+        return None
+    return i, j, old_j, old_i
+
+def anneal(length, radius, max_run, seed, iterations=default_iterations, revisit_cost=1.0,
+           t_start=default_t_start, t_end=default_t_end):
+    """One annealing run. Returns a result dict with the best walk found."""
+    if length % 2 or length < 2:
+        raise ValueError("length must be even and at least 2 for a closed walk")
+    rng = random.Random(seed)
+    walk = Walk(initial_moves(length), radius, max_run, revisit_cost)
+    best_score, best_moves = walk.score, walk.text()
+    cooling = (t_end / t_start) ** (1.0 / max(iterations - 1, 1))
+    temperature = t_start
+    proposals = 0
+    start = time.perf_counter()
+
+    for _ in range(iterations):
+        temperature *= cooling
+        change = propose(walk, rng)
+        if change is None:
+            continue
+        i, j, new_i, new_j = change
+        old_i, old_j = walk.moves[i], walk.moves[j]
+        before = walk.score
+        if not walk.apply(i, j, new_i, new_j):
+            continue
+        proposals += 1
+        delta = walk.score - before
+        if delta >= 0 or rng.random() < math.exp(delta / temperature):
+            if walk.score > best_score:
+                best_score, best_moves = walk.score, walk.text()
+        else:
+            walk.revert(i, j, old_i, old_j)
+
+    elapsed = time.perf_counter() - start
+    score, coverage, revisits = score_moves(best_moves, revisit_cost)
+    if score != best_score:
+        # Kept under python -O: the incremental update is the only other source of the score
+        raise RuntimeError(f"incremental score {best_score:g} drifted from the full recount {score:g} (seed {seed})")
+    return {
+        "seed": seed, "moves": best_moves, "score": score, "coverage": coverage, "revisits": revisits,
+        "us_per_proposal": 1e6 * elapsed / max(proposals, 1),
+    }
+
+def anneal_job(kwargs):
+    return anneal(**kwargs)
+
+def search(length, radius, max_run, seed=0, restarts=8, workers=None, **options):
+    """Run restarts with seeds seed..seed+restarts-1; results best first (ties by seed)."""
+    jobs = [dict(length=length, radius=radius, max_run=max_run, seed=seed + k, **options) for k in range(restarts)]
+    workers = min(workers or os.cpu_count() or 1, restarts)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(anneal_job, jobs))
+    else:
+        results = [anneal_job(job) for job in jobs]
+    return sorted(results, key=lambda r: (-r["score"], r["seed"]))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate closed walk patterns by simulated annealing.")
+    parser.add_argument("--length", type=int, default=48, help="moves per loop (even)")
+    parser.add_argument("--radius", type=int, default=3, help="max tiles from the origin in x and y")
+    parser.add_argument("--max-run", type=int, default=3, help="longest run of one move")
+    parser.add_argument("--revisit-cost", type=float, default=1.0)
+    parser.add_argument("--iterations", type=int, default=default_iterations)
+    parser.add_argument("--restarts", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-j", "--workers", type=int, default=None)
+    parser.add_argument("--keep", type=int, default=3, help="number of distinct winners to write")
+    parser.add_argument("--prefix", default="_KC_Anneal", help="pattern name prefix")
+    parser.add_argument("--output", help="write winners as a suite JSON file")
+    args = parser.parse_args(argv)
+
+    try:
+        results = search(args.length, args.radius, args.max_run, args.seed, args.restarts, args.workers,
+                         iterations=args.iterations, revisit_cost=args.revisit_cost)
+    except ValueError as e:
+        print(f"✖ {e}")
+        return 1
+
+    winners = []
+    for result in results:
+        if result["moves"] not in {w["moves"] for w in winners}:
+            winners.append(result)
+        if len(winners) == args.keep:
+            break
+
+    suite = {}
+    for n, result in enumerate(winners, 1):
+        name = f"{args.prefix}_L{args.length}_v{n}"
+        suite[name] = list(result["moves"])
+        print(f"{name}: score {result['score']:g}, {result['coverage']} tiles, {result['revisits']} revisits "
+              f"(seed {result['seed']}, {result['us_per_proposal']:.1f} µs/proposal)")
+        print(f"    {result['moves']}")
+
+    if args.output:
+        Path(args.output).write_text(dump_json(suite), encoding="utf-8")
+        print(f"Wrote {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""One entry point for the repository tools.
+
+    python .github/scripts/kc.py <command> [args...]
+
+Each command lives in its own module and is imported only when it runs, so
+`kc find-latest` never pays for Pillow, NumPy, SciPy or matplotlib, and
+`import kc` has no side effects. `kc budget` checks both in a fresh
+interpreter.
+"""
+import importlib
+import os
+import sys
+
+# os.path rather than pathlib/subprocess at import time: this module must stay cheap to import
+scripts_dir = os.path.dirname(os.path.abspath(__file__))
+assets_scripts_dir = os.path.join(os.path.dirname(os.path.dirname(scripts_dir)), "assets", "scripts")
+
+# command: (module, help); every module exposes main(argv) -> exit code
+COMMANDS = {
+    "sync-layouts": ("sync_azerty_patterns", "mirror the QWERTY pattern suites into other layouts"),
+    "find-latest": ("find_latest_pattern", "print the newest pattern suite file"),
+    "render": ("vizualize_paths", "render pattern suites as animated SVGs"),
+    "timestamp": ("update_shovel_timestamps", "stamp edited README shovel sections"),
+    "fit": ("inventory_walkspeed_penalty_fitter", "fit the inventory walkspeed penalty"),
+    "refit": ("penalty_stream", "stream penalty readings from logs and refit online"),
+    "validate": ("validate_jsons", "validate JSON files against their schemas"),
+    "index": ("config_index", "query the dig-tool config corpus"),
+    "store": ("config_store", "delta storage and standalone export of the configs"),
+    "rescale": ("rescale_configs", "rescale config coordinates to other resolutions"),
+    "analyze": ("analyze_patterns", "rank patterns by coverage metrics"),
+    "patterns": ("pattern_model", "run-length suite store, diff and round-trip check"),
+    "canon": ("pattern_canon", "find duplicate and symmetric patterns"),
+    "timeline": ("timeline", "compile and replay pattern-entry key timelines"),
+    "generate": ("generate_patterns", "search for new walk patterns"),
+    "regions": ("region_harness", "test inclusion zones and stop colors on screenshots"),
+    "simulate": ("throughput_simulator", "predict dig throughput for a config"),
+    "detect": ("detection_simulator", "simulate hit rate and click timing of detection params"),
+    "bench": ("benchmark", "benchmark the scripts on synthetic inputs"),
+    "trace": ("spans", "compare the stage timings of two KC_TRACE traces"),
+    "watch": ("watch", "re-sync, validate, render and timestamp on file changes"),
+}
+
+# Modules that must not be loaded by `import kc` or `kc find-latest`
+HEAVY_MODULES = ("numpy", "scipy", "matplotlib", "PIL")
+import_budget_ms = 30
+find_latest_budget_ms = 50
+
+def load(command):
+    """Import the module behind a command."""
+    module_name, _ = COMMANDS[command]
+    for directory in (scripts_dir, assets_scripts_dir):
+        if directory not in sys.path:
+            sys.path.append(directory)
+    return importlib.import_module(module_name)
+
+def usage():
+    width = max(len(c) for c in COMMANDS) + 2
+    lines = ["usage: kc <command> [args...]", "", "commands:"]
+    lines += [f"  {command:<{width}}{help_text}" for command, (_, help_text) in COMMANDS.items()]
+    lines.append(f"  {'budget':<{width}}check import-time budgets")
+    return "\n".join(lines)
+
+_probe = """
+import json, sys, time
+sys.path.insert(0, {scripts!r})
+start = time.perf_counter()
+import kc
+imported = time.perf_counter() - start
+heavy_after_import = [m for m in kc.HEAVY_MODULES if m in sys.modules]
+import contextlib, io
+start = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    kc.main(["find-latest", {pattern_dir!r}])
+ran = time.perf_counter() - start
+heavy_after_run = [m for m in kc.HEAVY_MODULES if m in sys.modules]
+print(json.dumps([imported, heavy_after_import, ran, heavy_after_run]))
+"""
+
+def check_budget():
+    """Measure `import kc` and `kc find-latest` in a fresh interpreter. Returns an exit code."""
+    import json
+    import subprocess
+
+    code = _probe.format(scripts=scripts_dir, pattern_dir="KC-Config-Suite/Pattern_Suite")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    if result.returncode:
+        print(result.stderr)
+        return 1
+    imported, heavy_import, ran, heavy_run = json.loads(result.stdout)
+
+    failures = []
+    if imported * 1000 > import_budget_ms:
+        failures.append(f"import kc took {imported * 1000:.1f} ms (budget {import_budget_ms} ms)")
+    if ran * 1000 > find_latest_budget_ms:
+        failures.append(f"kc find-latest took {ran * 1000:.1f} ms (budget {find_latest_budget_ms} ms)")
+    if heavy_import:
+        failures.append(f"import kc loaded {', '.join(heavy_import)}")
+    if heavy_run:
+        failures.append(f"kc find-latest loaded {', '.join(heavy_run)}")
+
+    print(f"import kc:      {imported * 1000:6.1f} ms")
+    print(f"kc find-latest: {ran * 1000:6.1f} ms")
+    for failure in failures:
+        print(f"✖ {failure}")
+    return 1 if failures else 0
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] in ("-h", "--help"):
+        print(usage())
+        return 0 if argv else 2
+    command, rest = argv[0], argv[1:]
+    if command == "budget":
+        return check_budget()
+    if command not in COMMANDS:
+        print(f"✖ Unknown command: {command}\n\n{usage()}")
+        return 2
+
+    module = load(command)
+    # argparse takes prog from argv[0]: make sub-command help read "kc <command>"
+    sys.argv[0] = f"kc {command}"
+    return module.main(rest) or 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+"""Keyboard layout transcoding for pattern files.
+
+A layout is a map from the character a QWERTY key produces to the character
+the same physical key produces in that layout. Each map is compiled once into
+`str.translate` tables (both directions, both cases), so converting a pattern
+is one C-level translate per key instead of a dict lookup per character.
+
+Keys may be combos such as "SHIFT+W": only single-character parts are
+translated, so modifiers and zero-width label entries pass through unchanged.
+Entry keys are translated case-insensitively and keep their case where the
+target character has one ("W" -> "," in Dvorak). Entry-file keys are
+uppercase by convention, so a caseless character decodes to uppercase
+("," -> "W").
+"""
+import json
+from pathlib import Path
+
+# QWERTY character -> same physical key in the target layout
+LAYOUT_MAPS = {
+    "qwerty": {},
+    # Only the letter swaps; keeps AZERTY output identical to the original sync script
+    "azerty": {"w": "z", "z": "w", "a": "q", "q": "a"},
+    "qwertz": {"y": "z", "z": "y"},
+    "dvorak": dict(zip(
+        "qwertyuiopasdfghjkl;zxcvbnm,./",
+        "',.pyfgcrlaoeuidhtns;qjkxbmwvz",
+    )),
+}
+
+class Layout:
+    """Compiled translate tables for one layout."""
+
+    def __init__(self, name, mapping):
+        mapping = {k: v for k, v in mapping.items() if k != v}
+        values = list(mapping.values())
+        if len(set(values)) != len(values):
+            raise ValueError(f"Layout {name!r} maps two keys to the same character")
+        if any(len(k) != 1 or len(v) != 1 for k, v in mapping.items()):
+            raise ValueError(f"Layout {name!r} must map single characters")
+
+        self.name = name
+        self.mapping = mapping
+        inverse = {v: k for k, v in mapping.items()}
+        self.encode_table = str.maketrans(self._with_upper(mapping))
+        self.decode_table = str.maketrans(self._with_upper(inverse, caseless_upper=True))
+        # Simple suites are written lowercase, like the original sync script did
+        self.simple_encode_table = str.maketrans(mapping)
+        self.simple_decode_table = str.maketrans(inverse)
+
+    @staticmethod
+    def _with_upper(mapping, caseless_upper=False):
+        """Add the uppercase form of every key that has one.
+
+        With caseless_upper, keys without case ("," in Dvorak) map to the
+        uppercase form of their value, as entry-file keys are written.
+        """
+        table = dict(mapping)
+        for k, v in mapping.items():
+            if k.upper() != k and k.upper() not in mapping:
+                table[k.upper()] = v.upper()
+            elif caseless_upper and k.upper() == k.lower():
+                table[k] = v.upper()
+        return table
+
+    def is_identity(self):
+        return not self.mapping
+
+    # --- Keys
+    def encode_key(self, key):
+        return translate_key(key, self.encode_table)
+
+    def decode_key(self, key):
+        return translate_key(key, self.decode_table)
+
+    # --- Whole pattern files
+    def encode(self, data):
+        return convert_data(data, self.encode_table, self.simple_encode_table)
+
+    def decode(self, data):
+        return convert_data(data, self.decode_table, self.simple_decode_table)
+
+def translate_key(key, table):
+    """Translate the single-character parts of a key combo such as "SHIFT+W"."""
+    if len(key) == 1:
+        return key.translate(table)
+    if "+" not in key:
+        return key
+    return "+".join(p.translate(table) if len(p) == 1 else p for p in key.split("+"))
+
+def is_pattern_entry_file(data):
+    return isinstance(data, dict) and isinstance(data.get("pattern"), list)
+
+def convert_data(data, key_table, simple_table):
+    """Convert either pattern format; returns a new object and leaves data untouched."""
+    if is_pattern_entry_file(data):
+        converted = dict(data)
+        converted["pattern"] = [
+            {**entry, "key": translate_key(entry["key"], key_table)} if "key" in entry else entry
+            for entry in data["pattern"]
+        ]
+        return converted
+    return {
+        name: [c.lower().translate(simple_table) for c in seq]
+        for name, seq in data.items()
+    }
+
+_compiled = {}
+
+def get_layout(name):
+    """Return the compiled layout for a built-in or registered layout name."""
+    name = name.lower()
+    if name not in _compiled:
+        if name not in LAYOUT_MAPS:
+            raise KeyError(f"Unknown layout: {name} (known: {', '.join(sorted(LAYOUT_MAPS))})")
+        _compiled[name] = Layout(name, LAYOUT_MAPS[name])
+    return _compiled[name]
+
+def register_layout(name, mapping):
+    """Add a user-supplied layout map (QWERTY character -> layout character)."""
+    name = name.lower()
+    layout = Layout(name, mapping)
+    LAYOUT_MAPS[name] = dict(mapping)
+    _compiled[name] = layout
+    return layout
+
+def load_layout_file(path):
+    """Register every layout in a JSON file of {"name": {"w": "z", ...}}. Returns their names."""
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    return [register_layout(name, mapping).name for name, mapping in data.items()]
+
+def dump_json(data):
+    """Serialize a pattern file the way the repository stores them."""
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+def unmapped_parts(key, encoded, layout):
+    """Single-character parts of key that the layout maps (in either case) but encoded left unchanged."""
+    return [p for p, e in zip(key.split("+"), encoded.split("+"))
+            if len(p) == 1 and p == e and layout.mapping.get(p.lower(), p.lower()) != p.lower()]
+
+def roundtrip_errors(data, layout):
+    """Return a description of every key that does not survive QWERTY -> layout -> QWERTY.
+
+    Entry keys are compared case-insensitively (they decode to uppercase), and a
+    key part the layout maps but the encoding left as it was is an error too.
+    """
+    if is_pattern_entry_file(data):
+        original = [entry.get("key") for entry in data["pattern"]]
+        encoded = layout.encode(data)
+        errors = [f"{key!r} left unmapped in {layout.name}" for key, entry in zip(original, encoded["pattern"])
+                  if isinstance(key, str) and unmapped_parts(key, entry["key"], layout)]
+        back = [entry.get("key") for entry in layout.decode(encoded)["pattern"]]
+        return errors + [f"{a!r} -> {b!r}" for a, b in zip(original, back)
+                         if a != b and not (isinstance(a, str) and isinstance(b, str) and a.upper() == b.upper())]
+    original = [(name, i, c.lower()) for name, seq in data.items() for i, c in enumerate(seq)]
+    decoded = layout.decode(layout.encode(data))
+    back = [(name, i, c) for name, seq in decoded.items() for i, c in enumerate(seq)]
+    return [f"{a!r} -> {b!r}" for a, b in zip(original, back) if a != b]
@@ -0,0 +1,195 @@
+"""Vectorized path geometry for pattern suites.
+
+Both pattern formats are turned into NumPy arrays of per-step vectors and
+cumulative offsets (in grid steps, +x right, +y down, starting at the origin):
+
+* simple suites: a plain list of moves such as ["w", "a", "s", "d"], or a
+  run-length Pattern (see pattern_model.py)
+* pattern-entry files: {"pattern": [{"key": "SHIFT+W", "duration": 150}, ...]}
+"""
+import numpy as np
+
+from pattern_model import Pattern
+
+default_step_size = 20
+
+move_map = {'w': (0, -1), 'a': (-1, 0), 's': (0, 1), 'd': (1, 0)}
+azerty_move_map = {'z': (0, -1), 'q': (-1, 0), 's': (0, 1), 'd': (1, 0)}
+diagonals = [{"w", "a"}, {"w", "d"}, {"s", "a"}, {"s", "d"}]
+
+def _lookup_table(moves):
+    table = np.zeros((256, 2), dtype=np.int64)
+    for key, vec in moves.items():
+        if len(key) == 1 and ord(key) < 256:
+            table[ord(key)] = vec
+    return table
+
+_tables = {}
+
+def simple_vectors(directions, moves=None):
+    """Return an (N, 2) int array of unit vectors for a list of single-key moves.
+
+    Unknown moves become (0, 0), matching the renderers.
+    """
+    moves = moves or move_map
+    cache_key = tuple(sorted(moves.items()))
+    table = _tables.get(cache_key)
+    if table is None:
+        table = _tables[cache_key] = _lookup_table(moves)
+
+    directions = list(directions)
+    if not directions:
+        return np.zeros((0, 2), dtype=np.int64)
+    joined = "".join(directions)
+    if all(len(d) == 1 for d in directions) and joined.isascii():
+        codes = np.frombuffer(joined.encode("ascii"), dtype=np.uint8)
+        return table[codes]
+    # Multi-character or non-ASCII entries: fall back to a dict lookup
+    return np.array([moves.get(d, (0, 0)) for d in directions], dtype=np.int64).reshape(-1, 2)
+
+def entry_direction(key):
+    """Return the movement for a pattern entry key ("d", "w+a", ...) or None.
+
+    Modifiers such as SHIFT are ignored; only single WASD keys and the four
+    diagonals count as movement.
+    """
+    wasd_parts = [p.lower() for p in key.split("+") if p.lower() in move_map]
+    if len(wasd_parts) == 1:
+        return wasd_parts[0]
+    if len(wasd_parts) == 2 and set(wasd_parts) in diagonals:
+        return "+".join(sorted(wasd_parts))
+    return None
+
+def duration_step(duration):
+    """Step length for an entry duration: duration // 10 clamped to [5, 100]."""
+    try:
+        return max(5, min(100, int(duration) // 10))
+    except (TypeError, ValueError):
+        return default_step_size
+
+def entry_vectors(pattern_list):
+    """Return (vectors, lengths, durations) for a list of pattern entries.
+
+    vectors is an (N, 2) int array of unit or diagonal vectors, lengths holds the
+    duration-scaled step length of each entry and durations the raw duration in
+    milliseconds (0 when missing). Entries that are not movement are skipped.
+    """
+    vecs, lengths, durations = [], [], []
+    for entry in pattern_list:
+        direction = entry_direction(entry.get("key", ""))
+        if direction is None:
+            continue
+        dx = dy = 0
+        for part in direction.split("+"):
+            mx, my = move_map[part]
+            dx += mx
+            dy += my
+        duration = entry.get("duration", None)
+        vecs.append((dx, dy))
+        lengths.append(duration_step(duration))
+        try:
+            durations.append(float(duration))
+        except (TypeError, ValueError):
+            durations.append(0.0)
+    return (np.array(vecs, dtype=np.int64).reshape(-1, 2),
+            np.array(lengths, dtype=np.float64),
+            np.array(durations, dtype=np.float64))
+
+class PathGeometry:
+    """Per-step vectors and cumulative offsets of one walk."""
+
+    def __init__(self, steps, durations=None):
+        self.steps = np.asarray(steps)
+        offsets = np.zeros((len(self.steps) + 1, 2), dtype=self.steps.dtype if len(self.steps) else np.int64)
+        np.cumsum(self.steps, axis=0, out=offsets[1:])
+        self.offsets = offsets
+        self.durations = durations
+
+    @classmethod
+    def from_directions(cls, directions, moves=None):
+        if isinstance(directions, Pattern):
+            return cls.from_pattern(directions, moves)
+        return cls(simple_vectors(directions, moves))
+
+    @classmethod
+    def from_pattern(cls, pattern, moves=None):
+        """Build from a run-length Pattern: one lookup per run, then repeated per step."""
+        counts = np.frombuffer(pattern.counts, dtype=np.uint32) if len(pattern.counts) else np.zeros(0, np.uint32)
+        return cls(np.repeat(simple_vectors(pattern.symbols, moves), counts, axis=0))
+
+    @classmethod
+    def from_entries(cls, pattern_list, step_size=None):
+        """Build from pattern entries.
+
+        Each step is scaled by its duration (see duration_step) and divided by
+        step_size, so offsets are expressed in default-sized grid steps.
+        """
+        vecs, lengths, durations = entry_vectors(pattern_list)
+        scale = lengths / float(step_size or default_step_size)
+        return cls(vecs * scale[:, None], durations)
+
+    @classmethod
+    def from_data(cls, data, moves=None):
+        """Build from either pattern format (a list of moves or a pattern-entry file)."""
+        if isinstance(data, dict) and isinstance(data.get("pattern"), list):
+            return cls.from_entries(data["pattern"])
+        return cls.from_directions(data, moves)
+
+    def __len__(self):
+        return len(self.steps)
+
+    @property
+    def bbox(self):
+        """(min_x, min_y, max_x, max_y) of the offsets."""
+        lo = self.offsets.min(axis=0)
+        hi = self.offsets.max(axis=0)
+        return (lo[0].item(), lo[1].item(), hi[0].item(), hi[1].item())
+
+    @property
+    def extent(self):
+        min_x, min_y, max_x, max_y = self.bbox
+        return (max_x - min_x, max_y - min_y)
+
+    @property
+    def total_distance(self):
+        return float(np.hypot(self.steps[:, 0], self.steps[:, 1]).sum())
+
+    @property
+    def end_offset(self):
+        return tuple(v.item() for v in self.offsets[-1])
+
+    def visit_counts(self):
+        """Return (positions, counts) for every distinct offset visited, start included."""
+        positions, counts = np.unique(self.offsets, axis=0, return_counts=True)
+        return positions, counts
+
+    @property
+    def revisits(self):
+        """Number of visits to an already visited offset."""
+        return len(self.offsets) - len(self.visit_counts()[0])
+
+    def canvas_positions(self, step_size, origin):
+        """Pixel coordinates of every offset as a list of (x, y) int tuples."""
+        pts = np.rint(self.offsets * step_size + np.asarray(origin)).astype(np.int64)
+        return list(map(tuple, pts.tolist()))
+
+def fit_to_canvas(geometry, step_size=default_step_size, margin=20, min_size=(200, 200), max_size=(600, 600)):
+    """Size a canvas to a path.
+
+    Returns (step_size, canvas_size, origin): the step is shrunk only when the
+    path would not fit in max_size, and the path is centred on the canvas.
+    """
+    ext_x, ext_y = geometry.extent
+    avail_x, avail_y = max_size[0] - 2 * margin, max_size[1] - 2 * margin
+    scale = step_size
+    if ext_x * scale > avail_x:
+        scale = avail_x / ext_x
+    if ext_y * scale > avail_y:
+        scale = avail_y / ext_y
+
+    width = int(min(max_size[0], max(min_size[0], np.ceil(ext_x * scale) + 2 * margin)))
+    height = int(min(max_size[1], max(min_size[1], np.ceil(ext_y * scale) + 2 * margin)))
+    min_x, min_y, _, _ = geometry.bbox
+    origin = ((width - ext_x * scale) / 2 - min_x * scale,
+              (height - ext_y * scale) / 2 - min_y * scale)
+    return scale, (width, height), origin
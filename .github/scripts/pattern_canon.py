@@ -0,0 +1,236 @@
+"""Canonical forms of walk patterns, for finding duplicates across suites.
+
+Two walks are the same pattern if one is a rotation or reflection of the
+other (the 8 symmetries of a square) started at a different step (a cyclic
+shift; the bot loops every walk). The canonical form is the least of the 8
+transformed sequences, each rotated to its lexicographically least cyclic
+shift with Booth's algorithm (linear time, instead of trying every shift).
+
+Simple suites are sequences of moves; pattern-entry files are sequences of
+"move@duration" tokens for their movement entries. AZERTY files are decoded
+to QWERTY first, so a pattern and its AZERTY mirror share a canonical form.
+
+Usage:
+    python .github/scripts/pattern_canon.py [--max-distance 0.2] [--json report.json]
+"""
+import argparse
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+from layouts import get_layout
+from path_geometry import entry_direction
+from pattern_model import NotASuite, iter_suite
+
+pattern_dir = Path("KC-Config-Suite/Pattern_Suite")
+
+# Screen coordinates (y down); each symmetry as a w/a/s/d translate table
+SYMMETRIES = {
+    "identity": str.maketrans("", ""),
+    "rot90": str.maketrans("wdsa", "dsaw"),
+    "rot180": str.maketrans("wasd", "sdwa"),
+    "rot270": str.maketrans("wdsa", "awds"),
+    "mirror_x": str.maketrans("ad", "da"),
+    "mirror_y": str.maketrans("ws", "sw"),
+    "transpose": str.maketrans("wasd", "awds"),
+    "anti_transpose": str.maketrans("wasd", "dsaw"),
+}
+
+def least_rotation(seq):
+    """Booth's algorithm: start index of the lexicographically least cyclic shift of seq."""
+    doubled = seq + seq
+    failure = [-1] * len(doubled)
+    k = 0
+    for j in range(1, len(doubled)):
+        c = doubled[j]
+        i = failure[j - k - 1]
+        while i != -1 and c != doubled[k + i + 1]:
+            if c < doubled[k + i + 1]:
+                k = j - i - 1
+            i = failure[i]
+        if c != doubled[k + i + 1]:
+            if c < doubled[k]:
+                k = j
+            failure[j - k] = -1
+        else:
+            failure[j - k] = i + 1
+    return k
+
+def rotate(seq, k):
+    return seq[k:] + seq[:k]
+
+def transform(seq, symmetry):
+    """Apply a symmetry to a move string or a tuple of entry tokens."""
+    table = SYMMETRIES[symmetry]
+    if isinstance(seq, str):
+        return seq.translate(table)
+    out = []
+    for token in seq:
+        direction, _, duration = token.partition("@")
+        direction = "+".join(sorted(direction.translate(table).split("+")))
+        out.append(f"{direction}@{duration}")
+    return tuple(out)
+
+def canonical_form(seq):
+    """Return (form, symmetry, shift): form = rotate(transform(seq, symmetry), shift) is minimal."""
+    best = None
+    for name in SYMMETRIES:
+        moved = transform(seq, name)
+        shift = least_rotation(moved) if moved else 0
+        form = rotate(moved, shift)
+        if best is None or form < best[0]:
+            best = (form, name, shift)
+    return best
+
+def canonical_hash(form):
+    joined = form if isinstance(form, str) else "\x1f".join(form)
+    return hashlib.sha256(joined.encode("utf-8")).hexdigest()[:16]
+
+def self_symmetries(seq):
+    """Non-identity symmetries that map seq onto a cyclic shift of itself."""
+    if not seq:
+        return []
+    base = rotate(seq, least_rotation(seq))
+    found = []
+    for name in SYMMETRIES:
+        if name == "identity":
+            continue
+        moved = transform(seq, name)
+        if rotate(moved, least_rotation(moved)) == base:
+            found.append(name)
+    return found
+
+def levenshtein(a, b, limit=None):
+    """Edit distance between two sequences; stops early and returns limit + 1 once it must exceed limit."""
+    if len(a) < len(b):
+        a, b = b, a
+    if limit is not None and len(a) - len(b) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if limit is not None and min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+def symmetric_distance(form, seq, limit=None):
+    """Least edit distance between a canonical form and any symmetric, least-rotated image of seq."""
+    best = None
+    for name in SYMMETRIES:
+        moved = transform(seq, name)
+        moved = rotate(moved, least_rotation(moved)) if moved else moved
+        d = levenshtein(form, moved, best - 1 if best is not None else limit)
+        if best is None or d < best:
+            best = d
+            if best == 0:
+                break
+    return best
+
+def entry_tokens(pattern_list, layout):
+    tokens = []
+    for entry in pattern_list:
+        direction = entry_direction(layout.decode_key(entry.get("key", "")))
+        if direction is not None:
+            tokens.append(f"{direction}@{entry.get('duration', '')}")
+    return tuple(tokens)
+
+def iter_sequences(directory=None):
+    """Yield (file, layout, name, sequence) for every pattern in Pattern_Suite and its AZERTY mirror."""
+    directory = Path(directory or pattern_dir)
+    for layout_name, layout_dir in (("qwerty", directory), ("azerty", directory / "AZERTY")):
+        layout = get_layout(layout_name)
+        for path in sorted(layout_dir.glob("*.json")):
+            try:
+                for pattern in iter_suite(path):
+                    yield path.name, layout_name, pattern.name, pattern.translate(layout.simple_decode_table).moves()
+                continue
+            except NotASuite:
+                pass
+            with open(path, "r", encoding="utf-8-sig") as f:
+                data = json.load(f)
+            if isinstance(data.get("pattern"), list):
+                yield path.name, layout_name, data.get("name", path.stem), entry_tokens(data["pattern"], layout)
+
+def build_index(directory=None, max_distance=0.2):
+    """Group patterns by canonical hash and pair up near-duplicate groups.
+
+    Returns (groups, near): groups maps hash -> {"form", "symmetries", "members"}
+    and near lists (hash_a, hash_b, distance) for distinct groups whose
+    symmetric edit distance is at most max_distance times the longer length.
+    """
+    groups = {}
+    for file, layout, name, seq in iter_sequences(directory):
+        form, symmetry, shift = canonical_form(seq)
+        key = canonical_hash(form)
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = {"form": form, "symmetries": self_symmetries(seq), "members": []}
+        group["members"].append({"file": file, "layout": layout, "name": name, "symmetry": symmetry, "shift": shift})
+
+    near = []
+    keys = list(groups)
+    for x, a in enumerate(keys):
+        form_a = groups[a]["form"]
+        for b in keys[x + 1:]:
+            form_b = groups[b]["form"]
+            if type(form_a) is not type(form_b):
+                continue
+            limit = int(max_distance * max(len(form_a), len(form_b)))
+            d = symmetric_distance(form_a, form_b, limit)
+            if d <= limit:
+                near.append((a, b, d))
+    return groups, near
+
+def describe(members):
+    names = sorted({m["name"] for m in members})
+    return ", ".join(names) + f" ({len(members)} copies)"
+
+def redundant(members):
+    """{file: names} for files that hold one canonical pattern under more than one name."""
+    by_file = {}
+    for m in members:
+        by_file.setdefault((m["layout"], m["file"]), []).append(m["name"])
+    return {f"{layout}/{file}" if layout != "qwerty" else file: names
+            for (layout, file), names in by_file.items() if len(names) > 1}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Find duplicate and symmetric patterns across the pattern suites.")
+    parser.add_argument("--max-distance", type=float, default=0.2,
+                        help="near-duplicate threshold as a fraction of pattern length (default: %(default)s)")
+    parser.add_argument("--json", metavar="PATH", help="also write the index as JSON")
+    parser.add_argument("--check", action="store_true",
+                        help="exit 1 if a file ships one pattern under several names")
+    args = parser.parse_args(argv)
+
+    groups, near = build_index(max_distance=args.max_distance)
+    total = sum(len(g["members"]) for g in groups.values())
+    print(f"{total} patterns, {len(groups)} canonical forms.")
+
+    duplicated = False
+    for key, group in groups.items():
+        print(f"{key}  {len(group['form'])} steps  {describe(group['members'])}")
+        if group["symmetries"]:
+            print(f"    self-symmetric under {', '.join(group['symmetries'])}")
+        for file, names in redundant(group["members"]).items():
+            print(f"    ✖ {file} ships one pattern under several names: {', '.join(names)}")
+            duplicated = True
+
+    for a, b, d in near:
+        print(f"Near duplicates (distance {d}): {describe(groups[a]['members'])} ~ {describe(groups[b]['members'])}")
+
+    if args.json:
+        report = {
+            "groups": {k: {**g, "form": g["form"] if isinstance(g["form"], str) else list(g["form"])}
+                       for k, g in groups.items()},
+            "near": [{"a": a, "b": b, "distance": d} for a, b, d in near],
+        }
+        Path(args.json).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"Wrote {args.json}")
+    return 1 if args.check and duplicated else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,309 @@
+"""Run-length pattern model for simple pattern suites.
+
+A suite stores every step as its own JSON string. Pattern keeps the walk as
+runs instead: `symbols` is a str with one character per run and `counts` an
+unsigned int array of run lengths, so a 48-step walk of 3-step motifs costs
+two short buffers rather than 48 list slots.
+
+iter_suite() scans the suite JSON directly into runs, one pattern at a time,
+without building the intermediate lists. dump_suite() writes them back in
+the repository's JSON layout; load -> dump is lossless (same names, order
+and moves).
+
+PatternStore deduplicates patterns by content across suite versions and
+layouts: each pattern is normalized to QWERTY and addressed by a hash of its
+runs, and every (suite, layout, name) just refers to a hash.
+
+Usage:
+    python .github/scripts/pattern_model.py store [--save]
+    python .github/scripts/pattern_model.py diff OLD_SUITE NEW_SUITE
+    python .github/scripts/pattern_model.py roundtrip [SUITE...]
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from array import array
+from difflib import SequenceMatcher
+from itertools import accumulate
+from json.decoder import JSONDecodeError, scanstring
+from pathlib import Path
+
+from layouts import dump_json, get_layout
+
+pattern_dir = Path("KC-Config-Suite/Pattern_Suite")
+store_path = Path(".kc_index/patterns.json")
+
+WS_RE = re.compile(r"[ \t\n\r]*")
+
+class NotASuite(ValueError):
+    """The file is valid JSON but not a {name: [moves]} suite (e.g. a pattern-entry file)."""
+
+class Pattern:
+    """A named walk stored as runs of identical single-character moves."""
+
+    __slots__ = ("name", "symbols", "counts")
+
+    def __init__(self, name, symbols="", counts=None):
+        self.name = name
+        self.symbols = symbols
+        self.counts = counts if counts is not None else array("I")
+
+    @classmethod
+    def from_moves(cls, name, moves):
+        symbols = []
+        counts = array("I")
+        for move in moves:
+            if len(move) != 1:
+                raise ValueError(f"{name}: move {move!r} is not a single character")
+            if symbols and symbols[-1] == move:
+                counts[-1] += 1
+            else:
+                symbols.append(move)
+                counts.append(1)
+        return cls(name, "".join(symbols), counts)
+
+    def __len__(self):
+        return sum(self.counts)
+
+    def __iter__(self):
+        """Iterate over individual moves."""
+        for symbol, count in zip(self.symbols, self.counts):
+            for _ in range(count):
+                yield symbol
+
+    def __eq__(self, other):
+        return isinstance(other, Pattern) and self.symbols == other.symbols and self.counts == other.counts
+
+    def __hash__(self):
+        return hash((self.symbols, self.counts.tobytes()))
+
+    def __repr__(self):
+        runs = " ".join(f"{c}{s}" for s, c in zip(self.symbols, self.counts))
+        return f"Pattern({self.name!r}, {runs})"
+
+    def runs(self):
+        return list(zip(self.symbols, self.counts))
+
+    def moves(self):
+        """All moves as one string ("wwwwad...")."""
+        return "".join(map(str.__mul__, self.symbols, self.counts))
+
+    def to_list(self):
+        return list(self.moves())
+
+    def translate(self, table, name=None):
+        """Return the pattern with every run symbol passed through a str.translate table."""
+        return Pattern(self.name if name is None else name, self.symbols.translate(table), self.counts)
+
+    def digest(self):
+        """Content hash of the runs; the name does not take part."""
+        h = hashlib.sha256(self.symbols.encode("utf-8"))
+        h.update(b"\0")
+        h.update(array("I", self.counts).tobytes())
+        return h.hexdigest()
+
+def _skip(text, pos):
+    return WS_RE.match(text, pos).end()
+
+def _expect(text, pos, char):
+    if text[pos:pos + 1] != char:
+        raise JSONDecodeError(f"Expecting {char!r}", text, pos)
+    return pos + 1
+
+def iter_suite(path):
+    """Yield a Pattern for every entry of a simple suite file, in file order.
+
+    Raises NotASuite if the file holds something else (e.g. a pattern-entry file).
+    """
+    text = Path(path).read_text(encoding="utf-8-sig")
+    pos = _skip(text, 0)
+    if text[pos:pos + 1] != "{":
+        raise NotASuite(f"{path}: not a JSON object")
+    pos = _skip(text, pos + 1)
+    if text[pos:pos + 1] == "}":
+        return
+
+    while True:
+        pos = _expect(text, pos, '"')
+        name, pos = scanstring(text, pos)
+        pos = _skip(text, _expect(text, _skip(text, pos), ":"))
+        if text[pos:pos + 1] != "[":
+            raise NotASuite(f"{path}: {name!r} is not a list of moves")
+        pos = _skip(text, pos + 1)
+
+        symbols = []
+        counts = array("I")
+        if text[pos:pos + 1] == "]":
+            pos += 1
+        else:
+            while True:
+                if text[pos:pos + 1] != '"':
+                    raise NotASuite(f"{path}: {name!r} holds a non-string move")
+                move, pos = scanstring(text, pos + 1)
+                if len(move) != 1:
+                    raise ValueError(f"{path}: {name}: move {move!r} is not a single character")
+                if symbols and symbols[-1] == move:
+                    counts[-1] += 1
+                else:
+                    symbols.append(move)
+                    counts.append(1)
+                pos = _skip(text, pos)
+                if text[pos:pos + 1] == "]":
+                    pos += 1
+                    break
+                pos = _skip(text, _expect(text, pos, ","))
+        yield Pattern(name, "".join(symbols), counts)
+
+        pos = _skip(text, pos)
+        if text[pos:pos + 1] == "}":
+            return
+        pos = _skip(text, _expect(text, pos, ","))
+
+def load_suite(path):
+    """Return {name: Pattern} for a simple suite file (later duplicate names win, as in json.load)."""
+    return {p.name: p for p in iter_suite(path)}
+
+def dump_suite(patterns):
+    """Serialize patterns (an iterable or a {name: Pattern} dict) in the repository's suite layout."""
+    if isinstance(patterns, dict):
+        patterns = patterns.values()
+    return dump_json({p.name: p.to_list() for p in patterns})
+
+def roundtrip_ok(path):
+    """True if loading and dumping a suite gives back exactly the same JSON data."""
+    with open(path, "r", encoding="utf-8-sig") as f:
+        original = json.load(f)
+    return json.loads(dump_suite(load_suite(path))) == original
+
+# --- Diffing
+
+def diff_patterns(old, new):
+    """Opcodes (tag, i1, i2, j1, j2) between two patterns, in step indices.
+
+    Runs are compared as units, so a run that only changed length shows up as
+    a replacement of that run.
+    """
+    matcher = SequenceMatcher(None, old.runs(), new.runs(), autojunk=False)
+    old_at = [0, *accumulate(old.counts)]
+    new_at = [0, *accumulate(new.counts)]
+    return [(tag, old_at[i1], old_at[i2], new_at[j1], new_at[j2])
+            for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != "equal"]
+
+def diff_suites(old, new):
+    """Compare two {name: Pattern} suites. Returns (added, removed, changed) name lists."""
+    added = [name for name in new if name not in old]
+    removed = [name for name in old if name not in new]
+    changed = [name for name in new if name in old and old[name] != new[name]]
+    return added, removed, changed
+
+# --- Content-addressed store
+
+class PatternStore:
+    """Patterns deduplicated by content, with (suite, layout, name) references."""
+
+    def __init__(self):
+        self.patterns = {}
+        self.refs = {}
+
+    def add(self, pattern, suite, layout="qwerty"):
+        """Store a pattern given in a layout; returns its content address."""
+        canonical = pattern.translate(get_layout(layout).simple_decode_table, name="")
+        digest = canonical.digest()
+        self.patterns.setdefault(digest, canonical)
+        self.refs[(suite, layout, pattern.name)] = digest
+        return digest
+
+    def add_suite(self, path, layout="qwerty"):
+        for pattern in iter_suite(path):
+            self.add(pattern, Path(path).stem, layout)
+
+    def suite(self, suite, layout="qwerty"):
+        """Rebuild {name: Pattern} for one suite in its layout."""
+        table = get_layout(layout).simple_encode_table
+        return {name: self.patterns[digest].translate(table, name=name)
+                for (s, l, name), digest in self.refs.items() if s == suite and l == layout}
+
+    def save(self, path=None):
+        path = Path(path or store_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "patterns": {d: [p.symbols, list(p.counts)] for d, p in self.patterns.items()},
+            "refs": [[s, l, n, d] for (s, l, n), d in self.refs.items()],
+        }
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data, separators=(",", ":"), ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path=None):
+        store = cls()
+        data = json.loads(Path(path or store_path).read_text(encoding="utf-8"))
+        for digest, (symbols, counts) in data["patterns"].items():
+            store.patterns[digest] = Pattern("", symbols, array("I", counts))
+        for s, l, n, d in data["refs"]:
+            store.refs[(s, l, n)] = d
+        return store
+
+def suite_files(directory=None):
+    """Simple suite files of a directory (pattern-entry files are skipped)."""
+    return sorted(Path(directory or pattern_dir).glob("_KC_Pattern_Suite_*.json"))
+
+def build_store(directory=None):
+    """Store every suite of Pattern_Suite and its AZERTY mirror."""
+    directory = Path(directory or pattern_dir)
+    store = PatternStore()
+    for layout, layout_dir in (("qwerty", directory), ("azerty", directory / "AZERTY")):
+        for path in suite_files(layout_dir):
+            store.add_suite(path, layout)
+    return store
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run-length pattern tools for the simple pattern suites.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    store = sub.add_parser("store", help="deduplicate every suite and layout by content")
+    store.add_argument("--save", action="store_true", help=f"write the store to {store_path}")
+    diff = sub.add_parser("diff", help="compare two suite files")
+    diff.add_argument("old")
+    diff.add_argument("new")
+    roundtrip = sub.add_parser("roundtrip", help="check load -> dump is lossless")
+    roundtrip.add_argument("suites", nargs="*")
+    args = parser.parse_args(argv)
+
+    if args.command == "store":
+        store = build_store()
+        total_steps = sum(len(store.patterns[d]) for d in store.refs.values())
+        unique_steps = sum(len(p) for p in store.patterns.values())
+        unique_runs = sum(len(p.counts) for p in store.patterns.values())
+        print(f"{len(store.refs)} patterns, {len(store.patterns)} unique.")
+        print(f"{total_steps} steps stored as {unique_runs} runs ({unique_steps} unique steps).")
+        if args.save:
+            store.save()
+            print(f"Wrote {store_path}")
+    elif args.command == "diff":
+        old, new = load_suite(args.old), load_suite(args.new)
+        added, removed, changed = diff_suites(old, new)
+        for name in added:
+            print(f"+ {name} ({len(new[name])} steps)")
+        for name in removed:
+            print(f"- {name}")
+        for name in changed:
+            print(f"~ {name}")
+            for tag, i1, i2, j1, j2 in diff_patterns(old[name], new[name]):
+                print(f"    {tag} steps {i1}:{i2} -> {j1}:{j2}")
+        if not (added or removed or changed):
+            print("No differences.")
+    elif args.command == "roundtrip":
+        paths = args.suites or suite_files() + suite_files(pattern_dir / "AZERTY")
+        failed = [p for p in paths if not roundtrip_ok(p)]
+        for p in failed:
+            print(f"✖ {p} does not round-trip")
+        if failed:
+            return 1
+        print(f"All {len(paths)} suites round-trip.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""Attribute README.md edits to the commits that made them.
+
+Reads a whole commit range with a single `git log -p -U0` process and
+replays the hunks commit by commit. Every meaningful edited line (added,
+changed, or the spot where lines were deleted) becomes a mark carrying its
+commit; later hunks shift, or drop, existing marks so that at the end of the
+range every surviving mark is a line number in the final README. Timestamp
+lines and blank lines are not meaningful, so the bot's own timestamp commits
+never count as edits.
+"""
+import re
+import subprocess
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+
+README = Path("README.md")
+
+# Commit header lines start with a NUL byte (%x00 in the log format)
+COMMIT_MARK = "\x00"
+HUNK_RE = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+TIMESTAMP_RE = re.compile(r"<sub><sup>Last updated: \d{4}-\d{2}-\d{2}</sup></sub>")
+
+def is_meaningful(line):
+    return bool(line.strip()) and not TIMESTAMP_RE.match(line)
+
+def iter_commits(diff_range, path=README):
+    """Stream (sha, date, hunks) for every commit in a range that touched path, oldest first.
+
+    Each hunk is (old_start, old_count, new_start, new_count, removed, added) in
+    git's 1-based coordinates, with removed/added holding the line contents.
+    """
+    cmd = ["git", "log", "--reverse", "--first-parent", "--diff-merges=first-parent", "-p", "-U0",
+           "--no-color", "--no-ext-diff", "--format=%x00%H %cs"]
+    cmd += diff_range.split() if isinstance(diff_range, str) else list(diff_range)
+    cmd += ["--", str(path)]
+
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True, encoding="utf-8", errors="replace")
+    commit = None
+    hunk = None
+    try:
+        for line in proc.stdout:
+            line = line.rstrip("\n")
+            if line.startswith(COMMIT_MARK):
+                if commit:
+                    yield commit
+                sha, _, day = line[1:].partition(" ")
+                commit = (sha, day, [])
+                hunk = None
+                continue
+            if commit is None:
+                continue
+            m = HUNK_RE.match(line)
+            if m:
+                a, b, c, d = m.groups()
+                hunk = (int(a), 1 if b is None else int(b), int(c), 1 if d is None else int(d), [], [])
+                commit[2].append(hunk)
+            elif hunk is not None and line.startswith("-"):
+                hunk[4].append(line[1:])
+            elif hunk is not None and line.startswith("+"):
+                hunk[5].append(line[1:])
+        if commit:
+            yield commit
+    finally:
+        proc.stdout.close()
+        proc.wait()
+
+def shift_marks(marks, hunks):
+    """Move marks ({line: commit_index}, old 1-based lines) through one commit's hunks.
+
+    Lines removed by a hunk lose their mark; lines after a hunk move by its net size.
+    """
+    if not hunks:
+        return marks
+    # A hunk lies before line L if its last old line (or, for pure insertions,
+    # the line it was inserted after) is < L
+    keys = [a + b - 1 if b else a for a, b, *_ in hunks]
+    deltas = [0]
+    for _, b, _, d, *_ in hunks:
+        deltas.append(deltas[-1] + d - b)
+    starts = [a for a, *_ in hunks]
+
+    moved = {}
+    for line, ci in marks.items():
+        j = bisect_right(starts, line) - 1
+        if j >= 0 and hunks[j][1] and line <= hunks[j][0] + hunks[j][1] - 1:
+            continue  # removed
+        moved[line + deltas[bisect_left(keys, line)]] = ci
+    return moved
+
+def new_marks(hunks):
+    """1-based new-file lines that a commit meaningfully edited."""
+    lines = []
+    for a, b, c, d, removed, added in hunks:
+        lines.extend(c + i for i, text in enumerate(added) if is_meaningful(text))
+        if not d and any(is_meaningful(text) for text in removed):
+            # Pure deletion: git reports the line before the removed block
+            lines.append(max(c, 1))
+    return lines
+
+def replay(diff_range, path=README):
+    """Replay a commit range. Returns (marks, commits).
+
+    marks maps 1-based lines of the file at the end of the range to an index
+    into commits, a list of (sha, date) in commit order.
+    """
+    marks = {}
+    commits = []
+    for sha, day, hunks in iter_commits(diff_range, path):
+        marks = shift_marks(marks, hunks)
+        for line in new_marks(hunks):
+            marks[line] = len(commits)
+        commits.append((sha, day))
+    return marks, commits
+
+def file_at(rev, path=README):
+    """Contents of path at a revision, or None if it does not exist there."""
+    result = subprocess.run(["git", "show", f"{rev}:{path.as_posix()}"], capture_output=True, text=True, encoding="utf-8")
+    return result.stdout if result.returncode == 0 else None
+
+def range_end(diff_range):
+    """The revision a range ends at: B for A..B, the revision itself otherwise."""
+    return diff_range.split("..")[-1] or "HEAD"
@@ -0,0 +1,300 @@
+"""Offline evaluation of the Auto Appraiser / Auto Enchanter inclusion zones.
+
+The AHK tools poll each zone in inclusions.ini ("x,y,w,h") with
+
+    PixelSearch, px, py, x, y, x + w, y + h, color, tolerance, RGB Fast
+
+for every enabled stop color, i.e. "does any pixel of the zone (both corners
+included) lie within +-tolerance of the color on every channel". This harness
+runs the same check on a folder of screenshots, vectorized over the whole
+batch: each channel value is looked up in a table of color bitmasks, the
+three lookups are ANDed, and the zone is OR-reduced, so the cost per pixel
+does not grow with the number of colors.
+
+Screenshots may be sorted into folders named after a stop condition (or
+"none") to label them; the report then includes hit and false-hit rates.
+
+Usage:
+    python .github/scripts/region_harness.py appraiser FRAMES_DIR [--zone 1008,953,67,69] [--tolerance 5]
+        [--enable Shiny --enable Golden] [--mode and] [--json report.json]
+"""
+import argparse
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from config_index import version_key
+
+tool_dir = Path("KC-Tool-Suite")
+TOOLS = {"appraiser": tool_dir / "auto-appraiser", "enchanter": tool_dir / "auto-enchanter"}
+IMAGE_SUFFIXES = {".png", ".bmp", ".jpg", ".jpeg"}
+NONE_LABEL = "none"
+
+# Colors per bitmask word; more colors use more words
+WORD_BITS = 64
+
+SCRIPT_VERSION_RE = re.compile(r'v(\d+\.\d+\.\d+(?:-[\w.]+)?)\.ahk$', re.IGNORECASE)
+STOP_CONDITION_RE = re.compile(r'^stopConditions\["([^"]+)"\]\s*:=\s*\["0x([0-9A-Fa-f]{6})",\s*(true|false)\]', re.MULTILINE)
+TOLERANCE_RE = re.compile(r'^colorTolerance\s*:=\s*(\d+)', re.MULTILINE)
+MODE_RE = re.compile(r'^mode\s*:=\s*"(\w+)"', re.MULTILINE)
+
+def parse_zone(text):
+    """Parse "x,y,w,h" the way LoadInclusions() does (whitespace removed, four unsigned integers)."""
+    parts = re.sub(r"\s", "", text).split(",")
+    if len(parts) != 4 or not all(p.isdigit() for p in parts):
+        return None
+    return tuple(int(p) for p in parts)
+
+def load_zones(path):
+    zones = []
+    for line in Path(path).read_text(encoding="utf-8-sig").splitlines():
+        if not line.strip():
+            continue
+        zone = parse_zone(line)
+        if zone is None:
+            print(f"Skipped invalid line: [{line}]")
+        else:
+            zones.append(zone)
+    return zones
+
+def latest_script(directory):
+    scripts = [p for p in Path(directory).glob("*.ahk") if SCRIPT_VERSION_RE.search(p.name)]
+    if not scripts:
+        return None
+    return max(scripts, key=lambda p: version_key(SCRIPT_VERSION_RE.search(p.name).group(1)))
+
+def load_script_settings(path):
+    """Read the stop conditions and defaults from an AHK script.
+
+    Returns {"colors": {name: (r, g, b)}, "enabled": [names], "tolerance": int, "mode": "or" | "and"}.
+    """
+    text = Path(path).read_text(encoding="utf-8-sig")
+    colors, enabled = {}, []
+    for name, hex_color, state in STOP_CONDITION_RE.findall(text):
+        colors[name] = tuple(bytes.fromhex(hex_color))
+        if state == "true":
+            enabled.append(name)
+    tolerance = TOLERANCE_RE.search(text)
+    mode = MODE_RE.search(text)
+    return {
+        "colors": colors,
+        "enabled": enabled,
+        "tolerance": int(tolerance.group(1)) if tolerance else 0,
+        "mode": mode.group(1).lower() if mode else "or",
+    }
+
+def find_frames(directory):
+    return sorted(p for p in Path(directory).rglob("*") if p.suffix.lower() in IMAGE_SUFFIXES)
+
+def frame_label(path, root, names):
+    """The stop condition (or "none") named by the frame's folder, or None if unlabeled."""
+    lookup = {n.lower(): n for n in names}
+    lookup[NONE_LABEL] = NONE_LABEL
+    for part in reversed(Path(path).relative_to(root).parts[:-1]):
+        if part.lower() in lookup:
+            return lookup[part.lower()]
+    return None
+
+def zone_box(zone):
+    """PixelSearch bounds include both corners: w + 1 by h + 1 pixels."""
+    x, y, w, h = zone
+    return x, y, x + w + 1, y + h + 1
+
+def load_crops(paths, zones):
+    """Crop every zone out of every frame.
+
+    Returns (crops, kept, skipped): crops[z] is a uint8 array (frames, h, w, 3),
+    kept the paths that were loaded and skipped (path, reason) pairs for frames
+    that could not be read or do not contain every zone.
+    """
+    boxes = [zone_box(z) for z in zones]
+    crops = [[] for _ in zones]
+    kept, skipped = [], []
+    for path in paths:
+        try:
+            with Image.open(path) as img:
+                width, height = img.size
+                outside = [z for z, b in zip(zones, boxes) if b[2] > width or b[3] > height]
+                if outside:
+                    skipped.append((path, f"{width}x{height} frame does not contain zone {outside[0]}"))
+                    continue
+                rgb = img.convert("RGB")
+        except OSError as e:
+            skipped.append((path, str(e)))
+            continue
+        for z, box in enumerate(boxes):
+            crops[z].append(np.asarray(rgb.crop(box)))
+        kept.append(path)
+    shapes = [(0, box[3] - box[1], box[2] - box[0], 3) for box in boxes]
+    return [np.stack(c) if c else np.empty(s, np.uint8) for c, s in zip(crops, shapes)], kept, skipped
+
+def channel_tables(colors, tolerance):
+    """Per channel, a (words, 256) table of the colors each channel value is within tolerance of."""
+    colors = np.asarray(colors, dtype=np.int16).reshape(-1, 3)
+    words = max(1, -(-len(colors) // WORD_BITS))
+    values = np.arange(256, dtype=np.int16)
+    tables = np.zeros((3, words, 256), dtype=np.uint64)
+    for c, color in enumerate(colors):
+        word, bit = divmod(c, WORD_BITS)
+        near = np.abs(values[None, :] - color[:, None]) <= tolerance
+        for channel in range(3):
+            tables[channel, word, near[channel]] |= np.uint64(1 << bit)
+    return tables
+
+def match_zone(crops, tables, n_colors):
+    """(frames, colors) bool: whether each color occurs in each frame's zone."""
+    frames = len(crops)
+    found = np.zeros((frames, n_colors), dtype=bool)
+    if not frames:
+        return found
+    r, g, b = crops[..., 0], crops[..., 1], crops[..., 2]
+    shifts = np.arange(WORD_BITS, dtype=np.uint64)
+    for word in range(tables.shape[1]):
+        bits = tables[0, word][r] & tables[1, word][g] & tables[2, word][b]
+        present = np.bitwise_or.reduce(bits.reshape(frames, -1), axis=1)
+        unpacked = ((present[:, None] >> shifts) & np.uint64(1)).astype(bool)
+        start = word * WORD_BITS
+        found[:, start:start + WORD_BITS] = unpacked[:, :n_colors - start]
+    return found
+
+def evaluate(crops, colors, tolerance):
+    """(frames, zones, colors) bool for every zone, using one set of lookup tables."""
+    tables = channel_tables(list(colors.values()), tolerance)
+    return np.stack([match_zone(c, tables, len(colors)) for c in crops], axis=1)
+
+def stops(found, names, enabled, mode):
+    """Per frame, whether the tool would stop: any (or) / all (and) enabled colors in any zone."""
+    columns = [names.index(n) for n in enabled]
+    if not columns:
+        return np.zeros(len(found), dtype=bool)
+    in_any_zone = found[:, :, columns].any(axis=1)
+    return in_any_zone.all(axis=1) if mode == "and" else in_any_zone.any(axis=1)
+
+def time_checks(crops, colors, tolerance, repeat=5):
+    """Median seconds to check the whole batch, and to check a single frame (one poll).
+
+    The tables are built once outside the timing, as a polling loop would.
+    """
+    tables = channel_tables(list(colors.values()), tolerance)
+    check = lambda batch: [match_zone(c, tables, len(colors)) for c in batch]
+    def median(call):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            call()
+            times.append(time.perf_counter() - start)
+        return sorted(times)[len(times) // 2]
+    batch = median(lambda: check(crops))
+    single = median(lambda: check([c[:1] for c in crops]))
+    return batch, single
+
+def build_report(found, names, labels, enabled, mode):
+    frames = len(found)
+    any_zone = found.any(axis=1)
+    report = {"frames": frames, "colors": {}, "zones": [], "labels": {}}
+    for c, name in enumerate(names):
+        entry = {"match_rate": float(any_zone[:, c].mean()) if frames else 0.0}
+        own = np.array([label == name for label in labels], dtype=bool)
+        other = np.array([label is not None and label != name for label in labels], dtype=bool)
+        if own.any():
+            entry["hit_rate"] = float(any_zone[own, c].mean())
+        if other.any():
+            entry["false_hit_rate"] = float(any_zone[other, c].mean())
+        report["colors"][name] = entry
+    for z in range(found.shape[1]):
+        report["zones"].append({"match_rate": float(found[:, z].any(axis=1).mean()) if frames else 0.0})
+    stop = stops(found, names, enabled, mode)
+    report["stop_rate"] = float(stop.mean()) if frames else 0.0
+    for label in sorted({l for l in labels if l is not None}):
+        rows = np.array([l == label for l in labels], dtype=bool)
+        report["labels"][label] = {"frames": int(rows.sum()), "stop_rate": float(stop[rows].mean())}
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate inclusion zones and stop colors against screenshots.")
+    parser.add_argument("tool", choices=sorted(TOOLS))
+    parser.add_argument("frames", help="folder of screenshots; subfolders named after a condition or 'none' label them")
+    parser.add_argument("--zone", action="append", help="x,y,w,h to test instead of inclusions.ini (repeatable)")
+    parser.add_argument("--script", help="AHK script to read colors from (default: the newest version)")
+    parser.add_argument("--tolerance", type=int, help="color tolerance 0-255 (default: the script's)")
+    parser.add_argument("--enable", action="append", help="enabled stop condition (repeatable; default: the script's)")
+    parser.add_argument("--mode", choices=("or", "and"), help="match mode (default: the script's)")
+    parser.add_argument("--repeat", type=int, default=5, help="timing repetitions")
+    parser.add_argument("--json", metavar="PATH", help="also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    directory = TOOLS[args.tool]
+    script = Path(args.script) if args.script else latest_script(directory)
+    if script is None:
+        print(f"✖ No versioned .ahk script in {directory}")
+        return 1
+    settings = load_script_settings(script)
+    colors = settings["colors"]
+    names = list(colors)
+    tolerance = settings["tolerance"] if args.tolerance is None else args.tolerance
+    enabled = args.enable or settings["enabled"]
+    mode = args.mode or settings["mode"]
+    unknown = [n for n in enabled if n not in colors]
+    if unknown:
+        print(f"✖ Unknown stop condition: {', '.join(unknown)}")
+        return 1
+
+    if args.zone:
+        zones = [parse_zone(z) for z in args.zone]
+        if None in zones:
+            print(f"✖ Zones must be x,y,w,h: {args.zone[zones.index(None)]}")
+            return 1
+    else:
+        zones = load_zones(directory / "inclusions.ini")
+    if not zones:
+        print("✖ No inclusion zones to test")
+        return 1
+
+    root = Path(args.frames)
+    crops, kept, skipped = load_crops(find_frames(root), zones)
+    for path, reason in skipped:
+        print(f"✖ Skipped {path}: {reason}")
+    if not kept:
+        print(f"✖ No usable frames in {root}")
+        return 1
+    labels = [frame_label(p, root, names) for p in kept]
+
+    found = evaluate(crops, colors, tolerance)
+    report = build_report(found, names, labels, enabled, mode)
+    batch_s, single_s = time_checks(crops, colors, tolerance, args.repeat)
+    checks = len(kept) * len(zones) * len(colors)
+    pixels = sum((w + 1) * (h + 1) for _, _, w, h in zones)
+    report.update({
+        "script": script.as_posix(), "zones": [dict(zone=",".join(map(str, z)), **r) for z, r in zip(zones, report["zones"])],
+        "tolerance": tolerance, "mode": mode, "enabled": enabled, "skipped": len(skipped),
+        "timing": {"batch_s": batch_s, "us_per_frame": 1e6 * batch_s / len(kept), "ns_per_check": 1e9 * batch_s / checks,
+                   "us_per_poll": 1e6 * single_s, "pixels_per_poll": pixels},
+    })
+
+    print(f"{script.name}: {len(kept)} frames, {len(zones)} zone(s), {len(colors)} colors, tolerance {tolerance}")
+    print(f"{'condition':<14} {'match':>7} {'hit':>7} {'false':>7}")
+    for name, entry in report["colors"].items():
+        hit = f"{100 * entry['hit_rate']:6.1f}%" if "hit_rate" in entry else ""
+        false = f"{100 * entry['false_hit_rate']:6.1f}%" if "false_hit_rate" in entry else ""
+        print(f"{name:<14} {100 * entry['match_rate']:6.1f}% {hit:>7} {false:>7}")
+    for zone in report["zones"]:
+        print(f"Zone {zone['zone']}: any color in {100 * zone['match_rate']:.1f}% of frames")
+    print(f"Stop ({mode.upper()} of {', '.join(enabled) or 'nothing'}): {100 * report['stop_rate']:.1f}% of frames")
+    for label, entry in report["labels"].items():
+        print(f"    labeled {label}: {entry['frames']} frames, stop {100 * entry['stop_rate']:.1f}%")
+    timing = report["timing"]
+    print(f"Timing: {timing['us_per_frame']:.1f} µs/frame batched ({timing['ns_per_check']:.1f} ns/check), "
+          f"{timing['us_per_poll']:.1f} µs for a single poll of {pixels} pixels")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"Wrote {args.json}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
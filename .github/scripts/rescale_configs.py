@@ -0,0 +1,205 @@
+"""Rescale config coordinates from one display setup to others.
+
+The configs store screen coordinates (game_area, sell_button_position, ...)
+measured on the setup in test_environment.yaml: 1920x1080 at 100% scale,
+Roblox maximized in windowed mode, so its client area is 1920x1009 at y=23.
+A coordinate is rescaled by mapping the source client area onto the target
+client area, axis by axis. For a windowed target the title bar (23 px) and
+taskbar (48 px) are scaled by the target's DPI scale; a fullscreen target's
+client area is the whole screen.
+
+Every coordinate of every config is gathered into one array and mapped to
+every target display in a single NumPy operation. Variants are written as
+
+    <out>/<tag>/<dt dir>/KC14900_<Shovel>__<Variant>_<profile>-<tag>_dt..._v<n>_<date>.json
+
+where tag is e.g. 2560x1440, 2560x1440s125 (125% scale) or 1920x1080fs (fullscreen).
+
+Usage:
+    python .github/scripts/rescale_configs.py --to 2560x1440 --to 3840x2160@150%
+    python .github/scripts/rescale_configs.py --matrix [--scale 100 --scale 125] [--from path/to/test_environment.yaml]
+"""
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+
+import numpy as np
+
+from config_index import FILENAME_RE, version_key
+from sync_azerty_patterns import write_if_changed
+
+config_dir = Path("KC-Config-Suite")
+default_output_dir = config_dir / "Resolutions"
+
+# Config fields holding (x, y) pairs; null or missing fields are left alone
+COORDINATE_FIELDS = ("game_area", "sell_button_position", "cursor_position", "money_area", "item_area")
+
+# Windows 11 chrome at 100% scale around a maximized window's client area
+title_bar_height = 23
+taskbar_height = 48
+
+COMMON_RESOLUTIONS = ["1280x720", "1366x768", "1600x900", "1920x1080", "2560x1080", "2560x1440", "3440x1440", "3840x2160"]
+
+SPEC_RE = re.compile(r'^(\d+)x(\d+)(?:@(\d+)%?)?(?::(windowed|fullscreen))?$', re.IGNORECASE)
+
+class Display:
+    """A screen resolution, DPI scale and the Roblox client area on it."""
+
+    def __init__(self, width, height, scale=100, fullscreen=False, client=None):
+        self.width, self.height = width, height
+        self.scale = scale
+        self.fullscreen = fullscreen
+        if client is None:
+            if fullscreen:
+                client = (0, 0, width, height)
+            else:
+                top = round(title_bar_height * scale / 100)
+                client = (0, top, width, height - top - round(taskbar_height * scale / 100))
+        self.client = client
+
+    @classmethod
+    def from_spec(cls, spec):
+        """Parse "WIDTHxHEIGHT[@SCALE%][:windowed|:fullscreen]"."""
+        m = SPEC_RE.match(spec.strip())
+        if not m:
+            raise ValueError(f"display must look like 2560x1440, 2560x1440@125% or 2560x1440:fullscreen, not {spec!r}")
+        width, height, scale, mode = m.groups()
+        return cls(int(width), int(height), int(scale or 100), (mode or "").lower() == "fullscreen")
+
+    @classmethod
+    def from_environment(cls, path):
+        """Read the display and window_position sections of a test_environment.yaml."""
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError("reading test_environment.yaml needs PyYAML (pip install pyyaml); pass --from WxH instead")
+        env = yaml.safe_load(Path(path).read_text(encoding="utf-8"))
+        width, height = (int(v) for v in str(env["display"]["resolution"]).lower().split("x"))
+        scale = int(str(env["display"].get("scale", "100")).rstrip("%"))
+        roblox = env.get("roblox_settings", {})
+        client = roblox.get("window_position", {}).get("client")
+        if client:
+            client = (client["x"], client["y"], client["width"], client["height"])
+        return cls(width, height, scale, roblox.get("window_mode", "").lower() == "fullscreen", client)
+
+    @property
+    def tag(self):
+        return f"{self.width}x{self.height}" + (f"s{self.scale}" if self.scale != 100 else "") + ("fs" if self.fullscreen else "")
+
+    def __eq__(self, other):
+        return isinstance(other, Display) and (self.width, self.height, self.client) == (other.width, other.height, other.client)
+
+    def __repr__(self):
+        return f"Display({self.tag}, client={self.client})"
+
+def affine(source, targets):
+    """(scale, offset) arrays of shape (targets, 2) mapping source client coordinates onto each target's."""
+    sx, sy, sw, sh = source.client
+    client = np.array([t.client for t in targets], dtype=np.float64).reshape(-1, 4)
+    scale = client[:, 2:] / np.array([sw, sh], dtype=np.float64)
+    offset = client[:, :2] - np.array([sx, sy], dtype=np.float64) * scale
+    return scale, offset
+
+def latest_environment(root=None):
+    """The test_environment.yaml of the newest dig-tool version that has one."""
+    found = list(Path(root or config_dir).glob("dt*/test_environment.yaml"))
+    return max(found, key=lambda p: version_key(p.parent.name[2:])) if found else None
+
+def source_configs(root=None):
+    return sorted(p for p in Path(root or config_dir).glob("dt*/*.json") if FILENAME_RE.match(p.name))
+
+def gather(configs):
+    """Stack every coordinate pair of every config. Returns (points (M, 2), slots [(config, field, count)])."""
+    points, slots = [], []
+    for c, data in enumerate(configs):
+        for field in COORDINATE_FIELDS:
+            value = data.get(field)
+            if isinstance(value, list) and value and len(value) % 2 == 0 and all(
+                    isinstance(v, (int, float)) and not isinstance(v, bool) for v in value):
+                points.extend(value)
+                slots.append((c, field, len(value)))
+    return np.array(points, dtype=np.float64).reshape(-1, 2), slots
+
+def rescale_points(points, source, targets):
+    """(targets, M, 2) int array: every point mapped to every target, rounded and clamped to its screen."""
+    scale, offset = affine(source, targets)
+    mapped = np.rint(points[None, :, :] * scale[:, None, :] + offset[:, None, :])
+    limits = np.array([(t.width - 1, t.height - 1) for t in targets], dtype=np.float64).reshape(-1, 1, 2)
+    return np.clip(mapped, 0, limits).astype(np.int64)
+
+def rescale_configs(configs, source, targets):
+    """Return one list of rescaled config dicts per target."""
+    points, slots = gather(configs)
+    mapped = rescale_points(points, source, targets)
+    variants = []
+    for t in range(len(targets)):
+        out = [json.loads(json.dumps(data)) for data in configs]
+        flat = mapped[t].reshape(-1).tolist()
+        pos = 0
+        for c, field, count in slots:
+            out[c][field] = flat[pos:pos + count]
+            pos += count
+        variants.append(out)
+    return variants
+
+def variant_name(name, display):
+    fields = FILENAME_RE.match(name).groupdict()
+    return (f"{fields['machine']}_{fields['shovel']}__{fields['variant']}_{fields['profile']}-{display.tag}"
+            f"_dt{fields['dt']}_v{fields['v']}_{fields['date']}.json")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rescale config coordinates to other resolutions and DPI scales.")
+    parser.add_argument("--from", dest="source", metavar="DISPLAY",
+                        help="source display: a test_environment.yaml or WxH[@SCALE%%] (default: the newest test_environment.yaml)")
+    parser.add_argument("--to", action="append", default=[], metavar="DISPLAY",
+                        help="target display WxH[@SCALE%%][:fullscreen] (repeatable)")
+    parser.add_argument("--matrix", action="store_true", help="add the common resolutions at every --scale")
+    parser.add_argument("--scale", type=int, action="append", help="DPI scales for --matrix in percent (default: 100)")
+    parser.add_argument("--fullscreen", action="store_true", help="--matrix targets run fullscreen")
+    parser.add_argument("--output-dir", default=str(default_output_dir))
+    args = parser.parse_args(argv)
+
+    try:
+        if args.source and not args.source.lower().endswith((".yaml", ".yml")):
+            source = Display.from_spec(args.source)
+        else:
+            environment = args.source or latest_environment()
+            if environment is None:
+                print("✖ No test_environment.yaml found; pass --from WxH")
+                return 1
+            source = Display.from_environment(environment)
+        targets = [Display.from_spec(spec) for spec in args.to]
+        if args.matrix:
+            mode = ":fullscreen" if args.fullscreen else ""
+            targets += [Display.from_spec(f"{res}@{scale}%{mode}") for res in COMMON_RESOLUTIONS for scale in args.scale or [100]]
+    except (ValueError, KeyError) as e:
+        print(f"✖ {e}")
+        return 1
+    # Skip duplicates and the source itself, which would only copy the configs
+    unique = []
+    for target in targets:
+        if target != source and target.tag not in {t.tag for t in unique}:
+            unique.append(target)
+    if not unique:
+        print("✖ No target displays; use --to or --matrix")
+        return 1
+
+    paths = source_configs()
+    configs = [json.loads(p.read_text(encoding="utf-8-sig")) for p in paths]
+    variants = rescale_configs(configs, source, unique)
+
+    output_dir = Path(args.output_dir)
+    for target, rescaled in zip(unique, variants):
+        written = 0
+        for path, data in zip(paths, rescaled):
+            out = output_dir / target.tag / path.parent.name / variant_name(path.name, target)
+            out.parent.mkdir(parents=True, exist_ok=True)
+            written += write_if_changed(out, json.dumps(data, indent=4))
+        print(f"{target.tag}: client {target.client}, {len(rescaled)} configs ({written} written)")
+    print(f"Source {source.tag}: client {source.client}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+"""Timing spans for the repository scripts, written as a Chrome trace.
+
+Tracing is off unless the KC_TRACE environment variable names an output
+file, so CI can switch it on for every script of a job at once:
+
+    KC_TRACE=trace.json python .github/scripts/vizualize_paths.py
+
+Scripts wrap their stages in spans:
+
+    with span("load suite", "io", path=str(path)):
+        ...
+
+The category is one of io, parse, convert, render, encode, fit or stage
+(the whole run). At exit the process adds its events and peak RSS to the
+trace file (existing events from earlier scripts of the job are kept; open
+it in chrome://tracing or ui.perfetto.dev) and prints a one-line summary
+to stderr, so stdout stays clean for scripts whose output CI captures.
+Use a fresh trace path per run: the CI jobs upload theirs as artifacts,
+and `compare` sets two of them side by side.
+
+While tracing is off, span() returns one shared do-nothing object: a global
+read and a call per span. Nothing else is imported until a trace is written.
+
+Compare two runs:
+    python .github/scripts/spans.py compare old_trace.json new_trace.json
+"""
+import os
+import sys
+import time
+
+trace_path = os.environ.get("KC_TRACE") or None
+enabled = trace_path is not None
+
+CATEGORIES = ("io", "parse", "convert", "render", "encode", "fit", "stage")
+
+# Timestamps are raw perf_counter microseconds: the clock is system-wide, so
+# events of worker processes and of later scripts in the job line up
+_events = []
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **args):
+        pass
+
+_NO_SPAN = _NoSpan()
+
+class Span:
+    """One timed stage, recorded as a Chrome "complete" event when it ends."""
+
+    __slots__ = ("name", "cat", "args", "start")
+
+    def __init__(self, name, cat, args):
+        self.name, self.cat, self.args = name, cat, args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        event = {"name": self.name, "cat": self.cat, "ph": "X", "pid": os.getpid(), "tid": 0,
+                 "ts": self.start / 1000, "dur": (end - self.start) / 1000}
+        if self.args:
+            event["args"] = self.args
+        _events.append(event)
+        return False
+
+    def set(self, **args):
+        """Attach values known only inside the span (counts, sizes)."""
+        self.args.update(args)
+
+def span(name, cat="stage", /, **args):
+    if not enabled:
+        return _NO_SPAN
+    return Span(name, cat, args)
+
+def drain():
+    """Remove and return this process's events, e.g. to hand them from a worker to its parent."""
+    events = _events[:]
+    del _events[:]
+    return events
+
+def extend(events):
+    _events.extend(events)
+
+def peak_rss_mb():
+    """Peak resident set size of this process, or None where getrusage is unavailable."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+def summarize(events):
+    """{category: total ms} over the complete events. Spans of one category should not nest."""
+    totals = {}
+    for event in events:
+        if event.get("ph") == "X":
+            totals[event["cat"]] = totals.get(event["cat"], 0.0) + event["dur"] / 1000
+    return totals
+
+def summary_line(script, events, rss):
+    totals = summarize(events)
+    stage = totals.pop("stage", None)
+    parts = [f"{cat} {totals[cat]:.1f} ms" for cat in CATEGORIES if cat in totals]
+    head = f"trace {script}: " + (f"{stage:.1f} ms" if stage is not None else "no stage span")
+    return head + (" | " + ", ".join(parts) if parts else "") + (f" | peak RSS {rss:.1f} MB" if rss else "")
+
+def write_trace(path=None):
+    """Merge this process's events into the trace file and print the summary line.
+
+    Processes that recorded nothing (pool workers hand their events to the
+    parent) write nothing.
+    """
+    if not _events:
+        return
+    import json
+    from pathlib import Path
+
+    path = Path(path or trace_path)
+    script = Path(sys.argv[0]).name if sys.argv and sys.argv[0] else "python"
+    events = drain()
+    rss = peak_rss_mb()
+    pid = os.getpid()
+    meta = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": script}}]
+    if rss is not None:
+        end = time.perf_counter_ns() / 1000
+        meta.append({"name": "peak RSS (MB)", "ph": "C", "pid": pid, "tid": 0, "ts": end, "args": {"rss": round(rss, 1)}})
+
+    try:
+        trace = json.loads(path.read_text(encoding="utf-8"))
+        existing = trace["traceEvents"] if isinstance(trace, dict) else list(trace)
+    except (OSError, ValueError, KeyError, TypeError):
+        existing = []
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + f".{pid}.tmp")
+    tmp.write_text(json.dumps({"traceEvents": existing + meta + events, "displayTimeUnit": "ms"}), encoding="utf-8")
+    os.replace(tmp, path)
+    print(summary_line(script, events, rss), file=sys.stderr)
+
+def _stage_totals(path):
+    import json
+
+    with open(path, encoding="utf-8") as f:
+        trace = json.load(f)
+    events = trace["traceEvents"] if isinstance(trace, dict) else trace
+    totals = {}
+    for event in events:
+        if event.get("ph") == "X":
+            key = (event["cat"], event["name"])
+            totals[key] = totals.get(key, 0.0) + event["dur"] / 1000
+    return totals
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compare the span totals of two traces.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    compare = sub.add_parser("compare", help="per-span totals of two traces and their change")
+    compare.add_argument("old")
+    compare.add_argument("new")
+    args = parser.parse_args(argv)
+
+    try:
+        old, new = _stage_totals(args.old), _stage_totals(args.new)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"✖ {e}")
+        return 1
+    width = max((len(name) for _, name in old.keys() | new.keys()), default=4) + 2
+    print(f"{'category':<9}{'span':<{width}}{'old ms':>10}{'new ms':>10}{'change':>9}")
+    for cat, name in sorted(old.keys() | new.keys(), key=lambda k: (CATEGORIES.index(k[0]) if k[0] in CATEGORIES else len(CATEGORIES), k[1])):
+        a, b = old.get((cat, name)), new.get((cat, name))
+        change = f"{100 * (b - a) / a:+.0f}%" if a and b is not None else ""
+        print(f"{cat:<9}{name:<{width}}{'' if a is None else f'{a:.1f}':>10}{'' if b is None else f'{b:.1f}':>10}{change:>9}")
+    return 0
+
+if enabled:
+    import atexit
+    atexit.register(write_trace)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,71 +1,127 @@
+import argparse
+import hashlib
 import json
+import sys
 from pathlib import Path
 
-# Bidirectional mapping for conversions
-q2a = {"w": "z", "a": "q", "s": "s", "d": "d"}
-a2q = {v: k for k, v in q2a.items()}
-full_map = {**q2a, **a2q}
+from layouts import dump_json, get_layout, load_layout_file, roundtrip_errors
+from spans import span
+
+qwerty_dir = Path("KC-Config-Suite/Pattern_Suite")
+azerty_dir = qwerty_dir / "AZERTY"
+
+azerty = get_layout("azerty")
 
 def convert_key(key: str) -> str:
-    parts = key.split("+")
-    new_parts = []
-    for p in parts:
-        if len(p) == 1:
-            c = p
-            c_lower = c.lower()
-            mapped = full_map.get(c_lower, c_lower)
-            if c.isupper():
-                mapped = mapped.upper()
-            new_parts.append(mapped)
-        else:
-            new_parts.append(p)
-    return "+".join(new_parts)
+    return azerty.encode_key(key)
 
 def convert_pattern_json(data: dict) -> dict:
-    if "pattern" in data and isinstance(data["pattern"], list):
-        for entry in data["pattern"]:
-            if "key" in entry:
-                entry["key"] = convert_key(entry["key"])
-    return data
+    return azerty.encode(data)
 
 def convert_simple_json(data: dict) -> dict:
-    return {
-        k: [q2a.get(c.lower(), c.lower()) for c in seq]
-        for k, seq in data.items()
-    }
+    return azerty.encode(data)
 
-# Set up paths
-qwerty_dir = Path("KC-Config-Suite/Pattern_Suite")
-azerty_dir = qwerty_dir / "AZERTY"
-azerty_dir.mkdir(exist_ok=True)
-
-qwerty_files = {f.name: f for f in qwerty_dir.glob("*.json")}
-azerty_files = {f.name: f for f in azerty_dir.glob("*.json")}
-
-# Convert each QWERTY file to AZERTY
-for name, q_file in qwerty_files.items():
-    az_file = azerty_dir / name
+def load_pattern(path):
+    with span("read", "io", path=str(path)):
+        text = path.read_text(encoding='utf-8-sig')
     try:
-        text = q_file.read_text(encoding='utf-8-sig')
-        data = json.loads(text)
+        with span("json parse", "parse", path=str(path)):
+            return json.loads(text)
     except json.JSONDecodeError as e:
-        print(f"✖ Failed to decode JSON in: {q_file}")
+        print(f"✖ Failed to decode JSON in: {path}")
         print(f"Reason: {e}")
         print("Offending content (first 20 lines):")
         print("\n".join(text.splitlines()[:20]))
         raise
 
-    # Auto-detect format
-    if isinstance(data, dict) and "pattern" in data and isinstance(data["pattern"], list):
-        converted = convert_pattern_json(data)
-    else:
-        converted = convert_simple_json(data)
+def write_if_changed(path, text):
+    """Write text unless the file already holds exactly these bytes. Returns True if written."""
+    data = text.encode("utf-8")
+    if path.exists() and hashlib.sha256(path.read_bytes()).digest() == hashlib.sha256(data).digest():
+        return False
+    path.write_bytes(data)
+    return True
+
+def sync_file(layout, src, out):
+    """Convert one QWERTY pattern file into its layout twin. Returns True if out was written."""
+    data = load_pattern(src)
+    with span("convert", "convert", layout=layout.name):
+        text = dump_json(layout.encode(data))
+    with span("write", "io", path=str(out)) as s:
+        written = write_if_changed(out, text)
+        s.set(written=written)
+    if written:
+        print(f"Created/Updated: {out}")
+        return True
+    return False
+
+def sync_layout(layout, source_dir=qwerty_dir, target_dir=None):
+    """Mirror every QWERTY pattern file into target_dir in the given layout.
+
+    Files whose converted content is already on disk are left untouched, and
+    target files without a QWERTY source are deleted. Returns (written, unchanged, deleted).
+    """
+    target_dir = Path(target_dir or source_dir / layout.name.upper())
+    target_dir.mkdir(exist_ok=True)
+
+    sources = {f.name: f for f in source_dir.glob("*.json")}
+    written = unchanged = deleted = 0
+    for name, src in sorted(sources.items()):
+        if sync_file(layout, src, target_dir / name):
+            written += 1
+        else:
+            unchanged += 1
+
+    for out in sorted(target_dir.glob("*.json")):
+        if out.name not in sources:
+            out.unlink()
+            deleted += 1
+            print(f"Deleted orphan {layout.name.upper()} file: {out}")
+    return written, unchanged, deleted
+
+def check_roundtrip(layout, source_dir=qwerty_dir):
+    """Check that QWERTY -> layout -> QWERTY is the identity on every source file."""
+    ok = True
+    for src in sorted(source_dir.glob("*.json")):
+        errors = roundtrip_errors(load_pattern(src), layout)
+        if errors:
+            ok = False
+            print(f"✖ {src.name}: {len(errors)} keys do not round-trip through {layout.name}, e.g. {errors[0]}")
+    if ok:
+        print(f"All pattern files round-trip through {layout.name}.")
+    return ok
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mirror the QWERTY pattern suites into other keyboard layouts.")
+    parser.add_argument("--layout", action="append",
+                        help="layout to generate, repeatable (default: azerty)")
+    parser.add_argument("--layout-file", help='JSON file of extra layouts: {"name": {"w": "z", ...}}')
+    parser.add_argument("--check-roundtrip", action="store_true",
+                        help="only verify each layout converts back to QWERTY losslessly")
+    args = parser.parse_args(argv)
+
+    with span("sync_azerty_patterns"):
+        return run(args)
+
+def run(args):
+    if args.layout_file:
+        load_layout_file(args.layout_file)
+    try:
+        layouts = [get_layout(name) for name in args.layout or ["azerty"]]
+    except (KeyError, ValueError) as e:
+        print(f"✖ {e.args[0]}")
+        return 1
+
+    if args.check_roundtrip:
+        return 0 if all([check_roundtrip(layout) for layout in layouts]) else 1
 
-    az_file.write_text(json.dumps(converted, indent=2, ensure_ascii=False))
-    print(f"Created/Updated: {az_file}")
+    for layout in layouts:
+        if layout.is_identity():
+            continue
+        target = azerty_dir if layout.name == "azerty" else None
+        written, unchanged, deleted = sync_layout(layout, target_dir=target)
+        print(f"{layout.name.upper()}: {written} written, {unchanged} unchanged, {deleted} deleted.")
+    return 0
 
-# Delete orphan AZERTY files
-for name, a_file in azerty_files.items():
-    if name not in qwerty_files:
-        a_file.unlink()
-        print(f"Deleted orphan AZERTY file: {a_file}")
+if __name__ == "__main__":
+    sys.exit(main())
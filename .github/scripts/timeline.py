@@ -0,0 +1,247 @@
+"""Compile pattern-entry files into key event timelines, and replay them.
+
+A pattern-entry file is a list of {"key", "duration", "click"} entries that
+the dig tool replays one by one: hold the key(s) for duration ms, clicking
+when the entry starts. Compiling turns it into keydown/keyup/click events at
+millisecond offsets within one loop:
+
+* label entries (keys starting with a zero-width space) press no key; those
+  that take no time and do not click are dropped, the others keep their
+  duration and click
+* keys shared by consecutive entries stay held, so runs of one key become a
+  single hold and "SHIFT+W" followed by "W" only releases SHIFT
+* key names are compared case-insensitively ("D" and "d" are one key)
+
+The loop duration, click count and net movement are computed once at
+compile time. replay() plays a timeline against a clock, which tests can
+replace with FakeClock, and measures how late each event fires.
+
+Usage:
+    python .github/scripts/timeline.py compile KC-Config-Suite/Pattern_Suite/_KC_Panel_v1_20250710.json [--output t.json]
+    python .github/scripts/timeline.py replay FILE [--loops 3] [--fps 120] [--naive] [--latency 0.5]
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from path_geometry import entry_vectors
+
+LABEL_PREFIX = "\u200b"
+
+default_fps = 120
+# SystemClock sleeps until this close to a deadline, then spins
+default_spin = 0.002
+
+def is_label(entry):
+    key = entry.get("key", "")
+    return not key.strip() or key.startswith(LABEL_PREFIX)
+
+def is_noop(entry):
+    """A label that takes no time and does not click."""
+    return is_label(entry) and not entry_duration(entry) and not entry.get("click")
+
+def key_parts(key):
+    """Physical keys of an entry key ("SHIFT+W" -> ["shift", "w"]), in press order."""
+    return [part.strip().lower() for part in key.split("+") if part.strip()]
+
+def entry_duration(entry):
+    try:
+        return max(0.0, float(entry.get("duration") or 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+class Timeline:
+    """Key events of one loop as (ms offset, "down" | "up" | "click", key) tuples."""
+
+    def __init__(self, name, events, loop_ms, clicks, steps, held_ms):
+        self.name = name
+        self.events = events
+        self.loop_ms = loop_ms
+        self.clicks = clicks
+        self.steps = steps
+        self.held_ms = held_ms
+
+    def to_dict(self):
+        return {
+            "name": self.name, "loop_ms": self.loop_ms, "clicks": self.clicks,
+            "movement": {"steps": self.steps, "held_ms": self.held_ms},
+            "events": [list(e) for e in self.events],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        movement = data["movement"]
+        events = [tuple(e) for e in data["events"]]
+        check_events(events)
+        return cls(data["name"], events, data["loop_ms"], data["clicks"], movement["steps"], movement["held_ms"])
+
+def compile_entries(entries, name="", merge=True):
+    """Compile pattern entries into a Timeline.
+
+    Events keep the order they are emitted in: at each entry boundary the
+    released keys go up before the new keys go down, then the entry clicks.
+    With merge=False every entry, labels included, gets its own press and
+    release, which is what replaying the file one entry at a time costs.
+    """
+    events = []
+    held = []
+    t = 0.0
+    clicks = 0
+    for entry in entries:
+        if merge and is_noop(entry):
+            continue
+        keys = [] if merge and is_label(entry) else key_parts(entry.get("key", ""))
+        keep = [k for k in held if k in keys] if merge else []
+        events.extend((t, "up", k) for k in reversed(held) if k not in keep)
+        events.extend((t, "down", k) for k in keys if k not in keep)
+        held = keep + [k for k in keys if k not in keep]
+        if entry.get("click"):
+            events.append((t, "click", ""))
+            clicks += 1
+        t += entry_duration(entry)
+    events.extend((t, "up", k) for k in reversed(held))
+    check_events(events)
+
+    vectors, _, durations = entry_vectors(entries)
+    steps = vectors.sum(axis=0).tolist() if len(vectors) else [0, 0]
+    held_ms = (vectors * durations[:, None]).sum(axis=0).tolist() if len(vectors) else [0.0, 0.0]
+    return Timeline(name, events, t, clicks, steps, held_ms)
+
+def check_events(events):
+    """Raise ValueError unless every key that goes down goes up again later, and only then."""
+    down = {}
+    for index, (t, action, key) in enumerate(events):
+        if action == "down":
+            if key in down:
+                raise ValueError(f"{key!r} pressed at {t:g} ms while already down")
+            down[key] = t
+        elif action == "up":
+            if down.pop(key, None) is None:
+                raise ValueError(f"{key!r} released at {t:g} ms without a press")
+        if index and t < events[index - 1][0]:
+            raise ValueError(f"event at {t:g} ms comes after one at {events[index - 1][0]:g} ms")
+    if down:
+        raise ValueError(f"never released: {', '.join(sorted(down))}")
+
+def compile_file(path, merge=True):
+    with open(path, "r", encoding="utf-8-sig") as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or not isinstance(data.get("pattern"), list):
+        raise ValueError(f"{path} is not a pattern-entry file")
+    return compile_entries(data["pattern"], data.get("name", Path(path).stem), merge)
+
+class SystemClock:
+    """perf_counter time; sleeps coarsely, then spins for the last `spin` seconds."""
+
+    def __init__(self, spin=default_spin):
+        self.spin = spin
+
+    def now(self):
+        return time.perf_counter()
+
+    def sleep_until(self, deadline):
+        remaining = deadline - time.perf_counter() - self.spin
+        if remaining > 0:
+            time.sleep(remaining)
+        while time.perf_counter() < deadline:
+            pass
+
+class FakeClock:
+    """Deterministic clock: sleeping jumps to the deadline plus latency() seconds."""
+
+    def __init__(self, latency=None):
+        self.t = 0.0
+        self.latency = latency or (lambda: 0.0)
+
+    def now(self):
+        return self.t
+
+    def sleep_until(self, deadline):
+        self.t = max(self.t, deadline) + self.latency()
+
+def replay(timeline, loops=1, clock=None, sink=None):
+    """Play the timeline `loops` times; sink(action, key) is called per event.
+
+    Returns {"events", "mean_ms", "p50_ms", "p95_ms", "max_ms"}, the lateness of
+    events against their schedule. Loops are scheduled back to back from the
+    start, so lateness does not accumulate.
+    """
+    clock = clock or SystemClock()
+    start = clock.now()
+    lateness = []
+    for loop in range(loops):
+        base = start + loop * timeline.loop_ms / 1000
+        for offset, action, key in timeline.events:
+            deadline = base + offset / 1000
+            clock.sleep_until(deadline)
+            lateness.append(1000 * (clock.now() - deadline))
+            if sink:
+                sink(action, key)
+    if not lateness:
+        return {"events": 0, "mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+    ordered = sorted(lateness)
+    return {
+        "events": len(lateness),
+        "mean_ms": statistics.fmean(lateness),
+        "p50_ms": ordered[len(ordered) // 2],
+        "p95_ms": ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))],
+        "max_ms": ordered[-1],
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile pattern-entry files into key event timelines.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("compile", help="print or write the compiled timeline")
+    p.add_argument("file")
+    p.add_argument("--output", help="write the timeline as JSON")
+    p.add_argument("--naive", action="store_true", help="one press and release per entry, labels included")
+    p = sub.add_parser("replay", help="replay a timeline and measure scheduling jitter")
+    p.add_argument("file")
+    p.add_argument("--loops", type=int, default=1)
+    p.add_argument("--fps", type=float, default=default_fps, help="frame rate to express jitter in (target_fps)")
+    p.add_argument("--naive", action="store_true", help="also replay the uncompiled entries for comparison")
+    p.add_argument("--latency", type=float, metavar="MS",
+                   help="use a simulated clock with uniform 0..MS ms wake-up latency instead of sleeping")
+    p.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    try:
+        timeline = compile_file(args.file, merge=not args.naive or args.command == "replay")
+    except (OSError, ValueError) as e:
+        print(f"✖ {e}")
+        return 1
+
+    if args.command == "compile":
+        downs = sum(1 for e in timeline.events if e[1] == "down")
+        print(f"{timeline.name}: {len(timeline.events)} events ({downs} holds, {timeline.clicks} clicks), "
+              f"{timeline.loop_ms:g} ms per loop, net movement {timeline.steps} steps / {timeline.held_ms} ms held")
+        if args.output:
+            Path(args.output).write_text(json.dumps(timeline.to_dict(), indent=2) + "\n", encoding="utf-8")
+            print(f"Wrote {args.output}")
+        else:
+            for offset, action, key in timeline.events:
+                print(f"{offset:10.1f}  {action:<5} {key}")
+        return 0
+
+    runs = [("compiled", timeline)]
+    if args.naive:
+        runs.append(("naive", compile_file(args.file, merge=False)))
+    frame_ms = 1000 / args.fps
+    for label, t in runs:
+        if args.latency is not None:
+            rng = random.Random(args.seed)
+            clock = FakeClock(lambda: rng.uniform(0, args.latency / 1000))
+        else:
+            clock = SystemClock()
+        stats = replay(t, args.loops, clock)
+        print(f"{label:<9} {stats['events']:5} events  mean {stats['mean_ms']:.3f} ms  p50 {stats['p50_ms']:.3f} ms  "
+              f"p95 {stats['p95_ms']:.3f} ms  max {stats['max_ms']:.3f} ms  "
+              f"(p95 = {stats['p95_ms'] / frame_ms:.2f} frames at {args.fps:g} fps)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,122 +1,166 @@
+import argparse
 import re
-import subprocess
+import sys
+from bisect import bisect_right
 from datetime import date
 from pathlib import Path
 
+import readme_history
+from spans import span
+
 README = Path("README.md")
 TODAY = date.today().isoformat()
+DEFAULT_RANGE = "HEAD~1..HEAD"
 
 TIMESTAMP_REGEX = r"<sub><sup>Last updated: \d{4}-\d{2}-\d{2}</sup></sub>"
+FOOTER_MARKER = "<!-- OPTIMIZATION FOOTER -->"
 
-def get_changed_lines():
-    """Return a set of line numbers in README.md that changed in the last commit."""
-    diff_output = subprocess.run(
-        ["git", "diff", "HEAD~1", "HEAD", "-U0", "--", str(README)],
-        capture_output=True, text=True
-    ).stdout
-
-    changed_lines = set()
-    for line in diff_output.splitlines():
-        if line.startswith("@@"):
-            m = re.search(r"\+(\d+)(?:,(\d+))?", line)
-            if m:
-                start = int(m.group(1))
-                count = int(m.group(2)) if m.group(2) else 1
-                changed_lines.update(range(start, start + count))
-    return changed_lines
-
-def find_footer_start(lines):
-    """Return the line index where the footer comment starts, or None if not found."""
-    for i, line in enumerate(lines):
-        if "<!-- OPTIMIZATION FOOTER -->" in line:
-            return i
-    return None
+TIMESTAMP_RE = re.compile(TIMESTAMP_REGEX)
+HEADER_RE = re.compile(r"### (.+)")
 
-def parse_shovel_sections(lines, footer_start):
-    """Parse shovel sections bounded by '###' headers, ignoring lines after footer."""
+def parse_sections(lines):
+    """Single pass over the README.
+
+    Returns (sections, footer_start): sections is a list of dicts with 'title',
+    'start' (header index) and 'end' (last content index) for every '###' header
+    before the footer; footer_start is None if there is no footer.
+    """
     sections = []
-    current_section = None
+    footer_start = None
     for i, line in enumerate(lines):
-        if footer_start is not None and i >= footer_start:
+        if FOOTER_MARKER in line:
+            footer_start = i
             break
-        if re.match(r"### .+", line):
-            if current_section:
-                current_section['end'] = i - 1
-                sections.append(current_section)
-            current_section = {'title': line.strip()[4:].strip(), 'start': i, 'end': None}
-    if current_section:
-        current_section['end'] = (footer_start - 1) if footer_start is not None else len(lines) - 1
-        sections.append(current_section)
-    return sections
-
-def update_timestamps():
-    text = README.read_text(encoding="utf-8")
-    lines = text.splitlines()
-
-    changed_lines = get_changed_lines()
-    footer_start = find_footer_start(lines)
-    sections = parse_shovel_sections(lines, footer_start)
-
-    # Determine which shovel sections have changed lines
-    changed_sections = set()
+        m = HEADER_RE.match(line)
+        if m:
+            if sections:
+                sections[-1]['end'] = i - 1
+            sections.append({'title': m.group(1).strip(), 'start': i, 'end': None})
+    if sections:
+        sections[-1]['end'] = (footer_start if footer_start is not None else len(lines)) - 1
+    return sections, footer_start
+
+def section_of(sections, starts, n):
+    """Title of the section containing line index n (bisect over starts), or None."""
+    idx = bisect_right(starts, n) - 1
+    if idx >= 0 and n <= sections[idx]['end']:
+        return sections[idx]['title']
+    return None
+
+def section_edit_dates(diff_range=DEFAULT_RANGE):
+    """Return {section title: date of its last meaningful edit} for a commit range.
+
+    Edits are attributed to the sections of README.md as of the end of the range.
+    """
+    marks, commits = readme_history.replay(diff_range, README)
+    if not marks:
+        return {}
+    text = readme_history.file_at(readme_history.range_end(diff_range), README)
+    if text is None:
+        return {}
+    sections, _ = parse_sections(text.splitlines())
+    starts = [s['start'] for s in sections]
+
+    latest = {}
+    for line, ci in marks.items():
+        title = section_of(sections, starts, line - 1)
+        if title is not None:
+            latest[title] = max(latest.get(title, -1), ci)
+    return {title: commits[ci][1] for title, ci in latest.items()}
+
+def section_bodies(lines):
+    """{title: meaningful content lines} for every section; blank and timestamp lines are dropped."""
+    sections, _ = parse_sections(lines)
+    return {
+        s['title']: [l for l in lines[s['start'] + 1:s['end'] + 1] if l.strip() and not TIMESTAMP_RE.match(l)]
+        for s in sections
+    }
+
+def edited_sections(old_lines, new_lines):
+    """Titles of sections that are new or whose meaningful content differs between two READMEs."""
+    old = section_bodies(old_lines)
+    return {title for title, body in section_bodies(new_lines).items() if old.get(title) != body}
+
+def stamp_section(content, stamp_date=TODAY):
+    """Return section content (header excluded) with its timestamp line replaced."""
+    content = list(content)
+    # Remove existing timestamp line if present
+    if content and TIMESTAMP_RE.match(content[-1]):
+        content.pop()
+
+    # Remove extra blank lines before adding timestamp
+    while content and content[-1].strip() == "":
+        content.pop()
+    content.append("")  # one blank line
+    content.append(f"<sub><sup>Last updated: {stamp_date}</sup></sub>")
+    return content
+
+def apply_timestamps(lines, sections, changed_sections, stamp_date=TODAY):
+    """Rebuild the README lines with fresh timestamps on the changed sections.
+
+    changed_sections is a set of titles stamped with stamp_date, or a dict
+    mapping titles to their own dates.
+    """
+    output_lines = []
+    pos = 0
     for section in sections:
-        if any(line_num >= section['start'] and line_num <= section['end'] for line_num in changed_lines):
-            changed_sections.add(section['title'])
+        start, end = section['start'], section['end']
+        output_lines.extend(lines[pos:start + 1])
+        content = lines[start + 1:end + 1]
+        if section['title'] in changed_sections:
+            day = changed_sections[section['title']] if isinstance(changed_sections, dict) else stamp_date
+            content = stamp_section(content, day)
+        output_lines.extend(content)
+        pos = end + 1
+    output_lines.extend(lines[pos:])
+    return output_lines
+
+def update_timestamps(diff_range=DEFAULT_RANGE, check=False):
+    """Stamp each section edited in diff_range with the date of its last edit.
+
+    Returns the changed section titles. With check=True nothing is written; the
+    sections that would change are only reported.
+    """
+    with span("read README", "io"):
+        text = README.read_text(encoding="utf-8")
+    with span("parse sections", "parse"):
+        lines = text.splitlines()
+        sections, _ = parse_sections(lines)
+    titles = {s['title'] for s in sections}
+    with span("section edit dates", "io", range=diff_range):
+        changed_sections = {t: d for t, d in section_edit_dates(diff_range).items() if t in titles}
 
     if not changed_sections:
         print("No shovel sections changed.")
-        return
-
-    print(f"Changed shovel sections: {changed_sections}")
+        return changed_sections
 
-    output_lines = []
-    i = 0
-    while i < len(lines):
-        # If footer reached, append footer and beyond as is
-        if footer_start is not None and i == footer_start:
-            output_lines.extend(lines[i:])
-            break
+    print(f"Changed shovel sections: {set(changed_sections)}")
 
-        line = lines[i]
-        header_match = re.match(r"### (.+)", line)
-        if header_match and (footer_start is None or i < footer_start):
-            shovel_title = header_match.group(1).strip()
-            output_lines.append(line)
-            i += 1
-
-            # Gather section content until next header or footer
-            section_content = []
-            while i < len(lines):
-                if footer_start is not None and i >= footer_start:
-                    break
-                if re.match(r"### .+", lines[i]):
-                    break
-                section_content.append(lines[i])
-                i += 1
-
-            if shovel_title in changed_sections:
-                # Remove existing timestamp line if present
-                if section_content and re.match(TIMESTAMP_REGEX, section_content[-1]):
-                    section_content.pop()
-
-                # Remove extra blank lines before adding timestamp
-                while section_content and section_content[-1].strip() == "":
-                    section_content.pop()
-                section_content.append("")  # one blank line
-                section_content.append(f"<sub><sup>Last updated: {TODAY}</sup></sub>")
-
-            output_lines.extend(section_content)
-        else:
-            # Lines outside shovel sections and before footer (if any)
-            output_lines.append(line)
-            i += 1
-
-    new_text = "\n".join(output_lines) + "\n"
-    if new_text != text:
-        README.write_text(new_text, encoding="utf-8")
-        print("README.md updated with new timestamps.")
-    else:
+    with span("apply timestamps", "convert"):
+        new_text = "\n".join(apply_timestamps(lines, sections, changed_sections)) + "\n"
+    if new_text == text:
         print("README.md already up to date.")
+        return set()
+    if check:
+        print("README.md would be updated with new timestamps.")
+        return set(changed_sections)
+    with span("write README", "io"):
+        README.write_text(new_text, encoding="utf-8")
+    print("README.md updated with new timestamps.")
+    return set(changed_sections)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Timestamp README shovel sections changed in a commit range.")
+    parser.add_argument("--range", dest="diff_range", default=DEFAULT_RANGE,
+                        help="commit range to inspect (default: %(default)s)")
+    parser.add_argument("--full-history", action="store_true",
+                        help="rebuild every section's timestamp from the whole history of HEAD")
+    parser.add_argument("--check", action="store_true",
+                        help="only report which sections would change; exit 1 if any would")
+    args = parser.parse_args(argv)
+    with span("update_shovel_timestamps"):
+        changed = update_timestamps("HEAD" if args.full_history else args.diff_range, args.check)
+    return 1 if args.check and changed else 0
 
 if __name__ == "__main__":
-    update_timestamps()
+    sys.exit(main())
@@ -0,0 +1,312 @@
+"""Validate every tracked JSON file against the schema for its format.
+
+Formats:
+    config   KC-Config-Suite/dt*/...json        dig-tool configs
+    simple   Pattern_Suite (+ AZERTY) suites    {name: ["w", "a", ...]}
+    entries  Pattern_Suite files with "pattern" {"name", "pattern": [{key, duration, click}]}
+    json     anything else                      syntax only
+
+Schemas use a small subset of JSON Schema (type, properties, required,
+additionalProperties, items, minItems, maxItems, enum, minimum). Every error
+carries the JSON pointer of the offending value. Results are cached by
+content hash, so unchanged files are not parsed again, and uncached files are
+validated in a process pool once there are enough of them to pay for it.
+
+Usage:
+    python .github/scripts/validate_jsons.py [FILES...] [--report report.json]
+"""
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from layouts import get_layout
+from spans import span
+
+cache_path = Path(".kc_index/validation.json")
+# Bump when a schema changes so cached results are discarded
+schema_version = 1
+# Below this many uncached files a process pool costs more than it saves
+parallel_threshold = 64
+
+pattern_dir = "KC-Config-Suite/Pattern_Suite/"
+config_dir = "KC-Config-Suite/dt"
+
+INT = {"type": "integer"}
+NUMBER = {"type": "number"}
+BOOL = {"type": "boolean"}
+STRING = {"type": "string"}
+
+def point(length):
+    return {"type": "array", "items": {"type": "integer"}, "minItems": length, "maxItems": length}
+
+def optional(schema):
+    return {**schema, "type": [schema["type"], "null"]}
+
+# Every params key seen across dig-tool versions; older versions only have a subset
+PARAMS = {
+    "line_sensitivity": INT, "line_min_height": INT, "zone_min_width": INT,
+    "max_zone_width_percent": INT, "min_zone_height_percent": INT,
+    "saturation_threshold": NUMBER, "zone_smoothing_factor": NUMBER,
+    "sweet_spot_width_percent": INT, "post_click_blindness": INT,
+    "prediction_enabled": BOOL, "system_latency": {"type": ["integer", "string"]},
+    "max_prediction_time": INT, "min_velocity_threshold": INT,
+    "prediction_confidence_threshold": NUMBER,
+    "main_on_top": BOOL, "preview_on_top": BOOL, "debug_on_top": BOOL,
+    "debug_enabled": BOOL, "debug_clicks_enabled": BOOL,
+    "auto_sell_enabled": BOOL, "sell_every_x_digs": INT, "sell_delay": INT,
+    "auto_sell_method": STRING, "auto_sell_ui_sequence": STRING,
+    "auto_sell_target_engagement_enabled": BOOL, "auto_sell_target_engagement_timeout": NUMBER,
+    "auto_walk_enabled": BOOL, "walk_duration": INT,
+    "dynamic_walkspeed_enabled": BOOL, "initial_item_count": INT, "initial_walkspeed_decrease": NUMBER,
+    "user_id": STRING, "webhook_url": STRING, "server_id": STRING, "milestone_interval": INT,
+    "include_discord_in_settings": BOOL, "include_screenshot_in_discord": BOOL,
+    "notification_rarities": STRING, "use_custom_cursor": BOOL,
+    "auto_shovel_enabled": BOOL, "shovel_slot": INT, "shovel_timeout": INT, "shovel_equip_mode": STRING,
+    "click_method": STRING,
+    "velocity_based_width_enabled": BOOL, "velocity_width_multiplier": NUMBER, "velocity_max_factor": NUMBER,
+    "line_exclusion_radius": INT, "line_detection_offset": NUMBER,
+    "target_fps": INT, "screenshot_fps": INT, "max_wait_time": INT,
+    "use_otsu_detection": BOOL, "otsu_min_area": INT, "otsu_max_area": {"type": ["integer", "string"]},
+    "otsu_morph_kernel_size": INT, "otsu_adaptive_area": BOOL, "otsu_area_percentile": NUMBER,
+    "otsu_disable_color_lock": BOOL,
+    "use_color_picker_detection": BOOL, "picked_color_rgb": STRING, "color_tolerance": INT,
+    "auto_rejoin_enabled": BOOL, "roblox_server_link": STRING, "rejoin_check_interval": INT,
+    "auto_rejoin_restart_delay": INT, "auto_rejoin_discord_notifications": BOOL,
+    "money_area": STRING, "item_area": STRING,
+    "enable_money_detection": BOOL, "enable_item_detection": BOOL,
+}
+
+CONFIG_SCHEMA = {
+    "type": "object",
+    "required": ["params", "keybinds", "game_area"],
+    "additionalProperties": False,
+    "properties": {
+        "params": {
+            "type": "object",
+            "required": ["line_sensitivity", "zone_min_width", "saturation_threshold",
+                         "sweet_spot_width_percent", "post_click_blindness", "prediction_enabled"],
+            "additionalProperties": False,
+            "properties": PARAMS,
+        },
+        "keybinds": {
+            "type": "object",
+            "required": ["toggle_bot", "toggle_gui", "toggle_overlay"],
+            "additionalProperties": STRING,
+        },
+        "game_area": point(4),
+        "sell_button_position": optional(point(2)),
+        "cursor_position": optional(point(2)),
+        "walk_pattern": STRING,
+        "money_area": optional(point(4)),
+        "item_area": optional(point(4)),
+    },
+}
+
+def simple_schema(keys):
+    return {
+        "type": "object",
+        "additionalProperties": {"type": "array", "minItems": 1, "items": {"type": "string", "enum": keys}},
+    }
+
+QWERTY_KEYS = list("wasd")
+SIMPLE_SCHEMA = simple_schema(QWERTY_KEYS)
+AZERTY_SCHEMA = simple_schema([c.translate(get_layout("azerty").simple_encode_table) for c in QWERTY_KEYS])
+
+ENTRIES_SCHEMA = {
+    "type": "object",
+    "required": ["name", "pattern"],
+    "properties": {
+        "name": STRING,
+        "pattern": {
+            "type": "array",
+            "minItems": 1,
+            "items": {
+                "type": "object",
+                "required": ["key", "duration", "click"],
+                "additionalProperties": False,
+                "properties": {"key": STRING, "duration": {"type": "integer", "minimum": 0}, "click": BOOL},
+            },
+        },
+    },
+    "additionalProperties": STRING,
+}
+
+JSON_TYPES = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+}
+
+def pointer(parts):
+    """RFC 6901 JSON pointer for a path of keys and indices."""
+    return "".join("/" + str(p).replace("~", "~0").replace("/", "~1") for p in parts)
+
+def type_name(value):
+    for name in ("null", "boolean", "integer", "number", "string", "array", "object"):
+        if JSON_TYPES[name](value):
+            return name
+    return type(value).__name__
+
+def validate(value, schema, path=(), errors=None):
+    """Return a list of (pointer, message) for every violation of schema."""
+    errors = [] if errors is None else errors
+    expected = schema.get("type")
+    if expected:
+        allowed = expected if isinstance(expected, list) else [expected]
+        if not any(JSON_TYPES[t](value) for t in allowed):
+            errors.append((pointer(path), f"expected {' or '.join(allowed)}, got {type_name(value)}"))
+            return errors
+
+    if "enum" in schema and value not in schema["enum"]:
+        errors.append((pointer(path), f"{value!r} is not one of {schema['enum']}"))
+    if "minimum" in schema and value < schema["minimum"]:
+        errors.append((pointer(path), f"{value} is below the minimum {schema['minimum']}"))
+
+    if isinstance(value, dict):
+        for key in schema.get("required", ()):
+            if key not in value:
+                errors.append((pointer(path), f"missing required key {key!r}"))
+        properties = schema.get("properties", {})
+        extra = schema.get("additionalProperties", True)
+        for key, item in value.items():
+            if key in properties:
+                validate(item, properties[key], path + (key,), errors)
+            elif extra is False:
+                errors.append((pointer(path + (key,)), f"unknown key {key!r}"))
+            elif isinstance(extra, dict):
+                validate(item, extra, path + (key,), errors)
+    elif isinstance(value, list):
+        if len(value) < schema.get("minItems", 0):
+            errors.append((pointer(path), f"expected at least {schema['minItems']} items, got {len(value)}"))
+        if len(value) > schema.get("maxItems", len(value)):
+            errors.append((pointer(path), f"expected at most {schema['maxItems']} items, got {len(value)}"))
+        if "items" in schema:
+            for i, item in enumerate(value):
+                validate(item, schema["items"], path + (i,), errors)
+    return errors
+
+def file_kind(path):
+    """Format of a file from its location: config, pattern (simple or entries), or json."""
+    path = Path(path).as_posix()
+    if path.startswith(pattern_dir):
+        return "azerty" if path.startswith(pattern_dir + "AZERTY/") else "pattern"
+    if path.startswith(config_dir):
+        return "config"
+    return "json"
+
+def check_bytes(raw, kind):
+    """Parse and validate one file's bytes. Returns a list of (pointer, message)."""
+    try:
+        data = json.loads(raw.decode("utf-8-sig"))
+    except UnicodeDecodeError as e:
+        return [("", f"not UTF-8: {e.reason} at byte {e.start}")]
+    except json.JSONDecodeError as e:
+        return [("", f"invalid JSON: {e.msg} (line {e.lineno}, column {e.colno})")]
+
+    if kind == "config":
+        return validate(data, CONFIG_SCHEMA)
+    if kind in ("pattern", "azerty"):
+        if isinstance(data, dict) and "pattern" in data:
+            return validate(data, ENTRIES_SCHEMA)
+        return validate(data, AZERTY_SCHEMA if kind == "azerty" else SIMPLE_SCHEMA)
+    return []
+
+def check_job(job):
+    return check_bytes(*job)
+
+def tracked_json_files():
+    result = subprocess.run(["git", "ls-files", "*.json"], capture_output=True, text=True, check=True)
+    return result.stdout.split()
+
+def load_cache():
+    try:
+        cache = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return cache.get("results", {}) if cache.get("version") == schema_version else {}
+
+def save_cache(results):
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = cache_path.with_suffix(".tmp")
+    tmp.write_text(json.dumps({"version": schema_version, "results": results}, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp, cache_path)
+
+def validate_files(files, workers=None, use_cache=True):
+    """Validate files; returns the report dict.
+
+    The report's "cached" counts files whose result came from the cache;
+    repeats of a content within this run are checked once but not counted.
+    """
+    cache = load_cache() if use_cache else {}
+    results = {}
+    pending = []
+    keys = []
+    cached = 0
+    with span("read and hash", "io", files=len(files)):
+        for name in files:
+            kind = file_kind(name)
+            raw = Path(name).read_bytes()
+            key = f"{kind}:{hashlib.sha256(raw).hexdigest()}"
+            keys.append(key)
+            if key in cache:
+                results[key] = cache[key]
+                cached += 1
+            elif key not in results:
+                results[key] = None
+                pending.append((key, raw, kind))
+
+    jobs = [(raw, kind) for _, raw, kind in pending]
+    with span("parse and validate", "parse", files=len(jobs)):
+        if len(jobs) >= parallel_threshold and (workers or os.cpu_count() or 1) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                checked = list(pool.map(check_job, jobs, chunksize=16))
+        else:
+            checked = [check_job(job) for job in jobs]
+    for (key, _, _), errors in zip(pending, checked):
+        results[key] = [list(e) for e in errors]
+
+    if use_cache:
+        save_cache(results)
+
+    report = {"files": len(files), "cached": cached, "failed": 0, "errors": []}
+    failed = set()
+    for name, key in zip(files, keys):
+        for ptr, message in results[key]:
+            report["errors"].append({"file": name, "pointer": ptr, "message": message})
+            failed.add(name)
+    report["failed"] = len(failed)
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate JSON files against the repository's schemas.")
+    parser.add_argument("files", nargs="*", help="files to check (default: every tracked *.json)")
+    parser.add_argument("--report", help="write the machine-readable report to this file")
+    parser.add_argument("-j", "--workers", type=int, default=None)
+    parser.add_argument("--no-cache", action="store_true", help="ignore and do not update the result cache")
+    args = parser.parse_args(argv)
+
+    with span("validate_jsons"):
+        files = args.files or tracked_json_files()
+        report = validate_files(files, args.workers, not args.no_cache)
+
+    if args.report:
+        Path(args.report).write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    for error in report["errors"]:
+        print(f"❌ {error['file']}{'#' + error['pointer'] if error['pointer'] else ''}: {error['message']}")
+    if report["failed"]:
+        print(f"{report['failed']} of {report['files']} JSON files are invalid.")
+        return 1
+    print(f"All {report['files']} JSON files are valid ({report['cached']} cached).")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,58 @@
+import argparse
+import hashlib
+import io
+import itertools
 import json
+import math
+import os
 import re
+import shutil
+import struct
+import tempfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from PIL import Image, ImageDraw
+from PIL import GifImagePlugin, Image, ImageDraw, PngImagePlugin
+
+from path_geometry import PathGeometry, azerty_move_map, fit_to_canvas, move_map
+from pattern_model import Pattern, load_suite
+import spans
+from spans import span
 
 step_size = 20
+# The canvas is sized to each path within these bounds; long paths get a smaller step
+min_image_size = (200, 200)
 image_size = (600, 600)
+canvas_margin = 20
 frame_duration = 100
+line_width = 3
+marker_radius = 4
+
+# Bump whenever the drawing code changes so cached renders get re-rendered
+render_version = 3
+
+# Output format -> file suffix. GIF and APNG frames are cropped here (see
+# iter_frames); libwebp crops each frame to what changed itself
+FORMATS = {"gif": ".gif", "webp": ".webp", "apng": ".png", "svg": ".svg"}
+
+# Contact sheet: final frame of every pattern, tiled
+sheet_name = "contact_sheet.png"
+sheet_tile = 200
+sheet_columns = 3
+sheet_label_height = 20
 
 # Directories
 pattern_dir = Path("KC-Config-Suite/Pattern_Suite")
 output_dir = Path("assets/pattern_suite/path_visualizations")
-output_dir.mkdir(parents=True, exist_ok=True)
 
-move_map = {'w': (0, -1), 'a': (-1, 0), 's': (0, 1), 'd': (1, 0)}
+# Palette indices used on the canvas: background, path, current position
+BACKGROUND, LINE, MARKER = 0, 1, 2
+palette = [255, 255, 255, 0, 0, 255, 255, 0, 0]
+
+# The content hash is stored in the file (GIF comment, PNG text chunk, WebP XMP,
+# SVG comment) so the cache travels with the committed file
+HASH_PREFIX = "kc-render:"
+HASH_RE = re.compile(re.escape(HASH_PREFIX) + r"([0-9a-f]{64})")
 
 def find_latest_pattern_file():
     pattern = re.compile(r'_KC_Pattern_Suite_dt(\d+)\.x_v(\d+)_\d+\.json')
@@ -30,53 +70,502 @@ def find_latest_pattern_file():
             best_file = file
     return best_file
 
-def generate_gif(name, directions):
-    x, y = image_size[0] // 2, image_size[1] // 2
-    positions = [(x, y)]
-    for move in directions:
-        dx, dy = move_map.get(move, (0, 0))
-        x += dx * step_size
-        y += dy * step_size
-        positions.append((x, y))
+def find_all_pattern_files(directory=None):
+    """Return every pattern suite in a directory, oldest version first."""
+    pattern = re.compile(r'_KC_Pattern_Suite_dt(\d+)\.x_v(\d+)_\d+\.json')
+    found = []
+    for file in Path(directory or pattern_dir).glob("_KC_Pattern_Suite_dt*.json"):
+        match = pattern.match(file.name)
+        if match:
+            found.append(((int(match[1]), int(match[2])), file))
+    found.sort(key=lambda x: x[0])
+    return [file for _, file in found]
+
+def render_hash(directions, moves=None):
+    """Return a hash of everything that affects the rendered GIF for a direction list or Pattern."""
+    payload = json.dumps({
+        "directions": directions.to_list() if isinstance(directions, Pattern) else list(directions),
+        "moves": sorted((moves or move_map).items()),
+        "settings": [render_version, step_size, min_image_size, image_size, canvas_margin,
+                     frame_duration, line_width, marker_radius],
+    }, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def cached_hash(path):
+    """Return the render hash embedded in an existing render, or None."""
+    path = Path(path)
+    try:
+        if path.suffix == ".svg":
+            with open(path, "rb") as f:
+                comment = f.read(512)
+        else:
+            with Image.open(path) as im:
+                comment = im.info.get("comment") or im.info.get("xmp") or b""
+    except (OSError, ValueError):
+        return None
+    if isinstance(comment, bytes):
+        comment = comment.decode("ascii", "replace")
+    match = HASH_RE.search(comment)
+    return match[1] if match else None
+
+def clip_box(box, size):
+    """Clamp an (x0, y0, x1, y1) box to the canvas; returns None if nothing is left."""
+    x0, y0, x1, y1 = box
+    x0, y0 = max(x0, 0), max(y0, 0)
+    x1, y1 = min(x1, size[0]), min(y1, size[1])
+    if x0 >= x1 or y0 >= y1:
+        return None
+    return (x0, y0, x1, y1)
+
+def union_box(*boxes):
+    boxes = [b for b in boxes if b is not None]
+    if not boxes:
+        return None
+    return (min(b[0] for b in boxes), min(b[1] for b in boxes),
+            max(b[2] for b in boxes), max(b[3] for b in boxes))
+
+def marker_box(pos):
+    cx, cy = pos
+    return (cx - marker_radius, cy - marker_radius, cx + marker_radius + 1, cy + marker_radius + 1)
+
+def segment_box(p0, p1):
+    pad = line_width
+    return (min(p0[0], p1[0]) - pad, min(p0[1], p1[1]) - pad,
+            max(p0[0], p1[0]) + pad + 1, max(p0[1], p1[1]) + pad + 1)
+
+def iter_frames(positions, size=image_size):
+    """Yield (frame, offset) for each step, drawing onto one persistent canvas.
+
+    The first frame covers the whole canvas; every later frame only contains the
+    region that changed (the new segment plus the old and new marker).
+    """
+    canvas = Image.new("P", size, BACKGROUND)
+    canvas.putpalette(palette)
+    draw = ImageDraw.Draw(canvas)
+
+    for i in range(1, len(positions)):
+        prev, cur = positions[i - 1], positions[i]
+        draw.line([prev, cur], fill=LINE, width=line_width)
+
+        if i == 1:
+            region = (0, 0) + size
+        else:
+            region = clip_box(union_box(marker_box(prev), segment_box(prev, cur), marker_box(cur)), size)
+            if region is None:
+                # Path wandered off canvas; emit a 1px frame so the timing stays intact
+                region = (0, 0, 1, 1)
+
+        frame = canvas.crop(region)
+        cx, cy = cur[0] - region[0], cur[1] - region[1]
+        ImageDraw.Draw(frame).ellipse((cx - marker_radius, cy - marker_radius, cx + marker_radius, cy + marker_radius), fill=MARKER)
+        yield frame, region[:2]
 
-    frames = []
+def iter_full_frames(positions, size=image_size):
+    """Yield the whole canvas after each step, for encoders that find the changed region themselves."""
+    canvas = Image.new("P", size, BACKGROUND)
+    canvas.putpalette(palette)
+    draw = ImageDraw.Draw(canvas)
     for i in range(1, len(positions)):
-        img = Image.new("RGB", image_size, "white")
-        draw = ImageDraw.Draw(img)
-        draw.line(positions[:i+1], fill="blue", width=3)
+        draw.line([positions[i - 1], positions[i]], fill=LINE, width=line_width)
+        frame = canvas.copy()
         cx, cy = positions[i]
-        draw.ellipse((cx-4, cy-4, cx+4, cy+4), fill="red")
-        frames.append(img)
+        ImageDraw.Draw(frame).ellipse((cx - marker_radius, cy - marker_radius, cx + marker_radius, cy + marker_radius), fill=MARKER)
+        yield frame
 
-    out_path = output_dir / f"{name}.gif"
-    frames[0].save(out_path, save_all=True, append_images=frames[1:], duration=frame_duration, loop=0)
+class FrameSequence:
+    """Frames from an iterator, as one multi-frame image for Pillow's append_images.
+
+    Pillow seeks through an appended image's n_frames in order and encodes each
+    frame as it goes, so only the current frame is held instead of a list of
+    every frame. Other attributes are those of the current frame.
+    """
+
+    def __init__(self, frames, n_frames):
+        self._frames = frames
+        self._frame = None
+        self._index = -1
+        self.n_frames = n_frames
+
+    def seek(self, index):
+        if index < self._index:
+            raise EOFError("frames can only be read in order")
+        while self._index < index:
+            self._frame = next(self._frames)
+            self._index += 1
+
+    def tell(self):
+        return self._index
+
+    def __getattr__(self, name):
+        return getattr(self._frame, name)
+
+def png_chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+def png_chunks(image):
+    """(kind, data) of every chunk of an image encoded as a PNG."""
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    raw = buffer.getvalue()
+    pos = 8
+    while pos < len(raw):
+        length, kind = struct.unpack(">I4s", raw[pos:pos + 8])
+        yield kind, raw[pos + 8:pos + 8 + length]
+        pos += 12 + length
+
+def layout(directions, moves=None):
+    """Return (canvas positions, canvas size) of a pattern's walk."""
+    geometry = PathGeometry.from_directions(directions, moves)
+    step, size, origin = fit_to_canvas(geometry, step_size, canvas_margin, min_image_size, image_size)
+    return geometry.canvas_positions(step, origin), size
+
+def final_frame(directions, moves=None):
+    """The last frame of a pattern's animation: the whole path and the end marker."""
+    positions, size = layout(directions, moves)
+    frame = Image.new("P", size, BACKGROUND)
+    frame.putpalette(palette)
+    draw = ImageDraw.Draw(frame)
+    for prev, cur in zip(positions, positions[1:]):
+        draw.line([prev, cur], fill=LINE, width=line_width)
+    if len(positions) > 1:
+        cx, cy = positions[-1]
+        draw.ellipse((cx - marker_radius, cy - marker_radius, cx + marker_radius, cy + marker_radius), fill=MARKER)
+    return frame
+
+def file_mode():
+    """Permissions open() would give a new file: 0o666 minus the umask."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+def write_atomic(out_path, write):
+    """Call write(fp) on a temp file next to out_path, then move it into place."""
+    fd, tmp_name = tempfile.mkstemp(dir=out_path.parent, prefix=f".{out_path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fp:
+            write(fp)
+        # mkstemp creates the file 0600; renders should be as readable as plainly written files
+        os.chmod(tmp_name, file_mode())
+        os.replace(tmp_name, out_path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+def prepare_render(name, directions, out_dir, moves, fmt):
+    """Return (out_path, positions, canvas size) for a render in the given format."""
+    out_dir = Path(out_dir or output_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    positions, size = layout(directions, moves)
+    return out_dir / f"{name}{FORMATS[fmt]}", positions, size
+
+def generate_gif(name, directions, out_dir=None, moves=None):
+    """Write the GIF and return its path; None (nothing written) if the walk has no step to animate."""
+    out_path, positions, size = prepare_render(name, directions, out_dir, moves, "gif")
+    if len(positions) < 2:
+        return None
+
+    info = {"loop": 0, "comment": HASH_PREFIX + render_hash(directions, moves), "optimize": False}
+    frame_params = {"duration": frame_duration, "disposal": 1, "optimize": False}
+
+    # Frames are encoded and written as they are drawn instead of being collected first
+    def write(fp):
+        for index, (frame, offset) in enumerate(iter_frames(positions, size)):
+            if index == 0:
+                header, _ = GifImagePlugin.getheader(frame, info=info)
+                for chunk in header:
+                    fp.write(chunk)
+            for chunk in GifImagePlugin.getdata(frame, offset=offset, **frame_params):
+                fp.write(chunk)
+        fp.write(b";")
+
+    # Drawing and encoding interleave here, so the span covers both
+    with span("draw + encode gif", "encode", name=name):
+        write_atomic(out_path, write)
     return out_path
 
-def main():
-    json_file = find_latest_pattern_file()
-    if not json_file:
-        print("No valid pattern suite file found.")
-        return
+def generate_webp(name, directions, out_dir=None, moves=None):
+    """Lossless animated WebP; libwebp stores each frame as the rectangle that changed."""
+    out_path, positions, size = prepare_render(name, directions, out_dir, moves, "webp")
+    if len(positions) < 2:
+        return None
+    xmp = f'<x:xmpmeta xmlns:x="adobe:ns:meta/">{HASH_PREFIX}{render_hash(directions, moves)}</x:xmpmeta>'
 
-    with open(json_file, "r") as f:
-        data = json.load(f)
+    # Frames are drawn as the encoder asks for them instead of being collected first
+    def write(fp):
+        frames = iter_full_frames(positions, size)
+        first = next(frames)
+        rest = FrameSequence(frames, len(positions) - 2)
+        first.save(fp, format="WEBP", save_all=True, append_images=[rest] if rest.n_frames else [],
+                   duration=frame_duration, loop=0, lossless=True, method=4, xmp=xmp.encode("ascii"))
 
-    output_paths = []
-    for name, directions in data.items():
-        cleaned_name = name.strip("_")
-        out_gif = generate_gif(cleaned_name, directions)
-        output_paths.append((cleaned_name, out_gif))
+    with span("draw + encode webp", "encode", name=name):
+        write_atomic(out_path, write)
+    return out_path
+
+def generate_apng(name, directions, out_dir=None, moves=None):
+    """Animated PNG of the cropped frames of iter_frames, written chunk by chunk like the GIF.
+
+    Pillow's APNG writer keeps every frame until the end, so each frame is
+    encoded as a plain PNG and its image data is moved into the animation.
+    """
+    out_path, positions, size = prepare_render(name, directions, out_dir, moves, "apng")
+    if len(positions) < 2:
+        return None
+    comment = b"comment\0" + (HASH_PREFIX + render_hash(directions, moves)).encode("ascii")
+
+    def write(fp):
+        fp.write(b"\x89PNG\r\n\x1a\n")
+        sequence = 0
+        for index, (frame, (x, y)) in enumerate(iter_frames(positions, size)):
+            chunks = list(png_chunks(frame))
+            if index == 0:
+                # The first frame covers the canvas, so its header and palette are the animation's
+                header = dict(chunks)
+                fp.write(png_chunk(b"IHDR", header[b"IHDR"]))
+                fp.write(png_chunk(b"acTL", struct.pack(">II", len(positions) - 1, 0)))
+                fp.write(png_chunk(b"PLTE", header[b"PLTE"]))
+                fp.write(png_chunk(b"tEXt", comment))
+            # Dispose none, blend source: the cropped frame replaces its region
+            fp.write(png_chunk(b"fcTL", struct.pack(">IIIIIHHBB", sequence, frame.width, frame.height,
+                                                     x, y, frame_duration, 1000, 0, 0)))
+            sequence += 1
+            for kind, data in chunks:
+                if kind != b"IDAT":
+                    continue
+                if index == 0:
+                    fp.write(png_chunk(b"IDAT", data))
+                else:
+                    fp.write(png_chunk(b"fdAT", struct.pack(">I", sequence) + data))
+                    sequence += 1
+        fp.write(png_chunk(b"IEND", b""))
+
+    with span("draw + encode apng", "encode", name=name):
+        write_atomic(out_path, write)
+    return out_path
+
+def svg_document(positions, size, digest):
+    """An SVG animation of the walk: one path with a segment per step, revealed step by step.
+
+    The path is drawn with a single dash as long as the whole path, and a discrete
+    stroke-dashoffset animation uncovers one more segment per frame; the marker
+    jumps along the same positions. Both animations share one duration, so they
+    stay in step on every loop.
+    """
+    pts = [tuple(p) for p in positions]
+    deltas = [(x1 - x0, y1 - y0) for (x0, y0), (x1, y1) in zip(pts, pts[1:])]
+    shown = list(itertools.accumulate(math.hypot(dx, dy) for dx, dy in deltas))
+    total = shown[-1]
+    path = f"M{pts[0][0]:g} {pts[0][1]:g}" + "".join(f"l{dx:g} {dy:g}" for dx, dy in deltas)
+    offsets = ";".join(f"{total - v:.1f}" for v in shown)
+    marker = ";".join(f"{x:g},{y:g}" for x, y in pts[1:])
+    duration = f"{len(deltas) * frame_duration}ms"
+    width, height = size
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">\n'
+        f'<!-- {HASH_PREFIX}{digest} -->\n'
+        f'<rect width="100%" height="100%" fill="#fff"/>\n'
+        f'<path d="{path}" fill="none" stroke="#00f" stroke-width="{line_width}" '
+        f'stroke-dasharray="{total:.1f} {total:.1f}" stroke-dashoffset="{total - shown[0]:.1f}">'
+        f'<animate attributeName="stroke-dashoffset" values="{offsets}" dur="{duration}" '
+        f'calcMode="discrete" repeatCount="indefinite"/></path>\n'
+        f'<circle r="{marker_radius}" fill="#f00" transform="translate({pts[1][0]:g} {pts[1][1]:g})">'
+        f'<animateTransform attributeName="transform" type="translate" values="{marker}" dur="{duration}" '
+        f'calcMode="discrete" repeatCount="indefinite"/></circle>\n'
+        f'</svg>\n'
+    )
+
+def generate_svg(name, directions, out_dir=None, moves=None):
+    out_path, positions, size = prepare_render(name, directions, out_dir, moves, "svg")
+    if len(positions) < 2:
+        return None
+    with span("encode svg", "encode", name=name):
+        text = svg_document(positions, size, render_hash(directions, moves))
+        write_atomic(out_path, lambda fp: fp.write(text.encode("ascii")))
+    return out_path
+
+GENERATORS = {"gif": generate_gif, "webp": generate_webp, "apng": generate_apng, "svg": generate_svg}
+
+def render_pattern(name, directions, out_dir=None, force=False, moves=None, fmt="svg"):
+    """Render a pattern unless its file already matches the current content hash.
+
+    Returns (path, rendered); path is None if the walk has no step to animate.
+    """
+    out_path = Path(out_dir or output_dir) / f"{name}{FORMATS[fmt]}"
+    with span("cache check", "io", name=name):
+        cached = not force and cached_hash(out_path) == render_hash(directions, moves)
+    if cached:
+        return out_path, False
+    out_path = GENERATORS[fmt](name, directions, out_dir, moves)
+    return out_path, out_path is not None
+
+def render_traced(*job):
+    """render_pattern in a pool worker; returns its result and the worker's spans for the parent."""
+    spans.drain()  # events a forked worker inherited from the parent
+    return render_pattern(*job), spans.drain()
+
+def copy_render(src, name, directions, out_dir=None, force=False, moves=None):
+    """Place an already rendered file at another output path (same content hash and format)."""
+    out_path = Path(out_dir or output_dir) / f"{name}{Path(src).suffix}"
+    if not force and cached_hash(out_path) == render_hash(directions, moves):
+        return out_path, False
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(src, "rb") as f, span("copy render", "io", name=name):
+        write_atomic(out_path, lambda fp: shutil.copyfileobj(f, fp))
+    return out_path, True
+
+def sheet_hash(jobs):
+    payload = json.dumps([[name, render_hash(directions, moves)] for name, directions, _, moves in jobs],
+                         separators=(",", ":"))
+    return hashlib.sha256(f"{sheet_tile},{sheet_columns},{payload}".encode("utf-8")).hexdigest()
+
+def write_contact_sheet(jobs, out_path=None, force=False):
+    """Tile the final frame of every job into one PNG with the pattern names. Returns (path, rendered)."""
+    out_path = Path(out_path or output_dir / sheet_name)
+    digest = sheet_hash(jobs)
+    if not force and cached_hash(out_path) == digest:
+        return out_path, False
+
+    columns = min(sheet_columns, max(len(jobs), 1))
+    rows = -(-len(jobs) // columns)
+    sheet = Image.new("RGB", (columns * sheet_tile, rows * (sheet_tile + sheet_label_height)), "white")
+    draw = ImageDraw.Draw(sheet)
+    for index, (name, directions, _, moves) in enumerate(jobs):
+        with span("draw tile", "render", name=name):
+            tile = final_frame(directions, moves).convert("RGB")
+        tile.thumbnail((sheet_tile, sheet_tile), Image.Resampling.LANCZOS)
+        x = (index % columns) * sheet_tile
+        y = (index // columns) * (sheet_tile + sheet_label_height)
+        sheet.paste(tile, (x + (sheet_tile - tile.width) // 2, y + (sheet_tile - tile.height) // 2))
+        draw.text((x + sheet_tile // 2, y + sheet_tile + sheet_label_height // 2), name, fill="black", anchor="mm")
+
+    info = PngImagePlugin.PngInfo()
+    info.add_text("comment", HASH_PREFIX + digest)
+    # Few colors: quantizing to a small palette keeps the sheet compact
+    sheet = sheet.quantize(colors=16)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with span("encode contact sheet", "encode"):
+        write_atomic(out_path, lambda fp: sheet.save(fp, format="PNG", optimize=True, pnginfo=info))
+    return out_path, True
+
+def collect_jobs(all_versions=False):
+    """Return render jobs as (name, directions, out_dir, moves) tuples in README order.
+
+    The latest QWERTY suite always comes first and renders into output_dir.
+    With all_versions, every suite version of both layouts is added, each into
+    its own subdirectory.
+    """
+    jobs = []
+    latest = find_latest_pattern_file()
+    if latest:
+        jobs.extend(suite_jobs(latest, output_dir, move_map))
+    if all_versions:
+        for layout_dir, moves, base in ((pattern_dir, move_map, output_dir),
+                                        (pattern_dir / "AZERTY", azerty_move_map, output_dir / "AZERTY")):
+            for suite in find_all_pattern_files(layout_dir):
+                jobs.extend(suite_jobs(suite, base / suite.stem, moves))
+    return jobs
+
+def suite_jobs(json_file, out_dir, moves):
+    with span("load suite", "parse", path=str(json_file)):
+        suite = load_suite(json_file)
+    return [(name.strip("_"), pattern, out_dir, moves) for name, pattern in suite.items()]
+
+def run_jobs(jobs, workers=1, force=False, fmt="svg"):
+    """Render jobs, optionally across a process pool. Results keep the order of jobs.
+
+    Jobs with identical content are rendered once and copied to the other paths.
+    """
+    first_by_hash = {}
+    for index, (_, directions, _, moves) in enumerate(jobs):
+        first_by_hash.setdefault(render_hash(directions, moves), index)
+    unique = sorted(first_by_hash.values())
+
+    results = [None] * len(jobs)
+    if workers > 1 and len(unique) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(unique))) as pool:
+            futures = {i: pool.submit(render_traced, jobs[i][0], jobs[i][1], jobs[i][2], force, jobs[i][3], fmt) for i in unique}
+            for i, future in futures.items():
+                results[i], events = future.result()
+                spans.extend(events)
+    else:
+        for i in unique:
+            results[i] = render_pattern(jobs[i][0], jobs[i][1], jobs[i][2], force, jobs[i][3], fmt)
+
+    for index, (name, directions, out_dir, moves) in enumerate(jobs):
+        if results[index] is None:
+            src, _ = results[first_by_hash[render_hash(directions, moves)]]
+            results[index] = copy_render(src, name, directions, out_dir, force, moves) if src else (None, False)
+    return results
+
+def write_readme(output_paths, sheet=None):
+    """Write Pattern_Suite/README.md listing (name, render path) pairs; skipped if unchanged.
+
+    Pairs without a render (path None) are left out. A contact sheet, if given,
+    is shown above the individual renders.
+    """
+    lines = ["# Pattern Visualizations\n\n"]
+    if sheet:
+        rel_path = "/" + str(sheet).replace("\\", "/")
+        lines.append(f"![All patterns]({rel_path})\n\n")
+    for name, path in output_paths:
+        if path is None:
+            continue
+        rel_path = "/" + str(path).replace("\\", "/")
+        lines.append(f"### `{name}`\n\n")
+        lines.append(f"![{name}]({rel_path})\n\n")
+    text = "".join(lines)
 
-    # Generate README
     readme_path = pattern_dir / "README.md"
+    if readme_path.exists() and readme_path.read_text() == text:
+        return False
     with open(readme_path, "w") as readme:
-        readme.write("# Pattern Visualizations\n\n")
-        for name, path in output_paths:
-            rel_path = "/" + str(path).replace("\\", "/")
-            readme.write(f"### `{name}`\n\n")
-            readme.write(f"![{name}]({rel_path})\n\n")
+        readme.write(text)
+    return True
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Render pattern suite walks as animations (SVG by default).")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="number of render processes (1 renders in-process; default: CPU count)")
+    parser.add_argument("--all-versions", action="store_true",
+                        help="also render every suite version and the AZERTY copies into subdirectories")
+    parser.add_argument("--force", action="store_true", help="re-render even if the cached hash matches")
+    parser.add_argument("--format", choices=list(FORMATS), default="svg",
+                        help="animation format: gif, lossless webp, apng or an animated svg (default: svg)")
+    parser.add_argument("--contact-sheet", action="store_true",
+                        help=f"also tile the final frame of every latest pattern into {sheet_name} and show it in the README")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    with span("vizualize_paths"):
+        return run(args)
+
+def run(args):
+    jobs = collect_jobs(args.all_versions)
+    if not jobs:
+        print("No valid pattern suite file found.")
+        return
+
+    results = run_jobs(jobs, args.workers, args.force, args.format)
+    for job, (out_path, rendered) in zip(jobs, results):
+        if out_path is None:
+            print(f"Skipped (no step to animate): {job[0]}")
+        else:
+            print(f"{'Rendered' if rendered else 'Unchanged'}: {out_path}")
+
+    # Only the latest suite is listed in the README, in file order
+    latest = [(job, path) for job, (path, _) in zip(jobs, results) if job[2] == output_dir]
+    output_paths = [(job[0], path) for job, path in latest]
+
+    sheet = None
+    if args.contact_sheet:
+        sheet, rendered = write_contact_sheet([job for job, _ in latest])
+        print(f"{'Rendered' if rendered else 'Unchanged'}: {sheet}")
 
-    print("GIFs and README generated successfully.")
+    with span("write README", "io"):
+        write_readme(output_paths, sheet)
+    print(f"{args.format.upper()}s and README generated successfully.")
 
 if __name__ == "__main__":
     main()
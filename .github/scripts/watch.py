@@ -0,0 +1,290 @@
+"""Watch KC-Config-Suite and README.md and rerun only the affected stages.
+
+    python .github/scripts/watch.py [--poll] [--debounce 0.15]
+
+File events come from inotify (through ctypes, Linux only) or, elsewhere or
+with --poll, from an mtime/size scan. Events are collected until the tree
+has been quiet for the debounce interval, then every changed file runs its
+own stages:
+
+    Pattern_Suite/*.json         re-sync its AZERTY twin, validate, and if it
+                                 is the latest suite re-render the patterns
+                                 whose render hash changed
+    Pattern_Suite/AZERTY/*.json  validate
+    dt*/...json configs          validate, refresh the config index
+    README.md                    stamp the shovel sections whose content changed
+
+Run from the repository root, like the other scripts.
+"""
+import argparse
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+config_dir = Path("KC-Config-Suite")
+pattern_dir = config_dir / "Pattern_Suite"
+azerty_dir = pattern_dir / "AZERTY"
+readme = Path("README.md")
+
+default_debounce = 0.15
+default_poll_interval = 0.5
+
+# inotify(7) constants
+IN_CLOSE_WRITE = 0x8
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_Q_OVERFLOW = 0x4000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct("iIII")
+
+# Returned instead of paths when events were lost and everything must be rechecked
+RESCAN = object()
+
+def is_relevant(path):
+    path = Path(path)
+    return path == readme or (path.suffix == ".json" and config_dir in path.parents)
+
+class InotifyWatcher:
+    """Recursive inotify watch on directories, reporting relevant changed files."""
+
+    def __init__(self, directories, files=()):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._libc = libc
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs = {}
+        for directory in directories:
+            self.add_tree(Path(directory))
+        # Single files are watched through their directory (editors replace files on save)
+        for f in files:
+            self.add(Path(f).parent)
+
+    def add(self, directory):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+        self.dirs[wd] = Path(os.path.relpath(directory))
+
+    def add_tree(self, root):
+        self.add(root)
+        for sub in sorted(p for p in root.rglob("*") if p.is_dir()):
+            self.add(sub)
+
+    def fileno(self):
+        return self.fd
+
+    def read(self):
+        """Drain pending events. Returns a set of changed paths, or RESCAN."""
+        changed = set()
+        while True:
+            try:
+                buf = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            pos = 0
+            while pos < len(buf):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(buf, pos)
+                name = buf[pos + EVENT_HEADER.size:pos + EVENT_HEADER.size + length].rstrip(b"\0")
+                pos += EVENT_HEADER.size + length
+                if mask & IN_Q_OVERFLOW:
+                    return RESCAN
+                if wd not in self.dirs:
+                    continue
+                path = self.dirs[wd] / os.fsdecode(name)
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        # New directory: watch it and pick up files written before the watch existed
+                        self.add_tree(path)
+                        changed.update(path.rglob("*.json"))
+                    continue
+                if is_relevant(path):
+                    changed.add(path)
+
+    def close(self):
+        os.close(self.fd)
+
+class PollingWatcher:
+    """Fallback watcher comparing (mtime, size) snapshots."""
+
+    def __init__(self, directories, files=()):
+        self.directories = [Path(d) for d in directories]
+        self.files = [Path(f) for f in files]
+        self.snapshot = self.scan()
+
+    def scan(self):
+        state = {}
+        paths = [p for d in self.directories for p in d.rglob("*.json")] + [f for f in self.files if f.exists()]
+        for path in paths:
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            state[path] = (stat.st_mtime_ns, stat.st_size)
+        return state
+
+    def read(self):
+        current = self.scan()
+        changed = {p for p, s in current.items() if self.snapshot.get(p) != s}
+        changed |= set(self.snapshot) - set(current)
+        self.snapshot = current
+        return changed
+
+    def close(self):
+        pass
+
+def make_watcher(poll=False):
+    directories, files = [config_dir], [readme]
+    if not poll and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(directories, files)
+        except (OSError, AttributeError) as e:
+            print(f"inotify unavailable ({e}); polling instead.")
+    return PollingWatcher(directories, files)
+
+class Pipeline:
+    """The per-file stages. Modules are imported once, up front, so each change is handled quickly."""
+
+    def __init__(self, render=True):
+        import sync_azerty_patterns
+        import update_shovel_timestamps
+        import validate_jsons
+        from layouts import get_layout
+
+        self.sync = sync_azerty_patterns
+        self.timestamps = update_shovel_timestamps
+        self.validate = validate_jsons
+        self.azerty = get_layout("azerty")
+        self.render = None
+        if render:
+            import vizualize_paths
+            self.render = vizualize_paths
+        self.readme_text = readme.read_text(encoding="utf-8") if readme.exists() else None
+
+    def handle(self, changed):
+        """Run the stages for a batch of changed paths (or RESCAN)."""
+        if changed is RESCAN:
+            changed = set(config_dir.rglob("*.json")) | {readme}
+        start = time.perf_counter()
+        to_validate = set()
+        configs_changed = False
+        latest_changed = False
+        latest = self.render.find_latest_pattern_file() if self.render else None
+
+        for path in sorted(changed):
+            if path == readme:
+                self.stamp_readme()
+            elif path.parent == pattern_dir:
+                twin = azerty_dir / path.name
+                if path.exists():
+                    self.sync.sync_file(self.azerty, path, twin)
+                    to_validate.update({path, twin})
+                    latest_changed |= latest is not None and path == latest
+                elif twin.exists():
+                    twin.unlink()
+                    print(f"Deleted orphan AZERTY file: {twin}")
+            elif path.exists():
+                to_validate.add(path)
+                configs_changed |= pattern_dir not in path.parents
+            else:
+                configs_changed |= pattern_dir not in path.parents
+
+        if to_validate:
+            report = self.validate.validate_files(sorted(p.as_posix() for p in to_validate), workers=1)
+            for error in report["errors"]:
+                print(f"❌ {error['file']}{'#' + error['pointer'] if error['pointer'] else ''}: {error['message']}")
+        if configs_changed:
+            import config_index
+            index, reparsed = config_index.open_index()
+            print(f"Config index: {len(index.rows)} configs ({reparsed} re-parsed).")
+        if latest_changed:
+            self.render_latest(latest)
+        print(f"Handled {len(changed)} change(s) in {1000 * (time.perf_counter() - start):.0f} ms.")
+
+    def render_latest(self, latest):
+        """Re-render the latest suite; patterns whose render hash is unchanged are skipped."""
+        viz = self.render
+        jobs = viz.suite_jobs(latest, viz.output_dir, viz.move_map)
+        results = viz.run_jobs(jobs, workers=1)
+        for path, rendered in results:
+            if rendered:
+                print(f"Rendered: {path}")
+        viz.write_readme([(job[0], path) for job, (path, _) in zip(jobs, results)])
+
+    def stamp_readme(self):
+        if not readme.exists():
+            return
+        text = readme.read_text(encoding="utf-8")
+        if text == self.readme_text:
+            return
+        ts = self.timestamps
+        lines = text.splitlines()
+        edited = ts.edited_sections((self.readme_text or "").splitlines(), lines)
+        if edited:
+            sections, _ = ts.parse_sections(lines)
+            new_text = "\n".join(ts.apply_timestamps(lines, sections, edited, date.today().isoformat())) + "\n"
+            if new_text != text:
+                readme.write_text(new_text, encoding="utf-8")
+                text = new_text
+                print(f"Stamped README sections: {', '.join(sorted(edited))}")
+        # Our own write comes back as one more event; with the snapshot updated it is a no-op
+        self.readme_text = text
+
+def watch(pipeline, watcher, debounce=default_debounce, poll_interval=default_poll_interval):
+    """Event loop: gather changes until quiet for `debounce` seconds, then handle them."""
+    pending = set()
+    last_event = None
+    polling = isinstance(watcher, PollingWatcher)
+    while True:
+        if polling:
+            time.sleep(debounce if pending else poll_interval)
+            ready = True
+        else:
+            timeout = None if not pending else max(0.0, debounce - (time.monotonic() - last_event))
+            ready = bool(select.select([watcher], [], [], timeout)[0])
+        if ready:
+            changed = watcher.read()
+            if changed is RESCAN:
+                pending = RESCAN
+                last_event = time.monotonic()
+            elif changed:
+                if pending is not RESCAN:
+                    pending |= changed
+                last_event = time.monotonic()
+        if pending and time.monotonic() - last_event >= debounce:
+            batch, pending = pending, set()
+            try:
+                pipeline.handle(batch)
+            except Exception as e:  # keep watching after a bad edit, e.g. half-written JSON
+                print(f"✖ {type(e).__name__}: {e}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-sync, validate, render and timestamp on file changes.")
+    parser.add_argument("--poll", action="store_true", help="poll instead of using inotify")
+    parser.add_argument("--debounce", type=float, default=default_debounce, help="quiet time in seconds before acting")
+    parser.add_argument("--poll-interval", type=float, default=default_poll_interval)
+    parser.add_argument("--no-render", action="store_true", help="skip SVG rendering")
+    args = parser.parse_args(argv)
+
+    pipeline = Pipeline(render=not args.no_render)
+    watcher = make_watcher(args.poll)
+    print(f"Watching {config_dir} and {readme} ({type(watcher).__name__}). Ctrl+C to stop.")
+    try:
+        watch(pipeline, watcher, args.debounce, args.poll_interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,294 @@
+"""
+Monte Carlo simulator for the dig tool's detection timing parameters.
+
+Estimates how often a config's click lands while the moving line is inside
+the target zone, and how far off the click timing is, without live testing.
+
+Model, per trial (one pass of the line over the zone):
+    * the line moves at a constant `speed` px/s drawn from a distribution,
+      and the zone width in px is drawn from another; time 0 is the moment the
+      line crosses the zone center,
+    * the screen is captured every 1 / `screenshot_fps` s and the detection
+      loop ticks every 1 / `target_fps` s, both at random phases; each tick
+      looks at the latest capture,
+    * zones narrower than `zone_min_width` px or wider than
+      `max_zone_width_percent` of the game area are not detected,
+    * the bot clicks on the first tick whose capture puts the line inside the
+      sweet spot (`sweet_spot_width_percent` of the zone, centered). With
+      `prediction_enabled` it tests the position extrapolated by
+      `system_latency` ms instead, using a velocity estimate with relative
+      error `velocity_noise`,
+    * the click registers after the true input latency (`latency` ms plus
+      normal `latency_jitter`, at least 0) and hits if the line is still
+      inside the zone then,
+    * a tick at least `post_click_blindness` ms after the click that still
+      sees the line in the sweet spot counts as a repeat click.
+
+Each trial is solved in closed form on the capture and tick grids, so a
+whole parameter grid is one set of (grid points, trials) NumPy operations.
+Every grid point sees the same trials (common random numbers), so
+differences between settings are not sampling noise. Chunks of the grid run
+across processes with `--workers`.
+
+The speed, zone width and latency defaults are rough placeholders; calibrate
+them from recordings of the minigame and of the input latency on the target
+machine (`--speed`, `--zone-width`, `--latency`).
+
+Usage:
+    python assets/scripts/detection_simulator.py                      # rank every KC-Config-Suite config
+    python assets/scripts/detection_simulator.py CONFIG --grid target_fps=60,120,240 --grid sweet_spot_width_percent=5:30:5
+"""
+import argparse
+import json
+import math
+import sys
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from throughput_simulator import parse_values
+
+config_dir = Path("KC-Config-Suite")
+
+# Detection params and the values assumed when a config does not set them
+DEFAULTS = {
+    "target_fps": 120.0,
+    "screenshot_fps": 0.0,  # 0: same as target_fps
+    "system_latency": 0.0,
+    "sweet_spot_width_percent": 10.0,
+    "prediction_enabled": 0.0,
+    "post_click_blindness": 0.0,
+    "zone_min_width": 0.0,
+    "max_zone_width_percent": 100.0,
+}
+PARAMS = tuple(DEFAULTS)
+default_game_width = 815.0
+
+# Environment assumptions, see the module docstring
+default_speed = "lognormal:600,0.35"
+default_zone_width = "uniform:80,400"
+default_latency = 20.0
+default_latency_jitter = 4.0
+default_velocity_noise = 0.05
+default_trials = 20_000
+# Grid points x trials evaluated per array operation
+chunk_cells = 2_000_000
+
+def load_params(config_path):
+    """Read the detection params and game area width from a dig-tool config."""
+    with open(config_path, "r", encoding="utf-8-sig") as f:
+        data = json.load(f)
+    params = data.get("params", {})
+    result = {}
+    for name, default in DEFAULTS.items():
+        value = params.get(name, default)
+        try:
+            result[name] = float(value)
+        except (TypeError, ValueError):
+            result[name] = default
+    area = data.get("game_area")
+    result["game_width"] = float(area[2] - area[0]) if isinstance(area, list) and len(area) == 4 else default_game_width
+    return result
+
+def parse_distribution(spec):
+    """Parse "fixed:V", "uniform:LO,HI" or "lognormal:MEDIAN,SIGMA" into (kind, a, b)."""
+    kind, _, values = spec.partition(":")
+    numbers = [float(v) for v in values.split(",") if v.strip()]
+    expected = {"fixed": 1, "uniform": 2, "lognormal": 2}
+    if kind not in expected or len(numbers) != expected[kind]:
+        raise ValueError(f"distribution must be fixed:V, uniform:LO,HI or lognormal:MEDIAN,SIGMA, not {spec!r}")
+    return (kind, numbers[0], numbers[1] if len(numbers) > 1 else 0.0)
+
+def sample(rng, distribution, n):
+    kind, a, b = distribution
+    if kind == "fixed":
+        return np.full(n, a)
+    if kind == "uniform":
+        return rng.uniform(a, b, n)
+    return a * np.exp(b * rng.standard_normal(n))
+
+def make_trials(n, seed=0, speed=default_speed, zone_width=default_zone_width, latency=default_latency,
+                latency_jitter=default_latency_jitter, velocity_noise=default_velocity_noise):
+    """The random part of n passes, shared by every grid point."""
+    rng = np.random.default_rng(seed)
+    return {
+        "speed": np.maximum(sample(rng, parse_distribution(speed), n), 1e-6),
+        "zone_width": np.maximum(sample(rng, parse_distribution(zone_width), n), 0.0),
+        "capture_phase": rng.random(n),
+        "tick_phase": rng.random(n),
+        "latency": np.maximum(latency + latency_jitter * rng.standard_normal(n), 0.0) / 1000.0,
+        "velocity_error": velocity_noise * rng.standard_normal(n),
+    }
+
+def next_on_grid(t, period, phase):
+    """First time >= t on the grid (k + phase) * period."""
+    return (np.ceil(t / period - phase) + phase) * period
+
+def last_on_grid(t, period, phase):
+    """Last time <= t on the grid (k + phase) * period."""
+    return (np.floor(t / period - phase) + phase) * period
+
+def simulate(grid, trials):
+    """Outcomes for every (grid point, trial) pair.
+
+    grid maps each name in PARAMS (plus game_width) to a 1-D array of G
+    values. Returns (G, N) arrays: clicked, hit, repeat (booleans) and
+    error_ms (click registration time minus the zone center crossing, NaN
+    where no click).
+    """
+    column = {name: np.asarray(grid[name], dtype=np.float64)[:, None] for name in (*PARAMS, "game_width")}
+    v = trials["speed"][None, :]
+    width = trials["zone_width"][None, :]
+    tick = 1.0 / column["target_fps"]
+    capture = 1.0 / np.where(column["screenshot_fps"] > 0, column["screenshot_fps"], column["target_fps"])
+
+    detected = (width >= column["zone_min_width"]) & (width <= column["max_zone_width_percent"] / 100.0 * column["game_width"])
+    half_sweet = column["sweet_spot_width_percent"] / 100.0 * width / 2.0
+    # With prediction, positions are tested system_latency ahead with the estimated velocity
+    lead = np.where(column["prediction_enabled"] > 0,
+                    v * (1.0 + trials["velocity_error"][None, :]) * column["system_latency"] / 1000.0, 0.0)
+    # Captures in [enter, leave] show the (predicted) line inside the sweet spot
+    enter = (-half_sweet - lead) / v
+    leave = (half_sweet - lead) / v
+
+    first_capture = next_on_grid(enter, capture, trials["capture_phase"][None, :])
+    decided = next_on_grid(first_capture, tick, trials["tick_phase"][None, :])
+    seen = last_on_grid(decided, capture, trials["capture_phase"][None, :])
+    clicked = detected & (first_capture <= leave) & (seen <= leave)
+
+    registered = decided + trials["latency"][None, :]
+    hit = clicked & (np.abs(v * registered) <= width / 2.0)
+    error_ms = np.where(clicked, 1000.0 * registered, np.nan)
+
+    blind = np.maximum(column["post_click_blindness"] / 1000.0, 1e-6 * tick)
+    again = next_on_grid(decided + blind, tick, trials["tick_phase"][None, :])
+    repeat = clicked & (last_on_grid(again, capture, trials["capture_phase"][None, :]) <= leave)
+    return {"clicked": clicked, "hit": hit, "repeat": repeat, "error_ms": error_ms}
+
+def summarize(outcome):
+    """Per grid point: rates and the click timing error distribution in ms."""
+    error = outcome["error_ms"]
+    clicks = outcome["clicked"].sum(axis=1)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # grid points without a single click
+        p5, p50, p95 = np.nanpercentile(error, [5, 50, 95], axis=1)
+        mean = np.nanmean(error, axis=1)
+        std = np.nanstd(error, axis=1)
+        abs_p95 = np.nanpercentile(np.abs(error), 95, axis=1)
+    return {
+        "hit_rate": outcome["hit"].mean(axis=1),
+        "click_rate": clicks / error.shape[1],
+        "repeat_rate": outcome["repeat"].mean(axis=1),
+        "error_mean_ms": mean, "error_std_ms": std,
+        "error_p5_ms": p5, "error_p50_ms": p50, "error_p95_ms": p95, "abs_error_p95_ms": abs_p95,
+    }
+
+def evaluate_chunk(grid, trial_args):
+    trials = make_trials(**trial_args)
+    return summarize(simulate(grid, trials))
+
+def evaluate(grid, trial_args, workers=1):
+    """Summaries for every grid point, evaluated in chunks, optionally across processes."""
+    size = len(grid["target_fps"])
+    step = max(1, chunk_cells // trial_args["n"])
+    chunks = [{name: np.asarray(values)[i:i + step] for name, values in grid.items()} for i in range(0, size, step)]
+    if workers > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+            parts = list(pool.map(evaluate_chunk, chunks, [trial_args] * len(chunks)))
+    else:
+        parts = [evaluate_chunk(chunk, trial_args) for chunk in chunks]
+    return {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+
+def expand_grid(base, axes):
+    """Cartesian product of axes ({name: values}) over the base params, as {name: 1-D array}."""
+    names = list(axes)
+    mesh = np.meshgrid(*[np.asarray(axes[n], dtype=np.float64) for n in names], indexing="ij") if names else []
+    size = mesh[0].size if names else 1
+    grid = {name: np.full(size, float(value)) for name, value in base.items()}
+    for name, values in zip(names, mesh):
+        grid[name] = values.reshape(-1)
+    return grid
+
+def parse_axis(text):
+    name, sep, values = text.partition("=")
+    name = name.strip()
+    if not sep or name not in PARAMS:
+        raise ValueError(f"--grid takes NAME=VALUES with NAME one of {', '.join(PARAMS)}, not {text!r}")
+    return name, parse_values(values.strip())
+
+def suite_configs():
+    return sorted(p for p in config_dir.glob("dt*/*.json") if p.name.startswith("KC"))
+
+def print_table(rows, columns):
+    print("  ".join(f"{title:>{width}}" for title, width, _ in columns))
+    for row in rows:
+        print("  ".join(fmt(row) for _, _, fmt in columns))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate hit rate and click timing of dig-tool detection params.")
+    parser.add_argument("configs", nargs="*", help="dig-tool configs (default: every KC-Config-Suite config)")
+    parser.add_argument("--grid", action="append", default=[], metavar="NAME=VALUES",
+                        help="sweep a param over 'a,b' or 'start:stop:step' around the first config (repeatable)")
+    parser.add_argument("--trials", type=int, default=default_trials)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--speed", default=default_speed, help="line speed in px/s (default: %(default)s)")
+    parser.add_argument("--zone-width", default=default_zone_width, help="zone width in px (default: %(default)s)")
+    parser.add_argument("--latency", type=float, default=default_latency, help="true click latency in ms (default: %(default)s)")
+    parser.add_argument("--latency-jitter", type=float, default=default_latency_jitter, help="its standard deviation in ms")
+    parser.add_argument("--velocity-noise", type=float, default=default_velocity_noise,
+                        help="relative error of the velocity estimate used for prediction")
+    parser.add_argument("--workers", type=int, default=1, help="processes for large grids")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--output", help="write the results as JSON")
+    args = parser.parse_args(argv)
+
+    trial_args = {"n": args.trials, "seed": args.seed, "speed": args.speed, "zone_width": args.zone_width,
+                  "latency": args.latency, "latency_jitter": args.latency_jitter, "velocity_noise": args.velocity_noise}
+    try:
+        make_trials(1, **{k: v for k, v in trial_args.items() if k != "n"})
+        axes = dict(parse_axis(text) for text in args.grid)
+        paths = [Path(p) for p in args.configs] or suite_configs()
+        configs = [(p, load_params(p)) for p in paths]
+    except (OSError, ValueError) as e:
+        print(f"✖ {e}")
+        return 1
+    if not configs and not axes:
+        print("✖ No configs found; pass config files or --grid")
+        return 1
+
+    if axes:
+        base = configs[0][1] if configs else {**DEFAULTS, "game_width": default_game_width}
+        grid = expand_grid(base, axes)
+        labels = [", ".join(f"{n}={grid[n][i]:g}" for n in axes) for i in range(len(grid["target_fps"]))]
+        print(f"Grid around {configs[0][0].name if configs else 'the defaults'}: {len(labels)} points x {args.trials} trials")
+    else:
+        grid = {name: np.array([params[name] for _, params in configs]) for name in (*PARAMS, "game_width")}
+        labels = [path.name for path, _ in configs]
+    summary = evaluate(grid, trial_args, args.workers)
+
+    # Rank by hit rate, then by how tight the timing is
+    order = np.lexsort((np.nan_to_num(summary["abs_error_p95_ms"], nan=np.inf), -summary["hit_rate"]))
+    shown = order[:args.top] if axes else order
+    width = max(len(labels[i]) for i in shown)
+    print_table([(labels[i], i) for i in shown], [
+        ("setting" if axes else "config", width, lambda r: f"{r[0]:<{width}}"),
+        ("hit %", 6, lambda r: f"{100 * summary['hit_rate'][r[1]]:6.1f}"),
+        ("click %", 7, lambda r: f"{100 * summary['click_rate'][r[1]]:7.1f}"),
+        ("repeat %", 8, lambda r: f"{100 * summary['repeat_rate'][r[1]]:8.1f}"),
+        ("err mean", 8, lambda r: f"{summary['error_mean_ms'][r[1]]:8.1f}"),
+        ("err p5", 7, lambda r: f"{summary['error_p5_ms'][r[1]]:7.1f}"),
+        ("err p95", 7, lambda r: f"{summary['error_p95_ms'][r[1]]:7.1f}"),
+    ])
+    print("Errors are ms from the zone center crossing to the click registering (negative: early).")
+
+    if args.output:
+        results = [{"label": labels[i], "params": {n: float(grid[n][i]) for n in (*PARAMS, "game_width")},
+                    **{k: None if math.isnan(v[i]) else float(v[i]) for k, v in summary.items()}} for i in order]
+        Path(args.output).write_text(json.dumps({"trials": trial_args, "results": results}, indent=2), encoding="utf-8")
+        print(f"Results written to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
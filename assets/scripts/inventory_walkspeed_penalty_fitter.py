@@ -30,20 +30,32 @@ The script performs the following steps:
     * Includes overflow protection for very large exponents.
 3.  **Hardcoded Override**:
     * After fitting, y-values for 35 < x ≤ 50 are manually overridden to 0.30.
-4.  **Parameter Initialization**: Uses defined initial guesses (`p0`) and parameter bounds.
-5.  **Curve Fitting**: Uses `scipy.optimize.curve_fit` to fit the model to the data.
+4.  **Multi-Start Fitting**: Every model family is fitted from a grid of initial guesses
+    (`p0`) within its parameter bounds, optionally across a process pool (`--workers`).
+    Each family supplies an analytic Jacobian to `scipy.optimize.curve_fit`. The three
+    exponential family is also started from the two-exponential optimum it contains, so it
+    never fits worse than that.
+5.  **Model Selection**: One, two and three exponential models plus a piecewise model
+    (two exponentials anchored at the end of the 30% plateau) are compared by SSE and
+    AIC, and the best one is selected (`--criterion`).
 6.  **Results Output**:
-    * Prints optimal parameters and Sum of Squared Errors (SSE).
-    * Outputs the equation in LaTeX using a piecewise format.
-7.  **Plotting**:
-    * Shows the overall fit and individual exponential decay components.
-8.  **Error Handling**: Catches `RuntimeError` and `ValueError` during the fitting process.
+    * Prints optimal parameters, SSE and AIC per family.
+    * Outputs the two-exponential equation in LaTeX using a piecewise format.
+    * Writes all results as JSON with `--output`.
+7.  **Plotting**: `--plot FILE` saves the overall fit and the component breakdown without
+    opening a window; `--show` opens them interactively instead.
+8.  **Error Handling**: Starts that raise `RuntimeError` or `ValueError` are counted as failed.
 
-------------------------------------------------------------
-Output:
+Usage:
+    python inventory_walkspeed_penalty_fitter.py [--data FILE ...] [--output results.json]
+                                                 [--plot fit.png] [--workers N]
+
+`--data` takes CSV (item count, penalty) or JSON ({"x": [...], "y": [...]}) files and may be
+given several times; without it the built-in data below is fitted. The module can also be
+imported: `fit_dataset(x, y)` returns the same results without printing or plotting.
 
-Attempting fit with Sum of Two Exponentials. Initial Guesses: [1.0, 0.8, 0.025, 0.00015]
-Parameter Bounds: Lower [0.98, 0.001, 0.001, 1e-05], Upper [1.05, 0.99, 0.1, 0.005]
+------------------------------------------------------------
+Output (two-exponential family):
 
 --- Optimized Fit Results (Sum of Two Exponentials) ---
 Optimal Parameters (A, B1, C1, C2): 0.9900, 0.6065, 0.0388, 0.005000
@@ -61,55 +73,213 @@ $$
 ------------------------------------------------------------
 QuickLaTex image: https://quicklatex.com/cache3/8c/ql_54151c90a51416cb26ffa36bcdc5d88c_l3.png
 """
+import argparse
+import csv
+import itertools
+import json
+import math
+import sys
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.optimize import curve_fit
+from scipy.optimize import OptimizeWarning, curve_fit
+
+from walkspeed_penalty import plateau_end, plateau_penalty, sum_two_exponentials_constrained, x_start
+
+repo_root = Path(__file__).resolve().parents[2]
+sys.path.append(str(repo_root / ".github" / "scripts"))
+
+from spans import span
 
 # --- Input data compiled by Riri (https://github.com/AlinaWan). Attribution is not required, but it's appreciated if you found this useful.
 x_data = np.array([35, 36, 45, 50, 51, 52, 53, 54, 55, 56, 57, 58, 59, 60, 61, 62, 64, 65, 66, 67, 68, 70, 71, 73, 74, 76, 135, 138, 143, 149, 156, 163, 171, 181, 192, 202, 213, 226, 242, 261, 280, 321, 342, 369, 2076, 5026]) # Number of items in the player's inventory. The player can hold 35 items before their walkspeed is penalized. The penalty starts at 0.30. For accuracy and simplicity, we hard code the penalty for the values between 35 and 50 to 0.30 (see module docstring).
 y_target = np.array([0, 0.30, 0.30, 0.30, 0.31, 0.33, 0.34, 0.35, 0.36, 0.38, 0.39, 0.40, 0.41, 0.42, 0.43, 0.44, 0.45, 0.46, 0.47, 0.48, 0.49, 0.50, 0.51, 0.52, 0.53, 0.54, 0.74, 0.75, 0.76, 0.77, 0.78, 0.79, 0.80, 0.81, 0.82, 0.83, 0.84, 0.85, 0.86, 0.87, 0.88, 0.89, 0.90, 0.91, 0.98, 0.99]) # The walkspeed penalty as a decimal.
 
-x_start = 35
-
-# --- Custom Function: sum of 2 exponentials, constrained so y(35)=0
-def sum_two_exponentials_constrained(x, A, B1, C1, C2):
-    x = np.asarray(x)
-    x_shifted = np.maximum(x - x_start, 0)
+# --- Analytic Jacobian of sum_two_exponentials_constrained
+def sum_two_exponentials_jacobian(x, A, B1, C1, C2):
+    x_shifted = np.maximum(np.asarray(x, dtype=np.float64) - x_start, 0)
+    e1 = np.where(C1 * x_shifted > 700, 0.0, np.exp(-C1 * x_shifted))
+    e2 = np.where(C2 * x_shifted > 700, 0.0, np.exp(-C2 * x_shifted))
     B2 = A - B1
-    term1 = np.where(C1 * x_shifted > 700, 0.0, B1 * np.exp(-C1 * x_shifted))
-    term2 = np.where(C2 * x_shifted > 700, 0.0, B2 * np.exp(-C2 * x_shifted))
-    return A - term1 - term2
-
-# --- Initial Guess & Bounds
-p0 = [1.0, 0.8, 0.025, 0.00015]
-bounds = (
-    [0.98, 0.001, 0.001, 0.00001],
-    [1.05, 0.99, 0.1, 0.005]
-)
-
-print(f"Attempting fit with Sum of Two Exponentials. Initial Guesses: {p0}")
-print(f"Parameter Bounds: Lower {bounds[0]}, Upper {bounds[1]}")
-
-try:
-    params, _ = curve_fit(sum_two_exponentials_constrained, x_data, y_target, p0=p0, bounds=bounds, maxfev=5000)
-    A_opt, B1_opt, C1_opt, C2_opt = params
-    B2_opt = A_opt - B1_opt
+    return np.column_stack([1 - e2, e2 - e1, B1 * x_shifted * e1, B2 * x_shifted * e2])
+
+# --- Alternative model families, all constrained so y(35)=0
+def one_exponential(x, A, C):
+    x_shifted = np.maximum(np.asarray(x, dtype=np.float64) - x_start, 0)
+    return A * (1 - np.exp(-C * x_shifted))
+
+def one_exponential_jacobian(x, A, C):
+    x_shifted = np.maximum(np.asarray(x, dtype=np.float64) - x_start, 0)
+    e = np.exp(-C * x_shifted)
+    return np.column_stack([1 - e, A * x_shifted * e])
+
+def three_exponentials(x, A, B1, B2, C1, C2, C3):
+    x_shifted = np.maximum(np.asarray(x, dtype=np.float64) - x_start, 0)
+    e1, e2, e3 = (np.where(C * x_shifted > 700, 0.0, np.exp(-C * x_shifted)) for C in (C1, C2, C3))
+    B3 = A - B1 - B2
+    return A - B1 * e1 - B2 * e2 - B3 * e3
+
+def three_exponentials_jacobian(x, A, B1, B2, C1, C2, C3):
+    x_shifted = np.maximum(np.asarray(x, dtype=np.float64) - x_start, 0)
+    e1, e2, e3 = (np.where(C * x_shifted > 700, 0.0, np.exp(-C * x_shifted)) for C in (C1, C2, C3))
+    B3 = A - B1 - B2
+    return np.column_stack([1 - e3, e3 - e1, e3 - e2,
+                            B1 * x_shifted * e1, B2 * x_shifted * e2, B3 * x_shifted * e3])
+
+def two_in_three_exponentials(A, B1, C1, C2):
+    """three_exponentials parameters that give the same curve as two_exponentials (B2 = 0, C3 = C2).
+
+    The unused middle rate C2 is free; one seed per value below and between
+    the two fitted rates gives fits started there a gradient towards a third term.
+    """
+    return [[A, B1, 0.0, C1, C, C2] for C in (C2 / 2, math.sqrt(C1 * C2))]
+
+# Piecewise: two exponentials starting from the plateau value at x = 50, fitted on x > 50 only
+def plateau_two_exponentials(x, A, B, C1, C2):
+    x_shifted = np.maximum(np.asarray(x, dtype=np.float64) - plateau_end, 0)
+    rise = 1 - B * np.exp(-C1 * x_shifted) - (1 - B) * np.exp(-C2 * x_shifted)
+    return plateau_penalty + (A - plateau_penalty) * rise
+
+def plateau_two_exponentials_jacobian(x, A, B, C1, C2):
+    x_shifted = np.maximum(np.asarray(x, dtype=np.float64) - plateau_end, 0)
+    e1, e2 = np.exp(-C1 * x_shifted), np.exp(-C2 * x_shifted)
+    rise = A - plateau_penalty
+    return np.column_stack([1 - B * e1 - (1 - B) * e2, rise * (e2 - e1),
+                            rise * B * x_shifted * e1, rise * (1 - B) * x_shifted * e2])
+
+# --- Model families: function, Jacobian, parameter names, bounds, multi-start grid per parameter.
+# "nested" names a smaller family the model contains and maps its parameters to starts of the model
+# with the same curve, so the model is also fitted from (and never ends up worse than) its optimum
+MODELS = {
+    "one_exponential": {
+        "func": one_exponential,
+        "jac": one_exponential_jacobian,
+        "names": ["A", "C"],
+        "bounds": ([0.5, 0.00001], [1.05, 0.5]),
+        "grid": [[0.9, 1.0], [0.001, 0.01, 0.05]],
+    },
+    "two_exponentials": {
+        "func": sum_two_exponentials_constrained,
+        "jac": sum_two_exponentials_jacobian,
+        "names": ["A", "B1", "C1", "C2"],
+        "bounds": ([0.98, 0.001, 0.001, 0.00001], [1.05, 0.99, 0.1, 0.005]),
+        "grid": [[1.0], [0.3, 0.6, 0.8], [0.01, 0.025, 0.05], [0.00015, 0.001, 0.004]],
+    },
+    "three_exponentials": {
+        "func": three_exponentials,
+        "jac": three_exponentials_jacobian,
+        "names": ["A", "B1", "B2", "C1", "C2", "C3"],
+        "bounds": ([0.98, 0.001, 0.0, 0.001, 0.0001, 0.000001], [1.05, 0.99, 0.99, 0.5, 0.1, 0.01]),
+        "grid": [[1.0], [0.3, 0.6], [0.0, 0.3], [0.03, 0.2], [0.005, 0.03], [0.0005, 0.005]],
+        "nested": ("two_exponentials", two_in_three_exponentials),
+    },
+    "piecewise": {
+        "func": plateau_two_exponentials,
+        "jac": plateau_two_exponentials_jacobian,
+        "names": ["A", "B", "C1", "C2"],
+        "bounds": ([0.9, 0.0, 0.0001, 0.000001], [1.05, 1.0, 0.5, 0.05]),
+        "grid": [[1.0], [0.3, 0.7], [0.01, 0.05], [0.0005, 0.005]],
+        "fit_min_x": plateau_end,
+    },
+}
+
+def apply_overrides(x, y):
+    """Apply the hardcoded regions: 0 for x <= 35 and 30% for 35 < x <= 50."""
+    y = np.array(y, dtype=np.float64)
+    y[(x > x_start) & (x <= plateau_end)] = plateau_penalty
+    y[x <= x_start] = 0.0
+    return y
+
+def predict(model, x, params):
+    x = np.asarray(x, dtype=np.float64)
+    return apply_overrides(x, MODELS[model]["func"](x, *params))
+
+def sse_and_aic(model, x, y, params):
+    residuals = y - predict(model, x, params)
+    sse = float(np.sum(residuals ** 2))
+    n, k = len(x), len(params)
+    aic = n * math.log(max(sse, 1e-300) / n) + 2 * k
+    return sse, aic
 
-    # --- Generate fitted values
-    y_fitted = sum_two_exponentials_constrained(x_data, A_opt, B1_opt, C1_opt, C2_opt)
+def initial_guesses(model):
+    """Every combination of the model's grid values."""
+    return [list(p0) for p0 in itertools.product(*MODELS[model]["grid"])]
 
-    # --- Apply 30% override for 35 < x <= 50
-    override_mask = (x_data > 35) & (x_data <= 50)
-    y_fitted[override_mask] = 0.30
+def fit_start(model, x, y, p0, maxfev=5000, sigma=None):
+    """Fit one model from one initial guess. Returns (params, sse) or None if the fit failed.
 
-    sse = np.sum((y_target - y_fitted) ** 2)
+    sigma optionally gives each point's uncertainty (1 / sqrt(weight) for aggregated points).
+    """
+    spec = MODELS[model]
+    mask = x > spec.get("fit_min_x", -np.inf)
+    try:
+        with warnings.catch_warnings():
+            # The covariance is not used, so a singular one is not worth reporting
+            warnings.simplefilter("ignore", OptimizeWarning)
+            params, _ = curve_fit(spec["func"], x[mask], y[mask], p0=p0, bounds=spec["bounds"],
+                                  jac=spec["jac"], maxfev=maxfev,
+                                  sigma=None if sigma is None else np.asarray(sigma)[mask])
+    except (RuntimeError, ValueError):
+        return None
+    return params.tolist(), sse_and_aic(model, x, y, params)[0]
 
-    print("\n--- Optimized Fit Results (Sum of Two Exponentials) ---")
-    print(f"Optimal Parameters (A, B1, C1, C2): {A_opt:.4f}, {B1_opt:.4f}, {C1_opt:.4f}, {C2_opt:.6f}")
-    print(f"Sum of Squared Errors (SSE): {sse:.6f}")
+def nested_seeds(model, x, y, results):
+    """Starts for model at the optimum of the family nested in it; empty if that family did not fit.
 
-    # --- LaTeX representation with hardcoded region
-    latex_equation = f"""$$
+    Uses the family's result from results if it was fitted already.
+    """
+    parent, embed = MODELS[model]["nested"]
+    fitted = results.get(parent) or fit_dataset(x, y, [parent])["models"][parent]
+    if "params" not in fitted:
+        return []
+    lower, upper = MODELS[model]["bounds"]
+    return [np.clip(seed, lower, upper).tolist() for seed in embed(*fitted["params"])]
+
+def fit_dataset(x, y, models=None, workers=1, criterion="aic"):
+    """Multi-start fit of every model family to one dataset.
+
+    Returns {"models": {name: result}, "best": name}; each result holds the best
+    parameters found, their SSE/AIC, and how many starts succeeded.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    models = list(models or MODELS)
+    tasks = [(model, p0) for model in models for p0 in initial_guesses(model)]
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            outcomes = list(pool.map(fit_start, *zip(*[(m, x, y, p0) for m, p0 in tasks])))
+    else:
+        outcomes = [fit_start(m, x, y, p0) for m, p0 in tasks]
+
+    results = {}
+    for model in models:
+        found = [o for (m, _), o in zip(tasks, outcomes) if m == model and o is not None]
+        starts, succeeded = len(initial_guesses(model)), len(found)
+        if "nested" in MODELS[model]:
+            seeds = nested_seeds(model, x, y, results)
+            if seeds:
+                # The embedded optimum itself is a candidate, so the result is never worse than it
+                found.append((seeds[0], sse_and_aic(model, x, y, seeds[0])[0]))
+                refined = [r for r in (fit_start(model, x, y, seed) for seed in seeds) if r is not None]
+                starts, succeeded = starts + len(seeds), succeeded + len(refined)
+                found.extend(refined)
+        result = {"names": MODELS[model]["names"], "starts": starts, "succeeded": succeeded}
+        if found:
+            params, _ = min(found, key=lambda o: o[1])
+            sse, aic = sse_and_aic(model, x, y, params)
+            result.update({"params": params, "sse": sse, "aic": aic})
+        results[model] = result
+
+    fitted = [m for m in models if "params" in results[m]]
+    best = min(fitted, key=lambda m: results[m][criterion]) if fitted else None
+    return {"models": results, "best": best, "criterion": criterion}
+
+def latex_equation(A_opt, B1_opt, C1_opt, C2_opt):
+    B2_opt = A_opt - B1_opt
+    return f"""$$
     y(x) =
     \\begin{{cases}}
         0, & \\text{{if }} x \\leq 35 \\\\
@@ -117,48 +287,122 @@ try:
         {A_opt:.4f} - {B1_opt:.4f} \\cdot e^{{-{C1_opt:.4f} \\cdot (x - 35)}} - {B2_opt:.4f} \\cdot e^{{-{C2_opt:.6f} \\cdot (x - 35)}}, & \\text{{if }} x > 50
     \\end{{cases}}
     $$"""
-    print("\n--- The Fitted Equation (in LaTeX Format) ---")
-    print(latex_equation)
-
-    # --- Plot total fit
-    x_fit = np.linspace(x_data.min() - 20, x_data.max() + 500, 500)
-    y_fit = sum_two_exponentials_constrained(x_fit, A_opt, B1_opt, C1_opt, C2_opt)
-    y_fit[(x_fit > 35) & (x_fit <= 50)] = 0.30
-
-    plt.figure(figsize=(12, 7))
-    plt.scatter(x_data, y_target, label='Original Data', color='red', s=50, zorder=5)
-    plt.plot(x_fit, y_fit, label=f'Fitted Curve (SSE: {sse:.4f})', color='blue', linewidth=2)
-    plt.title('Walkspeed Penalty Curve Fit (Hardcoded 30% for 35 < x ≤ 50)')
-    plt.xlabel('Inventory Item Count')
-    plt.ylabel('Walkspeed Penalty')
-    plt.grid(True)
-    plt.legend()
-    plt.ylim(-0.05, 1.05)
-    plt.xlim(x_data.min() - 20, x_data.max() + 1000)
-    plt.show()
-
-    # --- Plot component breakdown
-    plt.figure(figsize=(12, 7))
-    plt.scatter(x_data, y_target, label='Original Data', color='red', s=50, zorder=5)
-    plt.plot(x_fit, y_fit, label='Total Fit', color='blue', linestyle='--', linewidth=2)
-
-    decay_x = x_fit[x_fit > 50] - x_start
-    term1 = B1_opt * np.exp(-C1_opt * decay_x)
-    term2 = B2_opt * np.exp(-C2_opt * decay_x)
-
-    plt.plot(x_fit[x_fit > 50], A_opt - term1, label='Component 1 (Faster)', color='green', linestyle=':', alpha=0.7)
-    plt.plot(x_fit[x_fit > 50], A_opt - term2, label='Component 2 (Slower)', color='orange', linestyle=':', alpha=0.7)
-
-    plt.title('Component Breakdown of Exponential Fit')
-    plt.xlabel('Inventory Item Count')
-    plt.ylabel('Walkspeed Penalty')
-    plt.grid(True)
-    plt.legend()
-    plt.ylim(-0.05, 1.05)
-    plt.xlim(x_data.min() - 20, x_data.max() + 1000)
-    plt.show()
-
-except RuntimeError as e:
-    print(f"Error fitting curve: {e}")
-except ValueError as e:
-    print(f"Value Error: {e}")
+
+def load_dataset(path):
+    """Load (x, y) from a CSV with item count and penalty columns, or a JSON {"x", "y"} file."""
+    path = Path(path)
+    if path.suffix.lower() == ".json":
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return np.asarray(data["x"], dtype=np.float64), np.asarray(data["y"], dtype=np.float64)
+    rows = []
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.reader(f):
+            try:
+                rows.append((float(row[0]), float(row[1])))
+            except (ValueError, IndexError):
+                continue  # header or malformed line
+    arr = np.array(rows, dtype=np.float64).reshape(-1, 2)
+    return arr[:, 0], arr[:, 1]
+
+def plot_fit(x, y, fit, path=None):
+    """Plot the best fit and, for the two-exponential model, its components.
+
+    Saves to path with a non-interactive backend, or shows the figure if path is None.
+    """
+    import matplotlib
+    if path is not None:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    best = fit["best"]
+    x_fit = np.linspace(x.min() - 20, x.max() + 500, 500)
+    y_fit = predict(best, x_fit, fit["models"][best]["params"])
+    sse = fit["models"][best]["sse"]
+    two = fit["models"].get("two_exponentials", {})
+
+    fig, axes = plt.subplots(1, 2 if "params" in two else 1, figsize=(18, 7), squeeze=False)
+    axes = axes[0]
+    ax = axes[0]
+    ax.scatter(x, y, label='Original Data', color='red', s=50, zorder=5)
+    ax.plot(x_fit, y_fit, label=f'Fitted Curve: {best} (SSE: {sse:.4f})', color='blue', linewidth=2)
+    ax.set_title('Walkspeed Penalty Curve Fit (Hardcoded 30% for 35 < x ≤ 50)')
+
+    if "params" in two:
+        ax = axes[1]
+        A_opt, B1_opt, C1_opt, C2_opt = two["params"]
+        decay_x = x_fit[x_fit > 50] - x_start
+        ax.scatter(x, y, label='Original Data', color='red', s=50, zorder=5)
+        ax.plot(x_fit, predict("two_exponentials", x_fit, two["params"]), label='Total Fit', color='blue', linestyle='--', linewidth=2)
+        ax.plot(x_fit[x_fit > 50], A_opt - B1_opt * np.exp(-C1_opt * decay_x), label='Component 1 (Faster)', color='green', linestyle=':', alpha=0.7)
+        ax.plot(x_fit[x_fit > 50], A_opt - (A_opt - B1_opt) * np.exp(-C2_opt * decay_x), label='Component 2 (Slower)', color='orange', linestyle=':', alpha=0.7)
+        ax.set_title('Component Breakdown of Exponential Fit')
+
+    for ax in axes:
+        ax.set_xlabel('Inventory Item Count')
+        ax.set_ylabel('Walkspeed Penalty')
+        ax.grid(True)
+        ax.legend()
+        ax.set_ylim(-0.05, 1.05)
+        ax.set_xlim(x.min() - 20, x.max() + 1000)
+
+    fig.tight_layout()
+    if path is not None:
+        fig.savefig(path)
+        plt.close(fig)
+    else:
+        plt.show()
+
+def print_summary(name, fit):
+    print(f"\n=== Dataset: {name} (best by {fit['criterion'].upper()}: {fit['best']}) ===")
+    for model, result in fit["models"].items():
+        if "params" not in result:
+            print(f"{model:>20}: no successful fit ({result['starts']} starts)")
+            continue
+        params = ", ".join(f"{n}={v:.6g}" for n, v in zip(result["names"], result["params"]))
+        print(f"{model:>20}: SSE {result['sse']:.6f}  AIC {result['aic']:.2f}  "
+              f"[{result['succeeded']}/{result['starts']} starts]  {params}")
+
+    two = fit["models"].get("two_exponentials", {})
+    if "params" in two:
+        print("\n--- The Fitted Equation (in LaTeX Format) ---")
+        print(latex_equation(*two["params"]))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fit the inventory walkspeed penalty curve.")
+    parser.add_argument("--data", action="append", default=[], help="CSV or JSON dataset (repeatable)")
+    parser.add_argument("--models", nargs="+", choices=list(MODELS), default=list(MODELS))
+    parser.add_argument("--criterion", choices=["aic", "sse"], default="aic")
+    parser.add_argument("--workers", type=int, default=1, help="processes for the multi-start fits")
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--plot", help="save the plot to this file (non-interactive)")
+    parser.add_argument("--show", action="store_true", help="show the plots interactively")
+    args = parser.parse_args(argv)
+    with span("inventory_walkspeed_penalty_fitter"):
+        return run(args)
+
+def run(args):
+    with span("load datasets", "io"):
+        datasets = [(Path(p).name, *load_dataset(p)) for p in args.data] or [("built-in", x_data, y_target)]
+    report = {}
+    for index, (name, x, y) in enumerate(datasets):
+        with span("fit dataset", "fit"):
+            fit = fit_dataset(x, y, args.models, args.workers, args.criterion)
+        report[name] = fit
+        print_summary(name, fit)
+        if fit["best"] and (args.plot or args.show):
+            plot_path = None
+            if args.plot:
+                plot_path = Path(args.plot)
+                if len(datasets) > 1:
+                    plot_path = plot_path.with_name(f"{plot_path.stem}_{index}{plot_path.suffix}")
+            with span("plot", "render"):
+                plot_fit(x, y, fit, plot_path)
+
+    if args.output:
+        with span("write results", "io"):
+            Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"\nResults written to {args.output}")
+    return 0 if all(fit["best"] for fit in report.values()) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
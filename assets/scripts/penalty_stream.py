@@ -0,0 +1,295 @@
+"""
+Streaming ingestion of walkspeed penalty readings and online refitting.
+
+Readings come from CSV or JSONL logs of any size, read in chunks of
+`chunk_rows` rows. Each row has an item count and a penalty; CSV files may
+have a header naming them (items/x/item_count and penalty/y), otherwise the
+first two columns are used. Rows that carry identity fields (id or timestamp
+by default, or the fields given with `--dedupe-on`) are identifiable: a
+repeat of the same reading with the same identity is a duplicated log line
+and is dropped. All other rows are independent readings, so repeats of an
+(items, penalty) pair add weight to it.
+
+Every chunk is
+    1. cleaned: rows outside 0 <= penalty <= 1 are invalid, and rows whose
+       residual against the current fit exceeds `reject` robust standard
+       deviations (1.4826 * MAD, at least 0.01, the log resolution) are outliers,
+    2. aggregated: readings of one item count become one point with the mean
+       penalty and weight = number of readings,
+    3. refitted: one curve_fit warm-started from the previous parameters,
+       with sigma = 1 / sqrt(weight), on the item counts above the hardcoded
+       plateau (predict() overrides the rest).
+
+Memory is bounded by the number of distinct item counts, plus 8 bytes per
+identifiable row for duplicate detection. `--state` keeps the aggregate,
+parameters and seen rows between runs, so new logs only cost their own rows
+and a warm refit.
+
+Usage:
+    python assets/scripts/penalty_stream.py readings.csv more.jsonl [--state penalty_state.npz] [--output fit.json]
+                                            [--dedupe-on account,timestamp]
+"""
+import argparse
+import csv
+import hashlib
+import itertools
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+import inventory_walkspeed_penalty_fitter as fitter
+from walkspeed_penalty import fitted_params, plateau_end
+
+default_chunk_rows = 100_000
+default_reject = 4.0
+# Readings are logged to two decimals
+min_scale = 0.01
+
+X_FIELDS = ("items", "item_count", "x")
+Y_FIELDS = ("penalty", "y")
+# Fields that tell two log lines of the same reading apart from two readings
+ID_FIELDS = ("id", "timestamp")
+
+def _row_hash(text):
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+
+def _field(names, candidates, default):
+    lowered = [n.strip().lower() for n in names]
+    return next((lowered.index(c) for c in candidates if c in lowered), default)
+
+def _identity(values, x, y):
+    """Duplicate-detection key of a reading with the given identity values; 0 if it has none."""
+    if not values:
+        return 0
+    return _row_hash("\x1f".join(map(str, values)) + f"\x1f{x!r}\x1f{y!r}")
+
+def iter_chunks(path, chunk_rows=default_chunk_rows, id_fields=ID_FIELDS):
+    """Yield (x, y, keys) per chunk of a CSV or JSONL log.
+
+    keys holds a 64-bit hash per row of its id_fields values and reading for
+    rows that have any of those fields, 0 for rows that do not. Field names are
+    matched case-insensitively. Malformed rows are skipped.
+    """
+    path = Path(path)
+    id_fields = [f.lower() for f in id_fields]
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        if path.suffix.lower() in (".jsonl", ".ndjson"):
+            while True:
+                lines = list(itertools.islice(f, chunk_rows))
+                if not lines:
+                    return
+                xs, ys, keys = [], [], []
+                for line in lines:
+                    try:
+                        row = {k.lower(): v for k, v in json.loads(line).items()}
+                        x = float(next(row[k] for k in X_FIELDS if k in row))
+                        y = float(next(row[k] for k in Y_FIELDS if k in row))
+                    except (ValueError, TypeError, StopIteration, AttributeError):
+                        continue
+                    xs.append(x)
+                    ys.append(y)
+                    keys.append(_identity([json.dumps(row[f]) for f in id_fields if f in row], x, y))
+                yield np.array(xs), np.array(ys), np.array(keys, dtype=np.uint64)
+        else:
+            reader = csv.reader(f)
+            first = next(reader, None)
+            if first is None:
+                return
+            try:
+                float(first[0]), float(first[1])
+                header, pending = None, [first]
+            except (ValueError, IndexError):
+                header, pending = first, []
+            ix = _field(header, X_FIELDS, 0) if header else 0
+            iy = _field(header, Y_FIELDS, 1) if header else 1
+            lowered = [n.strip().lower() for n in header] if header else []
+            ids = [lowered.index(f) for f in id_fields if f in lowered]
+            rows = itertools.chain(pending, reader)
+            while True:
+                block = list(itertools.islice(rows, chunk_rows))
+                if not block:
+                    return
+                xs, ys, keys = [], [], []
+                for row in block:
+                    try:
+                        x, y = float(row[ix]), float(row[iy])
+                    except (ValueError, IndexError):
+                        continue
+                    xs.append(x)
+                    ys.append(y)
+                    keys.append(_identity([row[i] for i in ids if i < len(row)], x, y))
+                yield np.array(xs), np.array(ys), np.array(keys, dtype=np.uint64)
+
+class OnlineFit:
+    """Aggregated readings and the current fit of one model family."""
+
+    def __init__(self, model="two_exponentials", params=None, reject=default_reject):
+        self.model = model
+        self.reject = reject
+        self.xs = np.zeros(0)
+        self.weights = np.zeros(0)
+        self.sums = np.zeros(0)
+        self.seen = np.zeros(0, dtype=np.uint64)
+        if params is None:
+            if model == "two_exponentials":
+                params = list(fitted_params)
+            else:
+                params = fitter.fit_dataset(fitter.x_data, fitter.y_target, [model])["models"][model]["params"]
+        self.params = list(params)
+        self.rows = 0
+
+    def deduplicate(self, keys):
+        """Mask of rows to keep: unkeyed rows, and keyed rows not seen in this or earlier chunks."""
+        keep = keys == 0
+        keyed = np.flatnonzero(~keep)
+        if len(keyed):
+            unique, first = np.unique(keys[keyed], return_index=True)
+            fresh = ~np.isin(unique, self.seen, assume_unique=True)
+            keep[keyed[first[fresh]]] = True
+            # Both parts are sorted, so the stable sort is a linear merge
+            self.seen = np.sort(np.concatenate((self.seen, unique[fresh])), kind="stable")
+        return keep
+
+    def clean(self, x, y):
+        """Masks (valid, inlier) for a chunk, judged against the current fit."""
+        valid = np.isfinite(x) & np.isfinite(y) & (x >= 0) & (y >= 0) & (y <= 1)
+        inlier = valid.copy()
+        if self.reject and valid.any():
+            residuals = y[valid] - fitter.predict(self.model, x[valid], self.params)
+            scale = max(min_scale, 1.4826 * float(np.median(np.abs(residuals - np.median(residuals)))))
+            inlier[valid] = np.abs(residuals) <= self.reject * scale
+        return valid, inlier
+
+    def add(self, x, y, weights=None):
+        """Merge readings (optionally pre-weighted) into the per-item-count aggregate."""
+        if not len(x):
+            return
+        weights = np.ones(len(x)) if weights is None else np.asarray(weights, dtype=np.float64)
+        unique, inverse = np.unique(x, return_inverse=True)
+        merged = np.union1d(self.xs, unique)
+        total_w, total_s = np.zeros(len(merged)), np.zeros(len(merged))
+        old = np.searchsorted(merged, self.xs)
+        new = np.searchsorted(merged, unique)
+        total_w[old] += self.weights
+        total_s[old] += self.sums
+        total_w[new] += np.bincount(inverse, weights=weights, minlength=len(unique))
+        total_s[new] += np.bincount(inverse, weights=weights * y, minlength=len(unique))
+        self.xs, self.weights, self.sums = merged, total_w, total_s
+
+    def points(self):
+        """(x, mean penalty, weight) of the aggregated readings."""
+        return self.xs, self.sums / self.weights, self.weights
+
+    def refit(self):
+        """Warm-started weighted fit; falls back to the multi-start grid if it fails. Returns seconds taken."""
+        start = time.perf_counter()
+        x, y, w = self.points()
+        # predict() overrides x <= plateau_end, so readings there say nothing about the
+        # curve: fit the rest, as fit_min_x does for the piecewise model
+        fitted = x > plateau_end
+        if fitted.sum() < len(self.params):
+            return time.perf_counter() - start
+        x, y, w = x[fitted], y[fitted], w[fitted]
+        sigma = 1 / np.sqrt(w)
+        lower, upper = fitter.MODELS[self.model]["bounds"]
+        p0 = np.clip(self.params, lower, upper).tolist()
+        result = fitter.fit_start(self.model, x, y, p0, sigma=sigma)
+        if result is None:
+            found = [r for r in (fitter.fit_start(self.model, x, y, g, sigma=sigma)
+                                 for g in fitter.initial_guesses(self.model)) if r is not None]
+            result = min(found, key=lambda r: r[1]) if found else None
+        if result is not None:
+            self.params = result[0]
+        return time.perf_counter() - start
+
+    def ingest(self, x, y, keys):
+        """Deduplicate, clean, aggregate and refit one chunk. Returns a stats dict."""
+        self.rows += len(x)
+        keep = self.deduplicate(keys)
+        x, y = x[keep], y[keep]
+        valid, inlier = self.clean(x, y)
+        self.add(x[inlier], y[inlier])
+        seconds = self.refit() if inlier.any() else 0.0
+        return {"rows": len(keep), "duplicates": int((~keep).sum()), "invalid": int((~valid).sum()),
+                "rejected": int((valid & ~inlier).sum()), "refit_ms": 1000 * seconds}
+
+    def rmse(self):
+        x, y, w = self.points()
+        residuals = y - fitter.predict(self.model, x, self.params)
+        return float(np.sqrt(np.sum(w * residuals ** 2) / np.sum(w))) if len(x) else 0.0
+
+    def save(self, path):
+        # Through a file object, so np.savez does not append .npz to the name
+        with open(path, "wb") as f:
+            np.savez(f, xs=self.xs, weights=self.weights, sums=self.sums, seen=self.seen,
+                     params=np.array(self.params), model=np.array(self.model), rows=np.array(self.rows))
+
+    @classmethod
+    def load(cls, path, reject=default_reject):
+        with np.load(path) as data:
+            fit = cls(str(data["model"]), data["params"].tolist(), reject)
+            fit.xs, fit.weights, fit.sums, fit.seen = data["xs"], data["weights"], data["sums"], data["seen"]
+            fit.rows = int(data["rows"])
+        return fit
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream penalty readings from logs and refit the model online.")
+    parser.add_argument("logs", nargs="+", help="CSV or JSONL files of (item count, penalty) readings")
+    parser.add_argument("--state", help="load and save the aggregate and fit here (.npz)")
+    parser.add_argument("--model", choices=list(fitter.MODELS), default="two_exponentials")
+    parser.add_argument("--chunk-rows", type=int, default=default_chunk_rows)
+    parser.add_argument("--reject", type=float, default=default_reject,
+                        help="outlier threshold in robust standard deviations (0 disables)")
+    parser.add_argument("--dedupe-on", metavar="FIELDS",
+                        help=f"comma-separated fields that identify a log line (default: {','.join(ID_FIELDS)})")
+    parser.add_argument("--no-builtin", action="store_true", help="do not seed a new state with the built-in data")
+    parser.add_argument("--output", help="write the fit as JSON")
+    args = parser.parse_args(argv)
+
+    state = Path(args.state) if args.state else None
+    if state and state.exists():
+        fit = OnlineFit.load(state, args.reject)
+        if fit.model != args.model:
+            print(f"✖ {state} holds a {fit.model} fit, not {args.model}")
+            return 1
+    else:
+        fit = OnlineFit(args.model, reject=args.reject)
+        if not args.no_builtin:
+            fit.add(fitter.x_data, fitter.y_target)
+
+    id_fields = [f.strip() for f in args.dedupe_on.split(",") if f.strip()] if args.dedupe_on else ID_FIELDS
+    start = time.perf_counter()
+    for log in args.logs:
+        totals = {"rows": 0, "duplicates": 0, "invalid": 0, "rejected": 0, "refit_ms": 0.0}
+        try:
+            for x, y, keys in iter_chunks(log, args.chunk_rows, id_fields):
+                for key, value in fit.ingest(x, y, keys).items():
+                    totals[key] += value
+        except OSError as e:
+            print(f"✖ {log}: {e}")
+            return 1
+        print(f"{log}: {totals['rows']} rows, {totals['duplicates']} duplicates, {totals['invalid']} invalid, "
+              f"{totals['rejected']} outliers, refits {totals['refit_ms']:.1f} ms")
+    elapsed = time.perf_counter() - start
+
+    names = fitter.MODELS[fit.model]["names"]
+    params = ", ".join(f"{n}={v:.6g}" for n, v in zip(names, fit.params))
+    x, _, w = fit.points()
+    print(f"{fit.model}: {params}")
+    print(f"{len(x)} item counts, {w.sum():.0f} readings, weighted RMSE {fit.rmse():.4f}, {elapsed:.2f} s")
+
+    if state:
+        fit.save(state)
+        print(f"Saved state to {state}")
+    if args.output:
+        result = {"model": fit.model, "names": names, "params": fit.params, "rmse": fit.rmse(),
+                  "points": len(x), "readings": float(w.sum())}
+        Path(args.output).write_text(json.dumps(result, indent=2), encoding="utf-8")
+        print(f"Results written to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
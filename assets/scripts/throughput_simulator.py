@@ -0,0 +1,264 @@
+"""
+Walkspeed-aware dig throughput simulator.
+
+Replays a dig-tool config's auto-walk/auto-sell loop against the fitted
+inventory walkspeed penalty (see walkspeed_penalty.py) and predicts digs per
+hour as the inventory fills.
+
+Model, per dig:
+    * the dig itself takes `dig_time` seconds (not part of the config),
+    * the inventory grows by one item, then the bot walks the next step of the
+      config's `walk_pattern` (cycling through the pattern),
+    * a step of a simple suite pattern lasts `walk_duration` and covers one
+      tile; a step of a pattern-entry file lasts the entry's duration and
+      covers duration / `walk_duration` tiles (one tile is `walk_duration` of
+      walking at full speed). Keys that do not move cost their time but cover
+      nothing,
+    * with `dynamic_walkspeed_enabled` the step is stretched by 1 / (1 - penalty)
+      so it still covers its full ground; otherwise it keeps its duration and
+      only covers (1 - penalty) of it,
+    * with `auto_sell_enabled`, every `sell_every_x_digs` digs the inventory is
+      sold (back to 0 items), costing `sell_delay` plus `sell_overhead` seconds.
+
+Patterns are looked up by name in Pattern_Suite: the newest simple suite that
+has it, then the pattern-entry files. Built-in dig-tool patterns ("circle")
+are not in the repository; they are walked as one tile per dig.
+
+The config's `initial_item_count` only affects the items held before the
+first sell. `sweep()` evaluates the steady-state sell cycle for whole
+parameter grids at once by broadcasting over a prefix sum of the penalty table.
+In the steady state the step walked at a given item count cycles through the
+pattern steps that are congruent modulo gcd(sell interval, pattern length), so
+each cycle uses their mean. Entry durations are relative to `walk_duration`,
+so a `walk_duration` sweep scales a pattern-entry walk as a whole.
+"""
+import argparse
+import json
+import math
+import sys
+from pathlib import Path
+
+import numpy as np
+
+from walkspeed_penalty import default_table
+
+repo_root = Path(__file__).resolve().parents[2]
+sys.path.append(str(repo_root / ".github" / "scripts"))
+
+from path_geometry import PathGeometry, entry_direction
+from pattern_model import load_suite, pattern_dir, suite_files
+
+# Assumed costs that are not part of a config, in seconds
+default_dig_time = 2.0
+default_sell_overhead = 1.0
+
+def load_params(config_path):
+    """Read the simulation-relevant params from a dig-tool config."""
+    with open(config_path, "r", encoding="utf-8-sig") as f:
+        data = json.load(f)
+    params = data.get("params", {})
+    return {
+        "walk_duration": float(params.get("walk_duration", 0) or 0),
+        "sell_every_x_digs": int(params.get("sell_every_x_digs", 0) or 0),
+        "sell_delay": float(params.get("sell_delay", 0) or 0),
+        "initial_item_count": int(params.get("initial_item_count", 0) or 0),
+        "auto_sell_enabled": bool(params.get("auto_sell_enabled", False)),
+        "dynamic_walkspeed_enabled": bool(params.get("dynamic_walkspeed_enabled", False)),
+        "walk_pattern": data.get("walk_pattern") or None,
+    }
+
+def load_walk(name, walk_duration, directory=None):
+    """Return (scale, ground) per step of a named walk_pattern, or None if it is not in the repository.
+
+    scale is each step's duration in units of walk_duration and ground the
+    tiles it covers at full speed. Names with the older "_PATTERN" prefix are
+    also tried without it.
+    """
+    if not name:
+        return None
+    directory = Path(directory or repo_root / pattern_dir)
+    names = [name] + ([name[len("_PATTERN"):]] if name.startswith("_PATTERN_") else [])
+    for candidate in names:
+        for path in reversed(suite_files(directory)):
+            pattern = load_suite(path).get(candidate)
+            if pattern is not None:
+                moving = np.any(PathGeometry.from_pattern(pattern).steps != 0, axis=1)
+                return np.ones(len(moving)), moving.astype(np.float64)
+        for path in sorted(set(directory.glob("*.json")) - set(suite_files(directory))):
+            with open(path, "r", encoding="utf-8-sig") as f:
+                data = json.load(f)
+            if isinstance(data, dict) and data.get("name") == candidate and isinstance(data.get("pattern"), list):
+                if walk_duration <= 0:
+                    raise ValueError(f"{candidate} is a pattern-entry walk; it needs walk_duration > 0 to size a tile")
+                # Zero-duration entries (labels) take no step; keys that do not move still take their time
+                steps = [(float(e.get("duration") or 0), entry_direction(e.get("key", "")) is not None)
+                         for e in data["pattern"] if isinstance(e, dict)]
+                steps = np.array([s for s in steps if s[0] > 0], dtype=np.float64).reshape(-1, 2)
+                scale = steps[:, 0] / walk_duration
+                return scale, scale * steps[:, 1]
+    return None
+
+def one_tile_walk():
+    """The walk of a pattern that is not in the repository: one tile of walk_duration per dig."""
+    return np.ones(1), np.ones(1)
+
+def simulate(params, hours=1.0, dig_time=default_dig_time, sell_overhead=default_sell_overhead,
+             table=default_table, walk=None):
+    """Simulate the dig loop over a time horizon.
+
+    walk is (scale, ground) per pattern step as returned by load_walk
+    (default: one tile per dig). Returns a dict with per-dig arrays (`items`,
+    `penalty`, `elapsed` seconds) limited to the digs that finish within the
+    horizon, plus totals.
+    """
+    scale, ground_full = walk if walk is not None and len(walk[0]) else one_tile_walk()
+    horizon = hours * 3600.0
+    walk_s = params["walk_duration"] / 1000.0
+    max_digs = int(horizon / max(dig_time, 1e-9)) + 1
+
+    k = np.arange(1, max_digs + 1)
+    every = params["sell_every_x_digs"]
+    selling = params["auto_sell_enabled"] and every > 0
+    if selling:
+        items = np.where(k <= every, params["initial_item_count"] + k, (k - 1) % every + 1)
+    else:
+        items = params["initial_item_count"] + k
+
+    step = (k - 1) % len(scale)
+    pen = table(items)
+    if params["dynamic_walkspeed_enabled"]:
+        walk_time = walk_s * scale[step] / (1.0 - pen)
+        ground = ground_full[step]
+    else:
+        walk_time = walk_s * scale[step]
+        ground = ground_full[step] * (1.0 - pen)
+
+    step_time = dig_time + walk_time
+    if selling:
+        step_time = step_time + np.where(k % every == 0, params["sell_delay"] / 1000.0 + sell_overhead, 0.0)
+
+    elapsed = np.cumsum(step_time)
+    digs = int(np.searchsorted(elapsed, horizon, side="right"))
+    return {
+        "digs": digs,
+        "digs_per_hour": digs / hours,
+        "tiles_per_hour": float(ground[:digs].sum()) / hours,
+        "mean_penalty": float(pen[:digs].mean()) if digs else 0.0,
+        "items": items[:digs],
+        "penalty": pen[:digs],
+        "elapsed": elapsed[:digs],
+    }
+
+def cycle_sums(sell_every, walk, table=default_table):
+    """Steady-state sums over the n walks of one sell cycle, for each interval n.
+
+    Returns (scale, slowed scale, ground, slowed ground) arrays: the step time
+    scales as walked at full speed and stretched by the slowdown, and the ground
+    at full speed and reduced by the penalty. Walk i of a cycle (i items held)
+    takes the mean of the pattern steps congruent to i - 1 modulo gcd(n, len).
+    """
+    scale, ground = walk
+    sums = np.zeros((4, len(sell_every)))
+    for index, n in enumerate(sell_every):
+        g = math.gcd(int(n), len(scale))
+        step = np.arange(n) % g
+        s = scale.reshape(-1, g).mean(axis=0)[step]
+        w = ground.reshape(-1, g).mean(axis=0)[step]
+        slowdown, pen = table.slowdown[1:n + 1], table.values[1:n + 1]
+        sums[:, index] = s.sum(), s @ slowdown, w.sum(), w @ (1.0 - pen)
+    return sums
+
+def sweep(sell_every, sell_delay, walk_duration, dig_time=default_dig_time,
+          sell_overhead=default_sell_overhead, dynamic=False, table=default_table, walk=None):
+    """Steady-state digs/hour and tiles/hour for every combination of the inputs.
+
+    Inputs are 1-D arrays (or scalars) and walk is as for simulate(); the
+    results have shape (len(sell_every), len(sell_delay), len(walk_duration), len(dig_time)).
+    """
+    n = np.atleast_1d(np.asarray(sell_every, dtype=np.int64))[:, None, None, None]
+    delay = np.atleast_1d(np.asarray(sell_delay, dtype=np.float64))[None, :, None, None] / 1000.0
+    walk_s = np.atleast_1d(np.asarray(walk_duration, dtype=np.float64))[None, None, :, None] / 1000.0
+    dig = np.atleast_1d(np.asarray(dig_time, dtype=np.float64))[None, None, None, :]
+    if n.max() >= len(table):
+        raise ValueError(f"sell_every must be below {len(table)} (penalty table size)")
+
+    if walk is None or not len(walk[0]):
+        # One tile per dig; items during the walks of one cycle run 1..n
+        scale_sum, ground_sum = n.astype(np.float64), n.astype(np.float64)
+        slowed_scale = table.slowdown_prefix()[n]
+        slowed_ground = np.cumsum(1.0 - table.values)[n] - (1.0 - table.values[0])
+    else:
+        sums = cycle_sums(n.ravel(), walk, table)[:, :, None, None, None]
+        scale_sum, slowed_scale, ground_sum, slowed_ground = sums
+
+    if dynamic:
+        cycle = n * dig + walk_s * slowed_scale
+        tiles = ground_sum
+    else:
+        cycle = n * dig + walk_s * scale_sum
+        tiles = slowed_ground
+    cycle = cycle + delay + sell_overhead
+    digs_per_hour = 3600.0 * n / cycle
+    tiles_per_hour = 3600.0 * tiles / cycle
+    shape = np.broadcast_shapes(digs_per_hour.shape, tiles_per_hour.shape)
+    return np.broadcast_to(digs_per_hour, shape), np.broadcast_to(tiles_per_hour, shape)
+
+def parse_values(text, kind=float):
+    """Parse "a,b,c" or "start:stop:step" (stop inclusive) into an array."""
+    if ":" in text:
+        start, stop, step = (kind(v) for v in text.split(":"))
+        return np.arange(start, stop + step / 2, step, dtype=np.float64).astype(kind)
+    return np.array([kind(v) for v in text.split(",")])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Predict dig throughput for a dig-tool config.")
+    parser.add_argument("config", help="dig-tool config JSON")
+    parser.add_argument("--hours", type=float, default=1.0)
+    parser.add_argument("--dig-time", type=float, default=default_dig_time, help="seconds per dig (default: %(default)s)")
+    parser.add_argument("--sell-overhead", type=float, default=default_sell_overhead,
+                        help="seconds per sell on top of sell_delay (default: %(default)s)")
+    parser.add_argument("--sweep", action="store_true", help="rank a parameter grid instead of one run")
+    parser.add_argument("--sell-every", default="5:100:5", help="sweep values, 'a,b' or 'start:stop:step'")
+    parser.add_argument("--sell-delay", default=None, help="sweep values in ms (default: config value)")
+    parser.add_argument("--walk-duration", default=None, help="sweep values in ms (default: config value)")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    params = load_params(args.config)
+    print(f"Config: {Path(args.config).name}")
+    try:
+        walk = load_walk(params["walk_pattern"], params["walk_duration"])
+    except (OSError, ValueError) as e:
+        print(f"✖ {e}")
+        return 1
+    if walk is None or not len(walk[0]):
+        print(f"Walk:   {params['walk_pattern']} (not in the repository; one tile per dig)")
+        walk = None
+    else:
+        print(f"Walk:   {params['walk_pattern']} ({len(walk[0])} steps, {walk[1].sum():.1f} tiles per pass)")
+
+    if not args.sweep:
+        result = simulate(params, args.hours, args.dig_time, args.sell_overhead, walk=walk)
+        print(f"Digs per hour:  {result['digs_per_hour']:.1f}")
+        print(f"Tiles per hour: {result['tiles_per_hour']:.1f}")
+        print(f"Mean penalty:   {result['mean_penalty']:.3f}")
+        if result["digs"]:
+            print(f"Final items:    {int(result['items'][-1])}")
+        return
+
+    sell_every = parse_values(args.sell_every, int)
+    sell_delay = parse_values(args.sell_delay) if args.sell_delay else np.array([params["sell_delay"]])
+    walk_duration = parse_values(args.walk_duration) if args.walk_duration else np.array([params["walk_duration"]])
+    digs, tiles = sweep(sell_every, sell_delay, walk_duration, args.dig_time, args.sell_overhead,
+                        params["dynamic_walkspeed_enabled"], walk=walk)
+
+    # Rank by ground covered, which is what throughput means for a walking pattern
+    order = np.argsort(tiles, axis=None)[::-1][:args.top]
+    print(f"{'sell_every':>10} {'sell_delay':>10} {'walk_ms':>8} {'digs/h':>8} {'tiles/h':>8}")
+    for flat in order:
+        i, j, w, _ = np.unravel_index(flat, tiles.shape)
+        print(f"{sell_every[i]:>10d} {sell_delay[j]:>10.0f} {walk_duration[w]:>8.0f} "
+              f"{digs[i, j, w, 0]:>8.1f} {tiles[i, j, w, 0]:>8.1f}")
+
+if __name__ == "__main__":
+    sys.exit(main())
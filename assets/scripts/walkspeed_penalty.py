@@ -0,0 +1,66 @@
+"""
+Inventory walkspeed penalty model, exported from inventory_walkspeed_penalty_fitter.py.
+
+The penalty is 0 up to 35 items, a flat 0.30 for 35 < x <= 50, and the fitted
+sum of two exponentials beyond that:
+
+    y(x) = A - B1 * exp(-C1 * (x - 35)) - (A - B1) * exp(-C2 * (x - 35))
+
+`penalty()` evaluates the model for any array of item counts. `PenaltyTable`
+precomputes it for integer item counts so the hot path is a single array
+index; counts beyond the table fall back to the model.
+"""
+import numpy as np
+
+x_start = 35
+plateau_end = 50
+plateau_penalty = 0.30
+
+# Optimal (A, B1, C1, C2) from inventory_walkspeed_penalty_fitter.py (SSE 0.002034)
+fitted_params = (0.9900489206184278, 0.6065264169951571, 0.038780071895831554, 0.004999999999999998)
+
+def sum_two_exponentials_constrained(x, A, B1, C1, C2):
+    """The fitted model without the hardcoded plateau; y(35) = 0."""
+    x = np.asarray(x, dtype=np.float64)
+    x_shifted = np.maximum(x - x_start, 0)
+    B2 = A - B1
+    term1 = np.where(C1 * x_shifted > 700, 0.0, B1 * np.exp(-C1 * x_shifted))
+    term2 = np.where(C2 * x_shifted > 700, 0.0, B2 * np.exp(-C2 * x_shifted))
+    return A - term1 - term2
+
+def penalty(items, params=fitted_params):
+    """Walkspeed penalty (0..1) for an item count or array of item counts."""
+    items = np.asarray(items, dtype=np.float64)
+    y = sum_two_exponentials_constrained(items, *params)
+    y = np.where((items > x_start) & (items <= plateau_end), plateau_penalty, y)
+    return np.where(items <= x_start, 0.0, y)
+
+class PenaltyTable:
+    """Penalty values precomputed for item counts 0..size-1."""
+
+    def __init__(self, size=10000, params=fitted_params):
+        self.params = params
+        self.values = penalty(np.arange(size), params)
+        # Walk time multiplier for covering the same distance: 1 / (1 - penalty)
+        self.slowdown = 1.0 / (1.0 - self.values)
+
+    def __len__(self):
+        return len(self.values)
+
+    def __call__(self, items):
+        """Penalty for integer item counts; counts past the table use the model."""
+        items = np.asarray(items)
+        inside = np.clip(items, 0, len(self.values) - 1).astype(np.int64)
+        result = self.values[inside]
+        beyond = items >= len(self.values)
+        if np.any(beyond):
+            result = np.where(beyond, penalty(items, self.params), result)
+        return result
+
+    def slowdown_prefix(self):
+        """Cumulative slowdown: prefix[n] = sum of slowdown for item counts 1..n."""
+        prefix = np.zeros(len(self.values), dtype=np.float64)
+        np.cumsum(self.slowdown[1:], out=prefix[1:])
+        return prefix
+
+default_table = PenaltyTable()